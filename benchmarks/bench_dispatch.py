@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+Measure the per-call overhead of autojit dispatch for tiny functions,
+compared to calling the plain Python function and the @jit
+specialization directly.
+
+    python benchmarks/bench_dispatch.py [-n CALLS]
+"""
+from __future__ import print_function, division, absolute_import
+
+import timeit
+from optparse import OptionParser
+
+import numpy as np
+
+from numba import autojit, jit, double
+
+def add(a, b):
+    return a + b
+
+def first(a):
+    return a[0]
+
+auto_add = autojit(add)
+auto_first = autojit(first)
+jit_add = jit(double(double, double))(add)
+
+x = np.arange(10, dtype=np.float64)
+y = np.arange(10, dtype=np.int32)
+
+benchmarks = [
+    ("add: py_func",                 "add(1.0, 2.0)"),
+    ("add: @jit",                    "jit_add(1.0, 2.0)"),
+    ("add: @autojit",                "auto_add(1.0, 2.0)"),
+    ("add: @autojit, 2 types",       "auto_add(1.0, 2.0); auto_add(1, 2)"),
+    ("first: py_func",               "first(x)"),
+    ("first: @autojit",              "auto_first(x)"),
+    ("first: @autojit, 2 dtypes",    "auto_first(x); auto_first(y)"),
+]
+
+def main():
+    parser = OptionParser()
+    parser.add_option("-n", "--calls", type="int", default=1000000,
+                      help="Number of calls per measurement")
+    options, args = parser.parse_args()
+
+    # Compile the specializations
+    for name, statement in benchmarks:
+        exec(statement)
+
+    print("%-30s %12s" % ("", "ns per call"))
+    for name, statement in benchmarks:
+        timer = timeit.Timer(statement, "from __main__ import *")
+        ncalls = statement.count(";") + 1
+        seconds = min(timer.repeat(3, options.calls))
+        print("%-30s %12.1f" % (name, seconds / options.calls / ncalls * 1e9))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+Measure the latency of `python -c "import numba"`, and of importing numba
+and compiling a first small function. Times are relative to the start-up
+time of the interpreter.
+
+    python benchmarks/bench_import.py [-n RUNS]
+"""
+from __future__ import print_function, division, absolute_import
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import subprocess
+from optparse import OptionParser
+
+# The function source must be in a file for inspect.getsource()
+scripts = [
+    ("interpreter", "pass\n"),
+    ("import numba", "import numba\n"),
+    ("first jit", "import numba\n"
+                  "@numba.jit('double(double)')\n"
+                  "def double_it(x):\n"
+                  "    return x * 2.0\n"),
+]
+
+def time_script(script, runs):
+    "Run the script in a new interpreter `runs` times, return the timings"
+    tempdir = tempfile.mkdtemp()
+    filename = os.path.join(tempdir, "bench_import_script.py")
+    with open(filename, "w") as f:
+        f.write(script)
+
+    timings = []
+    try:
+        for i in range(runs):
+            start = time.time()
+            subprocess.check_call([sys.executable, filename])
+            timings.append(time.time() - start)
+    finally:
+        shutil.rmtree(tempdir)
+
+    return sorted(timings)
+
+def main():
+    parser = OptionParser()
+    parser.add_option("-n", "--runs", type="int", default=10,
+                      help="Number of interpreter runs per statement")
+    options, args = parser.parse_args()
+
+    # Timings are reported relative to the minimum interpreter start time
+    baseline = None
+    print("%-16s %10s %10s" % ("", "min (s)", "median (s)"))
+    for name, script in scripts:
+        timings = time_script(script, options.runs)
+        if baseline is None:
+            baseline = timings[0]
+            print("%-16s %10.4f" % (name, baseline))
+        else:
+            print("%-16s %10.4f %10.4f" % (name, timings[0] - baseline,
+                                           timings[len(timings) // 2] -
+                                               baseline))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+Compare filling and looking up a typeddict in an @autojit function with a
+Python dict, in plain Python and in an @autojit function, for integer and
+float keys.
+
+    python benchmarks/bench_typeddict.py [-n KEYS] [-r REPEAT]
+"""
+from __future__ import print_function, division, absolute_import
+
+import timeit
+from optparse import OptionParser
+
+import numpy as np
+
+import numba as nb
+from numba import autojit, int_, double
+
+def dict_lookup(keys):
+    d = {}
+    for i in range(keys.shape[0]):
+        d[keys[i]] = i
+    total = 0
+    for i in range(keys.shape[0]):
+        total += d[keys[i]]
+    return total
+
+@autojit
+def typeddict_lookup(key_type, keys):
+    d = nb.typeddict(key_type, int_)
+    for i in range(keys.shape[0]):
+        d[keys[i]] = i
+    total = 0
+    for i in range(keys.shape[0]):
+        total += d[keys[i]]
+    return total
+
+auto_dict_lookup = autojit(dict_lookup)
+
+benchmarks = [
+    ("dict, Python",           "dict_lookup(keys)"),
+    ("dict, @autojit",         "auto_dict_lookup(keys)"),
+    ("typeddict, @autojit",    "typeddict_lookup(key_type, keys)"),
+]
+
+def main():
+    parser = OptionParser()
+    parser.add_option("-n", "--keys", type="int", default=100000,
+                      help="Number of keys")
+    parser.add_option("-r", "--repeat", type="int", default=10,
+                      help="Number of calls per measurement")
+    options, args = parser.parse_args()
+
+    # Shuffled keys, so that lookups do not follow insertion order
+    order = np.random.permutation(options.keys)
+    print("%-30s %12s" % ("", "ms per call"))
+    for key_type, keys in ((int_, order.astype(np.int64)),
+                           (double, order * 0.5)):
+        namespace = dict(globals(), key_type=key_type, keys=keys)
+        print(keys.dtype.name, "keys")
+        for name, statement in benchmarks:
+            seconds = min(_repeat(statement, namespace, options.repeat)
+                              for i in range(3))
+            print("  %-28s %12.2f" % (name, seconds / options.repeat * 1e3))
+
+def _repeat(statement, namespace, number):
+    "Time `number` runs of the statement, after a warm-up run"
+    code = compile(statement, "<benchmark>", "exec")
+    exec(code, namespace)
+    timer = timeit.default_timer
+    t = timer()
+    for i in range(number):
+        exec(code, namespace)
+    return timer() - t
+
+if __name__ == "__main__":
+    main()
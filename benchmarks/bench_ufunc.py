@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+Compare the inner loops of @vectorize ufuncs with NumPy's builtin ufuncs,
+for contiguous operands (the vectorizable fast path) and strided ones.
+
+    python benchmarks/bench_ufunc.py [-n ELEMENTS] [-r REPEAT]
+"""
+from __future__ import print_function, division, absolute_import
+
+import timeit
+from optparse import OptionParser
+
+import numpy as np
+
+from numba import f4, f8, i4
+from numba.vectorize import vectorize
+
+@vectorize([f4(f4, f4), f8(f8, f8), i4(i4, i4)])
+def add(a, b):
+    return a + b
+
+@vectorize([f4(f4, f4), f8(f8, f8), i4(i4, i4)], target='parallel')
+def parallel_add(a, b):
+    return a + b
+
+@vectorize([f8(f8, f8)])
+def axpy(a, b):
+    return 2.0 * a + b
+
+def numpy_axpy(a, b, out):
+    np.multiply(a, 2.0, out)
+    np.add(out, b, out)
+
+benchmarks = [
+    ("np.add",                 "np.add(a, b, out)"),
+    ("add",                    "add(a, b, out)"),
+    ("add, parallel",          "parallel_add(a, b, out)"),
+    ("np.add, strided",        "np.add(a[::2], b[::2], out[::2])"),
+    ("add, strided",           "add(a[::2], b[::2], out[::2])"),
+]
+
+axpy_benchmarks = [
+    ("numpy 2*a+b",            "numpy_axpy(a, b, out)"),
+    ("axpy",                   "axpy(a, b, out)"),
+]
+
+def main():
+    parser = OptionParser()
+    parser.add_option("-n", "--elements", type="int", default=1000000,
+                      help="Number of elements of the operands")
+    parser.add_option("-r", "--repeat", type="int", default=100,
+                      help="Number of calls per measurement")
+    options, args = parser.parse_args()
+
+    print("%-30s %12s" % ("", "us per call"))
+    for dtype in (np.float32, np.float64, np.int32):
+        namespace = dict(globals())
+        namespace.update(a=np.arange(options.elements, dtype=dtype),
+                         b=np.ones(options.elements, dtype=dtype),
+                         out=np.empty(options.elements, dtype=dtype))
+
+        todo = benchmarks
+        if dtype == np.float64:
+            todo = benchmarks + axpy_benchmarks
+
+        print(np.dtype(dtype).name)
+        for name, statement in todo:
+            seconds = min(_repeat(statement, namespace, options.repeat)
+                              for i in range(3))
+            print("  %-28s %12.1f" % (name, seconds / options.repeat * 1e6))
+
+def _repeat(statement, namespace, number):
+    "Time `number` runs of the statement, after a warm-up run"
+    code = compile(statement, "<benchmark>", "exec")
+    exec(code, namespace)
+    timer = timeit.default_timer
+    t = timer()
+    for i in range(number):
+        exec(code, namespace)
+    return timer() - t
+
+if __name__ == "__main__":
+    main()
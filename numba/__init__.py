@@ -67,6 +67,7 @@ from numba.error import *
 
 from numba.containers.typedlist import typedlist
 from numba.containers.typedtuple import typedtuple
+from numba.containers.typeddict import typeddict
 from numba.typesystem import map_dtype
 from numba.type_inference.module_type_inference import (is_registered,
                                                         register,
@@ -81,6 +82,7 @@ from numba.decorators import *
 from numba import decorators
 from numba.intrinsic.numba_intrinsic import (declare_intrinsic,
                                              declare_instruction)
+from numba.manifest import dump_manifest, precompile
 
 __all__ = typesystem.__all__ + decorators.__all__ + special.__all__
 __all__.extend(["numeric", "floating", "complextypes"])
@@ -1,15 +1,19 @@
 # -*- coding: utf-8 -*-
 from __future__ import print_function, division, absolute_import
 import ast
+from collections import defaultdict
+
+import numpy as np
 
 from numba import templating
 from numba import error, pipeline, nodes, ufunc_builder
-from numba.minivect import specializers, miniast, miniutils
+from numba.minivect import miniast, miniutils
 from numba import utils, functions
 from numba import typesystem
 from numba import visitors
+from numba import array_layouts, autotune
 
-from numba.support.numpy_support import slicenodes
+from numba.support.numpy_support import slicenodes, reductions
 from numba.vectorize import basic
 
 print_ufunc = False
@@ -27,10 +31,148 @@ def is_elementwise_assignment(context, assmnt_node):
     return False
 
 
+def is_array_expression(node):
+    return (isinstance(node, (ast.BinOp, ast.UnaryOp, nodes.MathNode)) and
+            node.type.is_array and not node.type.dtype.is_object)
+
+
+def contains_reduction(tree):
+    return any(isinstance(node, reductions.ArrayReductionNode)
+                   for node in ast.walk(tree))
+
+
+def count_variable_uses(tree, flow=None):
+    "Count the references to each Variable in the AST and in the phis"
+    uses = defaultdict(int)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load):
+            uses[getattr(node, 'variable', None)] += 1
+
+    if flow is not None:
+        for block in flow.blocks:
+            for phi in block.phi_nodes:
+                for variable in phi.incoming:
+                    uses[variable] += 1
+
+    return uses
+
+
+def elementwise_uses(node, variable):
+    """
+    Count the references to `variable` that are bare Name loads in the
+    element-wise tree of `node`. A kernel can evaluate only these as
+    scalars, any other reference (e.g. t[0], t.T or len(t)) is an operand
+    that needs the array.
+    """
+    if isinstance(node, ast.Name):
+        return int(isinstance(node.ctx, ast.Load) and
+                   getattr(node, 'variable', None) is variable)
+    elif isinstance(node, ast.BinOp):
+        return (elementwise_uses(node.left, variable) +
+                elementwise_uses(node.right, variable))
+    elif isinstance(node, ast.UnaryOp):
+        return elementwise_uses(node.operand, variable)
+    elif isinstance(node, nodes.MathNode):
+        return elementwise_uses(node.arg, variable)
+    elif isinstance(node, nodes.CoercionNode):
+        return elementwise_uses(node.node, variable)
+    elif isinstance(node, reductions.ArrayReductionNode):
+        return elementwise_uses(node.array, variable)
+
+    return 0
+
+
+# NumPy functions that return a new array
+allocators = (np.empty, np.zeros, np.ones, np.empty_like, np.zeros_like,
+              np.ones_like, np.copy)
+
+def is_allocation(node):
+    "Whether the expression creates a new array"
+    while isinstance(node, nodes.CoercionNode):
+        node = node.node
+
+    if isinstance(node, (ast.Call, nodes.ObjectCallNode)):
+        func_variable = getattr(node.func, 'variable', None)
+        func_type = getattr(func_variable, 'type', None)
+        return any(getattr(func_type, 'value', None) is allocator
+                       for allocator in allocators)
+
+    return (isinstance(node, (ast.BinOp, ast.UnaryOp, nodes.MathNode)) and
+            getattr(node, 'type', None) is not None and
+            is_array_expression(node))
+
+def is_allocated_array(variable):
+    "Whether the variable is an array allocated in the function"
+    if variable is None or variable.is_arg or variable.is_phi:
+        return False
+    assignment = variable.name_assignment
+    return assignment is not None and is_allocation(assignment.rhs)
+
+def source_variables(variable):
+    """
+    The variables from which `variable` may be derived (e.g. as a view),
+    through its assignments and phis. None if unknown.
+    """
+    seen = set()
+    stack = [variable]
+    while stack:
+        variable = stack.pop()
+        if variable is None:
+            return None
+        if variable in seen:
+            continue
+
+        seen.add(variable)
+        assignment = variable.name_assignment
+        if variable.is_phi:
+            stack.extend(assignment.incoming)
+        elif assignment is not None and assignment.rhs is not None:
+            stack.extend(getattr(node, 'variable', None)
+                             for node in ast.walk(assignment.rhs)
+                                 if isinstance(node, ast.Name))
+
+    return seen
+
+
+class FusedArrayExpression(nodes.Node):
+    """
+    Consecutive array expression assignments that are evaluated by a single
+    kernel. The targets of `temporaries` are only used by later statements
+    of the sequence, and are computed as scalars inside the kernel.
+    `assignment` is the last statement.
+    """
+
+    _fields = ['temporaries', 'assignment']
+
+    def __init__(self, temporaries, assignment, **kwargs):
+        super(FusedArrayExpression, self).__init__(**kwargs)
+        self.temporaries = temporaries
+        self.assignment = assignment
+
+
 class ArrayExpressionRewrite(visitors.NumbaTransformer):
     """
     Find element-wise expressions and run ElementalMapper to turn it into
     a minivect AST or a ufunc.
+
+    Consecutive element-wise assignments are fused into one kernel when
+    the intermediate arrays are not used elsewhere:
+
+        t = a * b
+        u = t + c
+        out[:] = u * u
+
+    becomes a single pass that evaluates t and u element by element. The
+    target of a slice assignment must be an array allocated in the function
+    (e.g. out = np.empty_like(a)), as other arrays may share memory with
+    the operands of the temporaries.
+
+    Reductions (see numba.support.numpy_support.reductions) are evaluated
+    in the loop nest of the expression they reduce, and can end a sequence
+    of fused assignments:
+
+        t = a * b
+        total = (t + c).sum()
     """
 
     nesting_level = 0
@@ -38,6 +180,179 @@ class ArrayExpressionRewrite(visitors.NumbaTransformer):
 
     is_slice_assign = False
 
+    # [(Variable, array expression)] to compute in the next kernel
+    temporaries = ()
+    variable_uses = None
+
+    fuse = True
+
+    # 1 to compile the reduced expression of a reduction into the kernel of
+    # the reduction, 0 to evaluate it as an array expression of its own
+    reduction_nesting_level = 0
+
+    #------------------------------------------------------------------------
+    # Fusion of consecutive statements
+    #------------------------------------------------------------------------
+
+    def visit_FunctionDef(self, node):
+        node.body = self.fuse_statements(node.body)
+        self.generic_visit(node)
+        return node
+
+    def visit_ControlBlock(self, node):
+        node.body = self.fuse_statements(node.body)
+        return super(ArrayExpressionRewrite, self).visit_ControlBlock(node)
+
+    def is_fusable(self, stmt):
+        if not (isinstance(stmt, ast.Assign) and len(stmt.targets) == 1):
+            return False
+
+        target, value = stmt.targets[0], stmt.value
+        if isinstance(value, reductions.ArrayReductionNode):
+            return (self.reduction_nesting_level and
+                    isinstance(target, ast.Name) and
+                    not contains_reduction(value.array))
+        elif not is_array_expression(value) or contains_reduction(value):
+            # Nested reductions have kernels of their own
+            return False
+
+        if isinstance(target, ast.Name):
+            return getattr(target, 'variable', None) is not None
+        return (isinstance(target, ast.Subscript) and target.type.is_array and
+                is_elementwise_assignment(self.context, stmt))
+
+    def last_use(self, stmts, i):
+        """
+        If the target of stmts[i] is a temporary that is only referenced
+        in stmts[i+1:], as an element of their element-wise expressions,
+        return the index of its last reference.
+        """
+        target = stmts[i].targets[0]
+        if (not isinstance(target, ast.Name) or
+                isinstance(stmts[i].value, reductions.ArrayReductionNode)):
+            return None
+
+        variable = target.variable
+        if (not variable.renameable or variable.is_cellvar or
+                variable.is_freevar):
+            return None
+
+        total = self.variable_uses[variable]
+        last = None
+        for j in range(i + 1, len(stmts)):
+            uses = count_variable_uses(stmts[j]).get(variable, 0)
+            if uses:
+                if uses != elementwise_uses(stmts[j].value, variable):
+                    # Subscripted, used as an attribute or call argument,
+                    # or the base of the assignment target
+                    return None
+                total -= uses
+                last = j
+
+        if total == 0:
+            return last
+        return None
+
+    def partition(self, stmts):
+        """
+        Partition consecutive fusable statements into groups that end
+        with the last reference to the temporaries of the group.
+        """
+        groups = []
+        start = end = 0
+        for i in range(len(stmts)):
+            last = self.last_use(stmts, i)
+            if last is not None:
+                end = max(end, last)
+            elif end > i:
+                # Temporaries live across a non-temporary, don't fuse
+                groups.extend([stmt] for stmt in stmts[start:i + 1])
+                start = end = i + 1
+            else:
+                groups.append(stmts[start:i + 1])
+                start = end = i + 1
+
+        return groups
+
+    def fuse_group(self, group):
+        temporaries, assignment = group[:-1], group[-1]
+        if not temporaries:
+            return assignment
+
+        target = assignment.targets[0]
+        if (isinstance(target, ast.Subscript) and
+                not self.is_private_target(target, temporaries)):
+            return group
+
+        return FusedArrayExpression(temporaries, assignment)
+
+    def is_private_target(self, target, temporaries):
+        """
+        The kernel writes the target while it reads the operands of the
+        temporaries. Only fuse if the target is an array allocated in the
+        function, which the operands do not refer to. Other arrays (e.g.
+        arguments) may share memory under different names.
+        """
+        base = target.value
+        variable = getattr(base, 'variable', None)
+        if not isinstance(base, ast.Name) or not is_allocated_array(variable):
+            return False
+
+        for temporary in temporaries:
+            for node in ast.walk(temporary.value):
+                if isinstance(node, ast.Name):
+                    sources = source_variables(getattr(node, 'variable',
+                                                       None))
+                    if sources is None or variable in sources:
+                        return False
+
+        return True
+
+    def fuse_statements(self, stmts):
+        if not (self.fuse and self.have_cfg):
+            return stmts
+
+        if self.variable_uses is None:
+            self.variable_uses = count_variable_uses(self.ast, self.ast.flow)
+
+        result = []
+        run = []
+        for stmt in stmts + [None]:
+            if stmt is not None and self.is_fusable(stmt):
+                run.append(stmt)
+                continue
+
+            for group in self.partition(run):
+                fused = self.fuse_group(group)
+                if isinstance(fused, list):
+                    result.extend(fused)
+                else:
+                    result.append(fused)
+
+            run = []
+            if stmt is not None:
+                result.append(stmt)
+
+        return result
+
+    def visit_FusedArrayExpression(self, node):
+        temporaries = []
+        for assignment in node.temporaries:
+            self.nesting_level = 1
+            value = self.visit(assignment.value)
+            temporaries.append((assignment.targets[0].variable, value))
+
+        self.nesting_level = 0
+        self.temporaries = temporaries
+        try:
+            return self.visit(node.assignment)
+        finally:
+            self.temporaries = ()
+
+    #------------------------------------------------------------------------
+    # Array expressions
+    #------------------------------------------------------------------------
+
     def register_array_expression(self, node, lhs=None):
         """
         Start the mapping process for the outermost node in the array expression.
@@ -46,6 +361,11 @@ class ArrayExpressionRewrite(visitors.NumbaTransformer):
 
     def visit_elementwise(self, elementwise, node):
         if elementwise and self.nesting_level == 0:
+            if contains_reduction(node):
+                # Lower the reductions in the operands first
+                self.nesting_level += 1
+                self.generic_visit(node)
+                self.nesting_level -= 1
             return self.register_array_expression(node)
 
         self.nesting_level += 1
@@ -54,12 +374,21 @@ class ArrayExpressionRewrite(visitors.NumbaTransformer):
         self.elementwise = elementwise
         return node
 
-    def get_py_ufunc_ast(self, lhs, node):
+    def get_py_ufunc_ast(self, lhs, node, reduction=None):
         if lhs is not None:
             lhs.ctx = ast.Load()
 
         builder = ufunc_builder.UFuncConverter()
+        temporaries, self.temporaries = self.temporaries, ()
+        for variable, expr in temporaries:
+            builder.register_temporary(variable, builder.visit(expr))
+
         tree = builder.visit(node)
+        if reduction is not None:
+            operator = reduction.operator
+            tree = builder.register_accumulator(
+                tree, lambda acc, value: reductions.combine_expr(operator,
+                                                                 acc, value))
         ufunc_ast = builder.build_ufunc_ast(tree)
 
         if print_ufunc:
@@ -69,13 +398,17 @@ class ArrayExpressionRewrite(visitors.NumbaTransformer):
             print((asttools.python_source(module)))
 
         # Vectorize Python function
-        if lhs is None:
+        if reduction is not None:
+            restype = reduction.dtype
+        elif lhs is None:
             restype = node.type
         else:
             restype = lhs.type.dtype
 
         argtypes = [op.type.dtype if op.type.is_array else op.type
                         for op in builder.operands]
+        if reduction is not None:
+            argtypes.insert(0, restype)
         signature = restype(*argtypes)
 
         return ufunc_ast, signature, builder
@@ -120,6 +453,30 @@ class ArrayExpressionRewrite(visitors.NumbaTransformer):
 
         return node
 
+    def register_reduction(self, node):
+        "Evaluate the reduction with a call to NumPy"
+        numpy_func = reductions.numpy_functions[node.operator]
+        keywords = None
+        if node.axis is not None:
+            keywords = [ast.keyword('axis', nodes.objconst(node.axis))]
+
+        func = nodes.ObjectInjectNode(numpy_func)
+        call = nodes.ObjectCallNode(signature=None, func=func,
+                                    args=[node.array], keywords=keywords,
+                                    py_func=numpy_func)
+        return nodes.CoercionNode(nodes.ObjectTempNode(call), node.type)
+
+    def visit_ArrayReductionNode(self, node):
+        # Rewrite the reduced expression, which may contain reductions with
+        # kernels of their own
+        temporaries, self.temporaries = self.temporaries, ()
+        nesting_level = self.nesting_level
+        self.nesting_level = self.reduction_nesting_level
+        node.array = self.visit(node.array)
+        self.nesting_level, self.temporaries = nesting_level, temporaries
+
+        return self.register_reduction(node)
+
     def visit_MathNode(self, node):
         elementwise = node.arg.type.is_array
         return self.visit_elementwise(elementwise, node)
@@ -203,20 +560,82 @@ class ArrayExpressionRewriteNative(ArrayExpressionRewrite):
                 for(...)
                     a[i, j] = numba_kernel(b[i, j], c[i, j])
 
+    Reductions accumulate into the left-hand side, a view of the
+    accumulators in which the reduced dimensions have stride zero:
+
+        def numba_kernel(acc, b, c):
+            value = b * c
+            return acc + value
+
+        def minikernel(...):
+            for (...)
+                for(...)
+                    acc[i, j] = numba_kernel(acc[i, j], b[i, j], c[i, j])
+
     CAN be used in a nopython context
     """
 
+    reduction_nesting_level = 1
+
+    # Select among minivect specializations (see numba.array_layouts)
+    specialize_layouts = True
+
     def array_attr(self, node, attr):
         # Perform a low-level bitcast from object to an array type
         # array = nodes.CoercionNode(node, float_[:])
         array = node
         return nodes.ArrayAttributeNode(attr, array)
 
-    def register_array_expression(self, node, lhs=None):
+    def register_reduction(self, node):
+        return self.register_array_expression(node.array, reduction=node)
+
+    def reduction_accumulator(self, reduction, ndim, shape):
+        """
+        Create the accumulator of a reduction of an expression with
+        dimensionality `ndim` and the given shape. Returns the accumulator
+        and the result of the reduction.
+        """
+        if reduction.axis is None:
+            accumulator = reductions.ReductionAccumulatorNode(
+                reduction.dtype, ndim, reduction.identity,
+                operator=reduction.operator, shape=shape.clone).cloneable
+            result = nodes.DereferenceNode(
+                self.array_attr(accumulator.clone, 'data'))
+            return accumulator, result
+
+        if self.nopython:
+            raise error.NumbaError(
+                reduction, "Cannot allocate new memory in nopython context")
+
+        out_shape = reductions.ReducedShapeNode(shape.clone, ndim,
+                                                reduction.axis)
+        out = nodes.ArrayNewEmptyNode(reduction.type, out_shape).cloneable
+        accumulator = reductions.ReductionAccumulatorNode(
+            reduction.dtype, ndim, reduction.identity,
+            out=out, axis=reduction.axis, operator=reduction.operator,
+            shape=shape.clone).cloneable
+        return accumulator, out.clone
+
+    def compile_combine(self, reduction):
+        "Compile the function that combines partial results of a reduction"
+        combine_ast = reductions.build_combine_ast(
+            reduction.operator, templating.temp_name("combine"))
+        signature = reduction.dtype(reduction.dtype, reduction.dtype)
+        func_env, (_, _, _) = pipeline.run_pipeline2(
+            self.env, None, combine_ast, signature,
+            function_globals={},
+        )
+        functions.keep_alive(self.func, func_env.lfunc)
+        return func_env.lfunc
+
+    def register_array_expression(self, node, lhs=None, reduction=None):
         super(ArrayExpressionRewriteNative, self).register_array_expression(
             node, lhs)
 
-        lhs_type = lhs.type if lhs else node.type
+        if reduction is not None:
+            lhs_type = typesystem.array(reduction.dtype, node.type.ndim)
+        else:
+            lhs_type = lhs.type if lhs else node.type
         is_expr = lhs is None
 
         if node.type.is_array and lhs_type.ndim < node.type.ndim:
@@ -227,7 +646,8 @@ class ArrayExpressionRewriteNative(ArrayExpressionRewrite):
                       "dimensionality <= %d" % lhs_type.ndim)
 
         # Create ufunc scalar kernel
-        ufunc_ast, signature, ufunc_builder = self.get_py_ufunc_ast(lhs, node)
+        ufunc_ast, signature, ufunc_builder = self.get_py_ufunc_ast(
+            lhs, node, reduction)
         signature.struct_by_reference = True
 
         # Compile ufunc scalar kernel with numba
@@ -256,7 +676,11 @@ class ArrayExpressionRewriteNative(ArrayExpressionRewrite):
         shape = slicenodes.BroadcastNode(lhs_type, broadcast_operands)
         operands = [op.clone for op in operands]
 
-        if lhs is None and self.nopython:
+        if reduction is not None:
+            shape = shape.cloneable
+            lhs, reduction_result = self.reduction_accumulator(
+                reduction, lhs_type.ndim, shape)
+        elif lhs is None and self.nopython:
             raise error.NumbaError(
                 node, "Cannot allocate new memory in nopython context")
         elif lhs is None:
@@ -275,12 +699,54 @@ class ArrayExpressionRewriteNative(ArrayExpressionRewrite):
         variables = [b.variable(name_node.type, "op%d" % i)
                      for i, name_node in enumerate([lhs] + operands)]
         miniargs = [b.funcarg(variable) for variable in variables]
-        body = miniutils.build_kernel_call(lfunc.name, signature, miniargs, b)
+        if reduction is None:
+            kernel_args = miniargs
+        else:
+            # acc[i, j] = kernel(acc[i, j], ...)
+            kernel_args = miniargs[:1] + miniargs
+        body = miniutils.build_kernel_call(lfunc.name, signature,
+                                           kernel_args, b)
 
         minikernel = b.function_from_numpy(
             templating.temp_name("array_expression"), body, miniargs)
-        lminikernel, ctypes_kernel = context.run_simple(
-            minikernel, specializers.StridedSpecializer)
+
+        all_operands = [lhs] + operands
+        dtypes = [op.type.dtype if op.type.is_array else op.type
+                      for op in all_operands]
+        array_operands = [op for op in all_operands if op.type.is_array]
+        array_ndims = [op.type.ndim for op in array_operands]
+
+        # Compile the kernel for several data layouts, and select one at
+        # runtime
+        names = ['strided']
+        if (self.specialize_layouts and
+                not any(dtype.is_object for dtype in dtypes)):
+            names = array_layouts.applicable_specializations(lhs_type.ndim,
+                                                             array_ndims)
+        blocksize = None
+        if 'tiled' in names:
+            blocksize = self.env.tuning.get(autotune.BLOCKSIZE,
+                                            lhs_type.dtype, lhs_type.ndim)
+        kernels = array_layouts.build_specializations(context, minikernel,
+                                                      names, blocksize)
+        itemsizes = [op.type.dtype.get_dtype().itemsize
+                         for op in array_operands]
+        lminikernel = array_layouts.build_dispatcher(
+            kernels, array_ndims, itemsizes, lhs_type.ndim)
+
+        # Split the outer dimension across threads for large expressions.
+        # A reduction along the outer dimension would write the same
+        # accumulators from every thread.
+        if (self.env.parallel.is_eligible(lhs_type.ndim, dtypes) and
+                (reduction is None or reduction.axis != 0)):
+            lcombine = None
+            if reduction is not None and reduction.axis is None:
+                # Each thread accumulates a partial result
+                lcombine = self.compile_combine(reduction)
+            threshold = self.env.parallel.get_threshold(
+                self.env.tuning, lhs_type.dtype, lhs_type.ndim)
+            lminikernel = self.env.parallel.build_parallel_kernel(
+                self.context, lminikernel, array_ndims, lcombine, threshold)
 
         # Build call to minivect kernel
         operands.insert(0, lhs)
@@ -304,7 +770,10 @@ class ArrayExpressionRewriteNative(ArrayExpressionRewrite):
         # Use native slicing in array expressions
         slicenodes.mark_nopython(ast.Suite(body=result.args))
 
-        if not is_expr:
+        if reduction is not None:
+            # (b[:] * c[:]).sum()
+            return nodes.ExpressionNode(stmts=[result], expr=reduction_result)
+        elif not is_expr:
             # a[:] = b[:] * c[:]
             return result
 
@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+"""
+Runtime selection of the minivect specialization of an array expression
+kernel (see numba.array_expressions).
+
+An array expression is compiled with several minivect specializers, and
+a dispatcher with the signature of the strided kernel
+
+    int kernel(npy_intp *shape, data0, npy_intp *strides0, data1, ...)
+
+checks the layouts of the operands and calls the most specific kernel
+that applies:
+
+    contig:         all operands are contiguous in the same order, iterate
+                    over the data with a single loop
+    inner_contig:   the inner (C) dimension of all operands is contiguous
+    tiled:          some operand has a smaller stride in the second to last
+                    dimension than in the last one (transposed or Fortran
+                    ordered data), iterate in tiles of the last two
+                    dimensions (the tile size can be tuned, see
+                    numba.autotune)
+    strided:        anything else
+"""
+from __future__ import print_function, division, absolute_import
+
+import llvm.core
+
+from numba.minivect import specializers
+
+_int1 = llvm.core.Type.int(1)
+_int32 = llvm.core.Type.int(32)
+
+# Specializations in the order in which they are tried
+specialization_names = ('contig', 'inner_contig', 'tiled', 'strided')
+
+def _index(i):
+    return llvm.core.Constant.int(_int32, i)
+
+def applicable_specializations(ndim, array_ndims):
+    """
+    The names of the specializations worth compiling for a kernel of
+    dimensionality `ndim`, with array operands of dimensionality
+    `array_ndims`.
+    """
+    names = []
+    for name in specialization_names:
+        if name == 'contig' and any(array_ndim != ndim
+                                        for array_ndim in array_ndims):
+            # Broadcasting operands with fewer dimensions
+            continue
+        elif name == 'tiled' and ndim < 2:
+            continue
+        names.append(name)
+
+    return names
+
+class BlocksizeMixin(object):
+    "Specializer mixin that tiles with the blocksize of the context"
+
+    def get_blocksize(self):
+        return self.astbuilder.constant(self.context.blocksize)
+
+def build_specializations(context, minikernel, names, blocksize=None):
+    """
+    Compile the minivect kernel with each specializer in `names`, with
+    tiles of `blocksize` (default 64) in the tiled specialization.
+    """
+    if blocksize is not None:
+        context.blocksize = blocksize
+        context.specializer_mixin_cls = BlocksizeMixin
+
+    kernels = []
+    for name in names:
+        specializer = specializers.specializers[name]
+        lkernel, ctypes_kernel = context.run_simple(minikernel, specializer)
+        kernels.append((name, lkernel))
+
+    return kernels
+
+#------------------------------------------------------------------------
+# Layout checks
+#------------------------------------------------------------------------
+
+class Operand(object):
+    "An array operand of the dispatcher"
+
+    def __init__(self, data, strides, ndim, itemsize):
+        self.data = data
+        self.strides = strides
+        self.ndim = ndim
+        self.itemsize = itemsize
+
+    def stride(self, builder, dim):
+        return builder.load(builder.gep(self.strides, [_index(dim)]))
+
+
+class LayoutChecks(object):
+    """
+    Build the conditions under which a specialization applies, given
+    the shape and the operands of the dispatcher.
+    """
+
+    def __init__(self, builder, shape, ndim, operands):
+        self.builder = builder
+        self.ndim = ndim
+        self.operands = operands
+        self.extents = [builder.load(builder.gep(shape, [_index(dim)]))
+                            for dim in range(ndim)]
+        self.intp = self.extents[0].type
+
+    def const(self, value):
+        return llvm.core.Constant.int(self.intp, value)
+
+    def all(self, conditions):
+        result = llvm.core.Constant.int(_int1, 1)
+        for condition in conditions:
+            result = self.builder.and_(result, condition)
+        return result
+
+    def is_unit_extent(self, dim):
+        return self.builder.icmp(llvm.core.ICMP_EQ, self.extents[dim],
+                                 self.const(1))
+
+    def has_stride(self, operand, dim, stride):
+        "Whether the stride is as given, or the dimension does not matter"
+        stride_ok = self.builder.icmp(llvm.core.ICMP_EQ,
+                                      operand.stride(self.builder, dim),
+                                      stride)
+        # Operands with fewer dimensions are aligned to the right
+        shape_dim = self.ndim - operand.ndim + dim
+        return self.builder.or_(stride_ok, self.is_unit_extent(shape_dim))
+
+    def is_contig(self, operand, order):
+        dims = range(self.ndim)
+        if order == 'C':
+            dims = reversed(dims)
+
+        conditions = []
+        expected = self.const(operand.itemsize)
+        for dim in dims:
+            conditions.append(self.has_stride(operand, dim, expected))
+            expected = self.builder.mul(expected, self.extents[dim])
+
+        return self.all(conditions)
+
+    def abs(self, value):
+        is_negative = self.builder.icmp(llvm.core.ICMP_SLT, value,
+                                        self.const(0))
+        return self.builder.select(is_negative, self.builder.neg(value),
+                                   value)
+
+    def contig(self):
+        "All operands are C contiguous, or all are Fortran contiguous"
+        return self.builder.or_(
+            self.all(self.is_contig(op, 'C') for op in self.operands),
+            self.all(self.is_contig(op, 'F') for op in self.operands))
+
+    def inner_contig(self):
+        return self.all(
+            self.has_stride(op, op.ndim - 1, self.const(op.itemsize))
+                for op in self.operands)
+
+    def tiled(self):
+        conditions = []
+        for op in self.operands:
+            if op.ndim >= 2:
+                inner = self.abs(op.stride(self.builder, op.ndim - 1))
+                outer = self.abs(op.stride(self.builder, op.ndim - 2))
+                # Ignore dimensions broadcast with a zero stride
+                conditions.append(self.builder.and_(
+                    self.builder.icmp(llvm.core.ICMP_NE, outer, self.const(0)),
+                    self.builder.icmp(llvm.core.ICMP_ULT, outer, inner)))
+
+        result = llvm.core.Constant.int(_int1, 0)
+        for condition in conditions:
+            result = self.builder.or_(result, condition)
+        return result
+
+#------------------------------------------------------------------------
+# Dispatcher
+#------------------------------------------------------------------------
+
+def _contig_args(args, array_ndims):
+    "Drop the strides from the arguments of a strided kernel"
+    nstrided = 1 + 2 * len(array_ndims)
+    return ([args[0]] + args[1:nstrided:2] + args[nstrided:])
+
+def build_dispatcher(kernels, array_ndims, itemsizes, ndim):
+    """
+    Build a function with the signature of the strided kernel that calls
+    the first kernel of `kernels` ([(name, lkernel)] in the order of
+    `specialization_names`, ending with 'strided') whose layout conditions
+    hold.
+    """
+    names = [name for name, lkernel in kernels]
+    assert names[-1] == 'strided', names
+    strided_kernel = kernels[-1][1]
+    if len(kernels) == 1:
+        return strided_kernel
+
+    kernel_type = strided_kernel.type.pointee
+    llvm_module = strided_kernel.module
+    lfunc = llvm_module.add_function(kernel_type,
+                                     strided_kernel.name + "_dispatch")
+    args = list(lfunc.args)
+    operands = [Operand(args[1 + 2 * i], args[2 + 2 * i], array_ndim, itemsize)
+                    for i, (array_ndim, itemsize)
+                        in enumerate(zip(array_ndims, itemsizes))]
+
+    builder = llvm.core.Builder.new(lfunc.append_basic_block('entry'))
+    checks = LayoutChecks(builder, args[0], ndim, operands)
+
+    for name, lkernel in kernels[:-1]:
+        call_block = lfunc.append_basic_block(name)
+        next_block = lfunc.append_basic_block('not_' + name)
+        builder.cbranch(getattr(checks, name)(), call_block, next_block)
+
+        builder.position_at_end(call_block)
+        if name == 'contig':
+            kernel_args = _contig_args(args, array_ndims)
+        else:
+            kernel_args = args
+        builder.ret(builder.call(lkernel, kernel_args))
+
+        builder.position_at_end(next_block)
+
+    builder.ret(builder.call(strided_kernel, args))
+
+    lfunc.verify()
+    return lfunc
@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+"""
+Autotuning of code generation parameters of array expressions.
+
+The tile size of the tiled minivect specialization (see numba.array_layouts)
+and the minimum size of array expressions that run in parallel (see
+numba.parallel) depend on the dtype, the cache sizes and the number of
+cores of the host. autotune() benchmarks candidate values on this host,
+for each dtype and dimensionality, and stores the best ones in a tuning
+database:
+
+    from numba import autotune
+    autotune.autotune(dtypes=['float32', 'float64'], ndims=[2, 3])
+
+The database is a JSON file, ~/.numba/tuning.json by default, or the path
+in the NUMBA_TUNING_DB environment variable. Array expressions compiled
+afterwards (also in other processes) read the tuned values at codegen time.
+Values that were not tuned fall back to the defaults (a tile size of 64,
+and the threshold of ParallelSettings). An explicit parallel threshold,
+given to enable_parallel() or NUMBA_PARALLEL_THRESHOLD, takes precedence.
+"""
+from __future__ import print_function, division, absolute_import
+
+import os
+import json
+import types
+import logging
+import tempfile
+import timeit
+
+logger = logging.getLogger(__name__)
+
+# Parameters in the database
+BLOCKSIZE = 'blocksize'
+PARALLEL_THRESHOLD = 'parallel_threshold'
+
+default_blocksizes = (16, 32, 64, 128, 256)
+default_dtypes = ('float32', 'float64')
+default_ndims = (2,)
+
+def default_path():
+    return os.path.join(os.path.expanduser('~'), '.numba', 'tuning.json')
+
+def dtype_name(dtype):
+    "The NumPy name of a numba type, NumPy dtype or dtype name"
+    if hasattr(dtype, 'get_dtype'):
+        dtype = dtype.get_dtype()
+
+    import numpy as np
+    return np.dtype(dtype).name
+
+#------------------------------------------------------------------------
+# Tuning database
+#------------------------------------------------------------------------
+
+class TuningDatabase(object):
+    """
+    Tuned values of code generation parameters, per parameter, dtype and
+    dimensionality. The file is read on first lookup.
+
+        enabled: whether lookups return tuned values or the defaults
+    """
+
+    def __init__(self, path=None, enabled=True):
+        self.path = path or default_path()
+        self.enabled = enabled
+        self._entries = None
+
+    @staticmethod
+    def key(param, dtype, ndim):
+        return "%s:%s:%dd" % (param, dtype_name(dtype), ndim)
+
+    @property
+    def entries(self):
+        if self._entries is None:
+            self._entries = self.load()
+        return self._entries
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return {}
+
+        try:
+            with open(self.path) as f:
+                entries = json.load(f)
+        except (EnvironmentError, ValueError) as e:
+            logger.warning("Could not read numba tuning database %s: %s",
+                           self.path, e)
+            return {}
+
+        if not isinstance(entries, dict):
+            logger.warning("Ignoring malformed numba tuning database %s",
+                           self.path)
+            return {}
+
+        return entries
+
+    def get(self, param, dtype, ndim, default=None):
+        "Get the tuned value of a parameter, or the default"
+        if not self.enabled:
+            return default
+        return self.entries.get(self.key(param, dtype, ndim), default)
+
+    def set(self, param, dtype, ndim, value):
+        self.entries[self.key(param, dtype, ndim)] = value
+
+    def clear(self):
+        self._entries = {}
+
+    def save(self):
+        "Write the database, replacing the file atomically"
+        dirname = os.path.dirname(os.path.abspath(self.path))
+        if not os.path.isdir(dirname):
+            os.makedirs(dirname)
+
+        fd, tmp_path = tempfile.mkstemp(dir=dirname)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self.entries, f, indent=4, sort_keys=True)
+            os.rename(tmp_path, self.path)
+        except EnvironmentError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def __repr__(self):
+        return "TuningDatabase(%r)" % (self.path,)
+
+#------------------------------------------------------------------------
+# Benchmarks
+#------------------------------------------------------------------------
+
+def _kernel(out, a, b):
+    out[...] = a * b + a
+
+def _fresh_function(py_func):
+    "Copy a function, so that autojit compiles it again"
+    return types.FunctionType(py_func.__code__, py_func.__globals__,
+                              py_func.__name__)
+
+def _shape(size, ndim):
+    "A (close to) square shape of about `size` elements"
+    extent = max(2, int(round(size ** (1.0 / ndim))))
+    return (extent,) * ndim
+
+
+class Autotuner(object):
+    """
+    Benchmark candidate parameter values for the array expressions of an
+    environment. The benchmarks compile with the environment, so its
+    tuning database and parallel settings are changed while they run.
+    """
+
+    def __init__(self, env, size=2 ** 20, repeat=5, min_size=2 ** 10,
+                 max_size=2 ** 22):
+        self.env = env
+        # Number of elements of the tile size benchmark
+        self.size = size
+        self.repeat = repeat
+        # Range of sizes of the parallel threshold benchmark
+        self.min_size = min_size
+        self.max_size = max_size
+
+    def compile(self, py_func, *args):
+        """
+        Compile a copy of `py_func` with the current settings of the
+        environment. autojit compiles on the first call, so call it with
+        `args` before the settings change.
+        """
+        from numba.decorators import autojit
+        kernel = autojit(env=self.env)(_fresh_function(py_func))
+        kernel(*args)
+        return kernel
+
+    def time(self, kernel, *args):
+        "Best time of `repeat` calls, after a warm-up call"
+        kernel(*args)
+        timer = timeit.default_timer
+        best = float('inf')
+        for i in range(self.repeat):
+            t = timer()
+            kernel(*args)
+            best = min(best, timer() - t)
+        return best
+
+    def operands(self, dtype, shape, transpose):
+        import numpy as np
+        a = np.ones(shape, dtype=dtype)
+        b = np.ones(shape[::-1] if transpose else shape, dtype=dtype)
+        if transpose:
+            b = b.T
+        return np.empty(shape, dtype=dtype), a, b
+
+    def tune_blocksize(self, dtype, ndim, blocksizes=default_blocksizes):
+        """
+        Time an expression with a transposed operand (which runs the tiled
+        specialization) with each candidate tile size, and return the
+        fastest.
+        """
+        out, a, b = self.operands(dtype_name(dtype), _shape(self.size, ndim),
+                                  transpose=True)
+        timings = []
+        for blocksize in blocksizes:
+            self.env.tuning.set(BLOCKSIZE, dtype, ndim, blocksize)
+            kernel = self.compile(_kernel, out, a, b)
+            timings.append((self.time(kernel, out, a, b), blocksize))
+            logger.debug("blocksize %d (%s, %dd): %f", blocksize,
+                         dtype_name(dtype), ndim, timings[-1][0])
+
+        return min(timings)[1]
+
+    def tune_parallel_threshold(self, dtype, ndim):
+        """
+        Time an expression serially and in parallel for halving sizes from
+        max_size down to min_size, and return the smallest size from which
+        on parallel execution is faster (max_size * 2 if it never is).
+        """
+        args = self.operands(dtype_name(dtype), _shape(self.min_size, ndim),
+                             transpose=False)
+        self.env.disable_parallel()
+        serial_kernel = self.compile(_kernel, *args)
+        self.env.enable_parallel(threshold=1)
+        parallel_kernel = self.compile(_kernel, *args)
+        self.env.disable_parallel()
+
+        threshold = self.max_size * 2
+        size = self.max_size
+        while size >= self.min_size:
+            args = self.operands(dtype_name(dtype), _shape(size, ndim),
+                                 transpose=False)
+            serial = self.time(serial_kernel, *args)
+            parallel = self.time(parallel_kernel, *args)
+            logger.debug("size %d (%s, %dd): serial %f, parallel %f", size,
+                         dtype_name(dtype), ndim, serial, parallel)
+            if parallel >= serial:
+                break
+            threshold = size
+            size //= 2
+
+        return threshold
+
+
+def autotune(env=None, dtypes=default_dtypes, ndims=default_ndims,
+             blocksizes=default_blocksizes, parallel=True, save=True,
+             **kwargs):
+    """
+    Tune the tile size of tiled array expressions (for ndim >= 2) and the
+    parallel threshold for each dtype and dimensionality, and store them in
+    the tuning database of the environment (see the module docstring).
+    Keyword arguments are passed to Autotuner.
+
+    Returns the tuning database.
+    """
+    from numba import environment
+
+    if env is None:
+        env = environment.NumbaEnvironment.get_environment()
+
+    tuner = Autotuner(env, **kwargs)
+    tuning = env.tuning
+    settings = env.parallel
+    enabled, threshold = settings.enabled, settings.threshold
+    tuning_enabled, tuning.enabled = tuning.enabled, True
+    # Cached kernels would not be compiled with the candidate values
+    disk_cache = env.specializations.disk_cache
+    env.disable_disk_cache()
+    try:
+        env.disable_parallel()
+        for dtype in dtypes:
+            for ndim in ndims:
+                if ndim >= 2:
+                    blocksize = tuner.tune_blocksize(dtype, ndim, blocksizes)
+                    tuning.set(BLOCKSIZE, dtype, ndim, blocksize)
+                if parallel:
+                    threshold_value = tuner.tune_parallel_threshold(dtype,
+                                                                    ndim)
+                    tuning.set(PARALLEL_THRESHOLD, dtype, ndim,
+                               threshold_value)
+    finally:
+        settings.enabled, settings.threshold = enabled, threshold
+        tuning.enabled = tuning_enabled
+        env.specializations.disk_cache = disk_cache
+
+    if save:
+        tuning.save()
+    return tuning
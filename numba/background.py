@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+Background compilation of @autojit specializations.
+
+With @autojit(background_compile=True), a call that misses in the
+AutojitFunctionCache runs the original Python function right away, and the
+specialization is compiled on a worker thread. Once compiled, it is
+installed in the AutojitFunctionCache and later calls take the fast path.
+
+The numba compiler is not re-entrant across threads, so all compilation
+(foreground and background) is serialized through compile_lock.
+"""
+from __future__ import print_function, division, absolute_import
+
+import logging
+import threading
+
+try:
+    import Queue as queue
+except ImportError:
+    import queue
+
+logger = logging.getLogger(__name__)
+
+# Serializes all compilation in the process
+compile_lock = threading.RLock()
+
+class BackgroundCompiler(object):
+    """
+    Worker thread compiling autojit specializations.
+
+    Statistics:
+
+        compiled: number of specializations compiled in the background
+        failed: number of specializations that failed to compile. These
+                keep running in the interpreter.
+    """
+
+    def __init__(self):
+        self.queue = queue.Queue()
+        self.compiled = 0
+        self.failed = 0
+        self.thread = None
+        self.start_lock = threading.Lock()
+
+    def start(self):
+        with self.start_lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run,
+                                               name="numba-compiler")
+                self.thread.daemon = True
+                self.thread.start()
+
+    def submit(self, numba_func, args):
+        """
+        Schedule compilation of numba_func (a NumbaSpecializingWrapper) for
+        the types of the given arguments.
+        """
+        self.submit_job(lambda: self.compile(numba_func, args))
+
+    def submit_job(self, job):
+        "Schedule a callable to run on the worker thread"
+        self.start()
+        self.queue.put(job)
+
+    def run(self):
+        while True:
+            job = self.queue.get()
+            try:
+                job()
+            except Exception:
+                logger.exception("Background compilation job failed")
+            finally:
+                self.queue.task_done()
+
+    def compile(self, numba_func, args):
+        try:
+            with compile_lock:
+                numba_wrapper = numba_func.compiling_decorator(args, {})
+        except Exception:
+            self.failed += 1
+            logger.exception("Background compilation of %s failed, "
+                             "falling back to the interpreter",
+                             numba_func.func_name)
+        else:
+            numba_func.funccache.add(args, numba_wrapper)
+            self.compiled += 1
+
+    @property
+    def pending(self):
+        "Number of specializations waiting to be compiled"
+        return self.queue.qsize()
+
+    def wait(self):
+        "Block until all submitted specializations are compiled"
+        self.queue.join()
+
+# The worker thread is only started on the first submission
+_background_compiler = BackgroundCompiler()
+
+def get_background_compiler():
+    "Return the process-wide BackgroundCompiler"
+    return _background_compiler
@@ -51,15 +51,15 @@ class LLVMContextManager(object):
         # Create the ExceutionEngine
         self.__engine = le.EngineBuilder.new(m).create(tm)
         # Build a PassManager which will be used for every module/
-        has_loop_vectorizer = llvm.version >= (3, 2)
-        passmanagers = lp.build_pass_managers(tm, opt=opt,
-                                              inline_threshold=inline,
-                                              loop_vectorize=has_loop_vectorizer,
-                                              fpm=False)
-        self.__pm = passmanagers.pm
+        self.__inline = inline
+        self.__pms = {}
+        self.__pm = self.get_pass_manager(opt)
 
         self.__string_constants = {}
 
+        # Names of functions defined in the global module
+        self.__symbols = set()
+
     @property
     def module(self):
         return self.__module
@@ -76,73 +76,116 @@ class LLVMContextManager(object):
     def target_machine(self):
         return self.__machine
 
-    def link(self, lfunc):
-        if lfunc.module is not self.module:
-            # optimize
-            self.pass_manager.run(lfunc.module)
-            # link module
-            func_name = lfunc.name
-            #
-            #            print 'lfunc.module'.center(80, '-')
-            #            print lfunc.module
-            #
-            #            print 'self.module'.center(80, '-')
-            #            print self.module
-
-            # XXX: Better safe than sorry.
-            #      Check duplicated function definitions and remove them.
-            #      This problem should not exists.
-            def is_duplicated_function(f):
-                if f.is_declaration:
-                    return False
-                try:
-                    self.module.get_function_named(f.name)
-                except llvm.LLVMException as e:
-                    return False
-                else:
-                    return True
+    def get_pass_manager(self, opt):
+        "Get a PassManager for the given optimization level [0 - 3]"
+        if opt not in self.__pms:
+            has_loop_vectorizer = llvm.version >= (3, 2) and opt >= 2
+            inline = self.__inline if opt >= 2 else 0
+            passmanagers = lp.build_pass_managers(
+                        self.__machine, opt=opt, inline_threshold=inline,
+                        loop_vectorize=has_loop_vectorizer, fpm=False)
+            self.__pms[opt] = passmanagers.pm
 
+        return self.__pms[opt]
+
+    def optimize(self, llvm_module, opt=None):
+        '''
+        Run the optimization passes over a (not yet linked) function module.
+        By default the module is optimized at the level the context was
+        created with.
+        '''
+        if opt is None:
+            pm = self.pass_manager
+        else:
+            pm = self.get_pass_manager(opt)
+        pm.run(llvm_module)
+
+    def link(self, lfunc, optimize=True):
+        '''
+        Link the module of `lfunc` into the global executable module.
+        Pass optimize=False if the module was already optimized (e.g. when
+        it was loaded from the on-disk cache).
+
+        The cost of linking is proportional to the size of the new module:
+        only the new module is verified, and duplicate definitions are
+        found through an index of the symbols defined in the global module.
+        '''
+        if lfunc.module is not self.module:
             lfunc_module = lfunc.module
-            #print "LINKING", lfunc.name, lfunc.module.id, "in", self.module.id
-            #print [f.name for f in lfunc.module.functions]
-            #print '-----'
+            lfunc_module.verify()
 
+            if optimize:
+                self.optimize(lfunc_module)
+
+            func_name = lfunc.name
+            if self.is_defined(func_name):
+                # XXX: Better safe than sorry.
+                #      If the currently compiling function is already
+                #      defined, rename it. This problem should not exist.
+                import warnings
+                ct = 0
+                while self.is_defined(lfunc.name):
+                    lfunc.name = "%s_duplicated%d" % (func_name, ct)
+                    ct += 1
+                warnings.warn("Renamed duplicated function %s to %s" %
+                              (func_name, lfunc.name))
+                func_name = lfunc.name
+
+            defined = []
             for func in lfunc_module.functions:
-                if is_duplicated_function(func):
-                    import warnings
-                    if func is lfunc:
-                        # If the duplicated function is the currently compiling
-                        # function, rename it.
-                        ct = 0
-                        while is_duplicated_function(func):
-                            func.name = "%s_duplicated%d" % (func_name, ct)
-                            ct += 1
-                        warnings.warn("Renamed duplicated function %s to %s" %
-                                      (func_name, func.name))
-                        func_name = func.name
-                    else:
-                        # If the duplicated function is not the currently
-                        # compiling function, ignore it.
-                        # We assume this is a utility function.
-                        assert func.linkage == lc.LINKAGE_LINKONCE_ODR, func.name
+                if func.is_declaration:
+                    continue
+
+                # If a duplicated function is not the currently compiling
+                # function, ignore it. We assume this is a utility function.
+                assert (func.name == func_name or
+                        func.linkage == lc.LINKAGE_LINKONCE_ODR or
+                        not self.is_defined(func.name)), func.name
+                defined.append(func.name)
 
             self.module.link_in(lfunc_module, preserve=False)
-            #
-            #            print 'linked'.center(80, '='), lfunc.module, lfunc.name
-            #            print self.module
+            self.__symbols.update(defined)
 
             lfunc = self.module.get_function_named(func_name)
 
         assert lfunc.module is self.module
         self.verify(lfunc)
-        #        print lfunc
         return lfunc
 
+    def is_defined(self, name):
+        "Whether a function with the given name is defined in the module"
+        if name in self.__symbols:
+            return True
+
+        # Functions may also be defined directly in the global module
+        # (e.g. wrapper functions)
+        try:
+            lfunc = self.module.get_function_named(name)
+        except llvm.LLVMException:
+            return False
+
+        if lfunc.is_declaration:
+            return False
+
+        self.__symbols.add(name)
+        return True
+
+    def free_function(self, lfunc):
+        "Free the machine code of a function, and delete it from the module"
+        self.execution_engine.free_machine_code(lfunc)
+        self.__symbols.discard(lfunc.name)
+        lfunc.delete()
+
+    def code_size(self, llvm_module):
+        "Return the size in bytes of the object code for a module"
+        return len(self.target_machine.emit_object(llvm_module))
+
     def get_pointer_to_function(self, lfunc):
         return self.execution_engine.get_pointer_to_function(lfunc)
 
     def verify(self, lfunc):
-        lfunc.module.verify()
+        "Verify a function that is part of the global module"
+        lfunc.verify()
         # XXX: remove the following extra checking before release
         for bb in lfunc.basic_blocks:
             for instr in bb.instructions:
@@ -151,3 +194,21 @@ class LLVMContextManager(object):
                     if callee is not None:
                         assert callee.module is lfunc.module,\
                         "Inter module call for call to %s" % callee.name
+
+def strip_unused_definitions(llvm_module):
+    """
+    Delete the linkonce_odr functions and globals in the given module that
+    are not used. These are utilities and constants copied in from the
+    intrinsic library and the constants manager, which we do not want to
+    optimize or link into the global module.
+    """
+    changed = True
+    while changed:
+        # Deleting a function may make the utilities it calls unused
+        changed = False
+        for value in list(llvm_module.functions) + list(
+                                            llvm_module.global_variables):
+            if (value.linkage == lc.LINKAGE_LINKONCE_ODR and
+                    not value.is_declaration and value.use_count == 0):
+                value.delete()
+                changed = True
@@ -210,6 +210,8 @@ def build_wrapper_function_ast(env, wrapper_lfunc, llvm_module):
     # Update wrapper
     wrapper.error_return = error_return
     wrapper.cellvars = []
+    if env.crnt.tier is not None:
+        wrapper.call_counter = env.crnt.tier.call_counter
 
     wrapper.wrapped_nargs = nargs
     wrapper.wrapped_args = args[is_closure:]
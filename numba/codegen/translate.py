@@ -7,7 +7,7 @@ import llvm.core as lc
 import llvm.core
 
 from numba.llvm_types import _int1, _int32, _LLVMCaster
-from numba.multiarray_api import MultiarrayAPI # not used
+from numba.multiarray_api import get_multiarray_api
 from numba.symtab import Variable
 from numba import typesystem
 
@@ -69,7 +69,9 @@ class LLVMCodeGenerator(visitors.NumbaVisitor,
     return an LLVM value.
     """
 
-    multiarray_api = MultiarrayAPI()
+    @property
+    def multiarray_api(self):
+        return get_multiarray_api()
 
     # Values for True/False
     bool_ltype = llvm.core.Type.int(1)
@@ -330,7 +332,11 @@ class LLVMCodeGenerator(visitors.NumbaVisitor,
                 logger.debug(self.llvm_module)
 
             # Verify code generation
-            self.llvm_module.verify()  # only Module level verification checks everything.
+            if self.llvm_module is LLVMContextManager().module:
+                # Don't verify the entire global module for every wrapper
+                self.lfunc.verify()
+            else:
+                self.llvm_module.verify()  # only Module level verification checks everything.
 
             # Reove reference to self.llvm_module
             # This may be destroyed later due to linkage
@@ -369,6 +375,9 @@ class LLVMCodeGenerator(visitors.NumbaVisitor,
         was_debug_conversion = debug.debug_conversion
         debug.debug_conversion = False
 
+        if node.call_counter is not None:
+            self.count_calls(*node.call_counter)
+
         # Unpack tuple into arguments
         arg_types = [object_] * node.wrapped_nargs
         types, lstr = self.object_coercer.lstr(arg_types)
@@ -385,6 +394,38 @@ class LLVMCodeGenerator(visitors.NumbaVisitor,
 
         debug.debug_conversion = was_debug_conversion
 
+    def count_calls(self, counter_addr, threshold, callback_addr):
+        """
+        Increment the call counter at counter_addr, and call the callback
+        when it reaches the threshold.
+        """
+        lcount_type = typesystem.Py_ssize_t.to_llvm(self.context)
+        counter_p = self.builder.inttoptr(
+            llvm.core.Constant.int(lcount_type, counter_addr),
+            llvm.core.Type.pointer(lcount_type))
+
+        count = self.builder.load(counter_p)
+        count = self.builder.add(count, llvm.core.Constant.int(lcount_type, 1))
+        self.builder.store(count, counter_p)
+
+        is_hot = self.builder.icmp(
+            llvm.core.ICMP_EQ, count,
+            llvm.core.Constant.int(lcount_type, threshold))
+
+        bb_hot = self.append_basic_block('tier_up')
+        bb_next = self.append_basic_block('tier_up_done')
+        self.builder.cbranch(is_hot, bb_hot, bb_next)
+
+        self.builder.position_at_end(bb_hot)
+        callback_type = llvm.core.Type.function(llvm.core.Type.void(), [])
+        callback = self.builder.inttoptr(
+            llvm.core.Constant.int(lcount_type, callback_addr),
+            llvm.core.Type.pointer(callback_type))
+        self.builder.call(callback, [])
+        self.builder.branch(bb_next)
+
+        self.builder.position_at_end(bb_next)
+
     @property
     def lfunc_pointer(self):
         return LLVMContextManager().get_pointer_to_function(self.lfunc)
@@ -1705,6 +1746,129 @@ class LLVMCodeGenerator(visitors.NumbaVisitor,
 
         return shape
 
+    #------------------------------------------------------------------------
+    # Reductions
+    #------------------------------------------------------------------------
+
+    def visit_ReducedShapeNode(self, node):
+        shape_type = minitypes.CArrayType(npy_intp, node.ndim - 1)
+        result = self.alloca(shape_type)
+        result = self.builder.bitcast(result, node.type.to_llvm(self.context))
+
+        shape = self.visit(node.shape)
+        dims = [dim for dim in range(node.ndim) if dim != node.axis]
+        for dst_dim, src_dim in enumerate(dims):
+            src = self.builder.gep(shape, [llvm_types.constant_int(src_dim)])
+            dst = self.builder.gep(result, [llvm_types.constant_int(dst_dim)])
+            self.builder.store(self.builder.load(src), dst)
+
+        return result
+
+    def fill(self, data, size, value):
+        "Store value in data[0:size]"
+        bb_cond = self.append_basic_block('fill.cond')
+        bb_body = self.append_basic_block('fill.body')
+        bb_exit = self.append_basic_block('fill.exit')
+
+        index = self.llvm_alloca(size.type)
+        self.builder.store(llvm.core.Constant.int(size.type, 0), index)
+        self.builder.branch(bb_cond)
+
+        self.builder.position_at_end(bb_cond)
+        i = self.builder.load(index)
+        self.builder.cbranch(self.builder.icmp(llvm.core.ICMP_SLT, i, size),
+                             bb_body, bb_exit)
+
+        self.builder.position_at_end(bb_body)
+        self.builder.store(value, self.builder.gep(data, [i]))
+        self.builder.store(
+            self.builder.add(i, llvm.core.Constant.int(size.type, 1)), index)
+        self.builder.branch(bb_cond)
+
+        self.builder.position_at_end(bb_exit)
+
+    def visit_ReductionAccumulatorNode(self, node):
+        """
+        Stack-allocate a fake PyArray viewing the accumulators of a
+        reduction. Reduced dimensions have extent 1 and stride 0.
+        """
+        dtype = node.type.dtype
+        ndim = node.type.ndim
+        data_ltype = dtype.pointer().to_llvm(self.context)
+        shape_ltype = npy_intp.pointer().to_llvm(self.context)
+        identity = self.visit(nodes.const(node.identity, dtype))
+
+        one = llvm.core.Constant.int(C.npy_intp, 1)
+        zero = llvm.core.Constant.int(C.npy_intp, 0)
+
+        if node.check_empty is not None:
+            # Raise if the reduced dimensions are empty
+            shape = self.visit(node.shape)
+            dims = range(ndim) if node.axis is None else [node.axis]
+            nonempty = llvm.core.Constant.int(llvm.core.Type.int(1), 1)
+            for dim in dims:
+                idx = [llvm_types.constant_int(dim)]
+                extent = self.builder.load(self.builder.gep(shape, idx))
+                nonempty = self.builder.and_(nonempty, self.builder.icmp(
+                    llvm.core.ICMP_NE, extent, zero))
+
+            node.nonempty.llvm_value = self.builder.zext(
+                nonempty, int_.to_llvm(self.context))
+            self.visit(node.check_empty)
+
+        if node.out is None:
+            # Reduction of all elements, accumulate in a single scalar
+            data = self.llvm_alloca(data_ltype.pointee)
+            self.builder.store(identity, data)
+            extents = [one] * ndim
+            strides = [zero] * ndim
+        else:
+            out = self.visit(node.out)
+            out_accessor = ndarray_helpers.PyArrayAccessor(self.builder, out)
+            data = self.builder.bitcast(out_accessor.data, data_ltype)
+
+            out_shape = out_accessor.shape
+            out_strides = out_accessor.strides
+            extents = []
+            strides = []
+            size = one
+            for dim in range(ndim - 1):
+                idx = [llvm_types.constant_int(dim)]
+                extent = self.builder.load(self.builder.gep(out_shape, idx))
+                extents.append(extent)
+                strides.append(
+                    self.builder.load(self.builder.gep(out_strides, idx)))
+                size = self.builder.mul(size, extent)
+
+            # The result array is new and contiguous
+            self.fill(data, size, identity)
+
+            extents.insert(node.axis, one)
+            strides.insert(node.axis, zero)
+
+        array_struct_ltype = float_[:].to_llvm(self.context).pointee
+        view = self.llvm_alloca(array_struct_ltype)
+        view_accessor = ndarray_helpers.PyArrayAccessor(self.builder, view)
+
+        shape_type = minitypes.CArrayType(npy_intp, ndim)
+        view_shape = self.builder.bitcast(self.alloca(shape_type), shape_ltype)
+        view_strides = self.builder.bitcast(self.alloca(shape_type),
+                                            shape_ltype)
+        for dim in range(ndim):
+            idx = [llvm_types.constant_int(dim)]
+            self.builder.store(extents[dim],
+                               self.builder.gep(view_shape, idx))
+            self.builder.store(strides[dim],
+                               self.builder.gep(view_strides, idx))
+
+        view_accessor.data = self.builder.bitcast(
+            data, char.pointer().to_llvm(self.context))
+        view_accessor.ndim = llvm_types.constant_int(ndim)
+        view_accessor.shape = view_shape
+        view_accessor.strides = view_strides
+
+        return view
+
     #------------------------------------------------------------------------
     # Pointer Nodes
     #------------------------------------------------------------------------
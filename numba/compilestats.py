@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""
+Compile-time statistics for the numba pipeline.
+
+When enabled, each pipeline stage (and the LLVM optimization, linking and
+machine code generation done by the LinkingStage) records its wall time
+per function. Optionally it also records the number of objects allocated.
+
+    env = NumbaEnvironment.get_environment()
+    env.enable_compile_stats()
+    ...
+    print(env.compile_stats().report())
+
+Setting NUMBA_COMPILE_STATS=1 enables statistics for the default
+environment, and prints the report to stderr at exit.
+
+Times are 'self' times. A stage that runs a nested pipeline (e.g. the
+WrapperStage, which compiles the wrapper function) does not include the
+time of the nested stages. Those are recorded separately under the
+nested function.
+"""
+from __future__ import print_function, division, absolute_import
+
+import gc
+import time
+import contextlib
+from collections import defaultdict
+
+# Use the most precise wall clock available
+timer = getattr(time, 'perf_counter', time.time)
+
+class _Frame(object):
+    def __init__(self, function, stage, track_allocations):
+        self.function = function
+        self.stage = stage
+        self.child_time = 0.0
+        self.child_objects = 0
+        self.objects = len(gc.get_objects()) if track_allocations else 0
+        self.start = timer()
+
+class StageRecord(object):
+    "Timing of one stage for one function"
+
+    def __init__(self, function, stage, seconds, objects):
+        self.function = function
+        self.stage = stage
+        self.seconds = seconds
+        self.objects = objects
+
+    def __repr__(self):
+        return "StageRecord(%r, %r, %.6f, %d)" % (self.function, self.stage,
+                                                  self.seconds, self.objects)
+
+class CompileStats(object):
+    """
+    Collects StageRecords.
+
+        enabled: whether stages are measured
+        track_allocations: whether to count allocated objects (slow)
+    """
+
+    def __init__(self, enabled=False, track_allocations=False):
+        self.enabled = enabled
+        self.track_allocations = track_allocations
+        self.records = []
+        self._stack = []
+
+    def clear(self):
+        del self.records[:]
+
+    @contextlib.contextmanager
+    def measure(self, env, stage):
+        "Measure the code in the with block as the given stage"
+        if not self.enabled:
+            yield
+            return
+
+        frame = _Frame(function_key(env), stage, self.track_allocations)
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            self._record(frame)
+
+    def _record(self, frame):
+        total = timer() - frame.start
+        if self.track_allocations:
+            objects = len(gc.get_objects()) - frame.objects
+        else:
+            objects = 0
+
+        if self._stack:
+            parent = self._stack[-1]
+            parent.child_time += total
+            parent.child_objects += objects
+
+        self.records.append(StageRecord(frame.function, frame.stage,
+                                        total - frame.child_time,
+                                        objects - frame.child_objects))
+
+    # ____________________________________________________________
+    # Aggregation
+
+    def _aggregate(self, keyfunc):
+        totals = defaultdict(lambda: [0, 0.0, 0])
+        for record in self.records:
+            total = totals[keyfunc(record)]
+            total[0] += 1
+            total[1] += record.seconds
+            total[2] += record.objects
+
+        return sorted(((key, calls, seconds, objects)
+                           for key, (calls, seconds, objects)
+                               in totals.items()),
+                      key=lambda item: item[2], reverse=True)
+
+    def by_stage(self):
+        "Return [(stage, calls, seconds, objects)], slowest first"
+        return self._aggregate(lambda record: record.stage)
+
+    def by_function(self):
+        "Return [(function, stages, seconds, objects)], slowest first"
+        return self._aggregate(lambda record: record.function)
+
+    def for_function(self, function):
+        "Return [(stage, calls, seconds, objects)] for one function"
+        records = [r for r in self.records if r.function == function]
+        stats = CompileStats()
+        stats.records = records
+        return stats.by_stage()
+
+    @property
+    def total_time(self):
+        return sum(record.seconds for record in self.records)
+
+    def report(self, limit=10):
+        "Return a report of the slowest stages and functions"
+        lines = []
+        header = "%-50s %8s %10s %10s"
+        row = "%-50s %8d %10.4f %10d"
+
+        for title, column, rows in [("Slowest stages", "stage",
+                                     self.by_stage()),
+                                    ("Slowest functions", "function",
+                                     self.by_function())]:
+            lines.append("%s (total %.4fs)" % (title, self.total_time))
+            lines.append(header % (column, "calls", "seconds", "objects"))
+            for key, calls, seconds, objects in rows[:limit]:
+                lines.append(row % (key[:50], calls, seconds, objects))
+            lines.append("")
+
+        return "\n".join(lines)
+
+def function_key(env):
+    "Describe the function currently being compiled"
+    func_env = env.translation.crnt
+    if func_env is None:
+        return "<unknown>"
+
+    signature = func_env.func_signature
+    if signature is None:
+        args = ""
+    else:
+        args = ", ".join(str(arg) for arg in signature.args)
+
+    return "%s(%s)" % (func_env.func_name, args)
@@ -10,14 +10,121 @@ import numpy as np
 
 GROW = 2
 
+# Compiled typed container classes (typedlist, typedtuple)
+container_classes = set()
+
 def notimplemented(msg):
     raise NotImplementedError("'%s' method" % msg)
 
+#-----------------------------------------------------------------------
+# Bulk operations on the buffers of typed containers
+#-----------------------------------------------------------------------
+
+def length_hint(iterable, default):
+    """
+    The length of `iterable`, or its __length_hint__(), or `default` if
+    neither is known (or the length is zero).
+    """
+    try:
+        n = len(iterable)
+    except TypeError:
+        try:
+            n = iterable.__length_hint__()
+        except Exception:
+            n = 0
+
+    return n if n > 0 else default
+
+def bulk_items(iterable, dtype):
+    """
+    The items of a typed container, 1-D ndarray or buffer protocol object
+    as an array that can be copied to a buffer of `dtype` at once, or None
+    if the items need to be converted one at a time.
+    """
+    if type(iterable) in container_classes:
+        items = iterable.buf[:iterable.size]
+    elif isinstance(iterable, np.ndarray):
+        items = iterable
+    else:
+        try:
+            memoryview(iterable)
+        except TypeError:
+            return None
+        items = np.asarray(iterable)
+
+    if items.ndim != 1 or not np.can_cast(items.dtype, dtype, 'same_kind'):
+        return None
+    return items
+
+def reallocate(buf, size, capacity):
+    """
+    A new buffer of `capacity` items with a copy of buf[:size]. Buffers
+    are not resized in place, so that exported views (see view()) of the
+    old buffer stay valid.
+    """
+    newbuf = np.empty(capacity, dtype=buf.dtype)
+    newbuf[:size] = buf[:size]
+    return newbuf
+
+def extend_buffer(buf, size, items):
+    """
+    Copy `items` to buf[size:]. Returns `buf`, or a new buffer if `buf`
+    has no room for the items.
+    """
+    n = size + len(items)
+    if n > buf.shape[0]:
+        buf = reallocate(buf, size, max(n, int(buf.shape[0] * GROW)))
+
+    buf[size:n] = items
+    return buf
+
+def memmove(buf, dst, src, count):
+    "Move `count` items of `buf` from index `src` to index `dst`"
+    # NumPy copies overlapping ranges like memmove()
+    buf[dst:dst + count] = buf[src:src + count]
+
+def readonly(view):
+    view.flags.writeable = False
+    return view
+
+def slicing_getitem(container_class):
+    """
+    Make __getitem__ of a typed container class accept slices, which return
+    a new container of the same class (a copy of the items). Indices are
+    handled by the native method.
+    """
+    getitem = container_class.__getitem__
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return container_class(self.buf[:self.size][key])
+        return getitem(self, key)
+
+    container_class.__getitem__ = __getitem__
+
+def export_array(container_class):
+    """
+    Make np.asarray() return the view() of the items of a typed container,
+    without copying them.
+    """
+    def __array__(self, dtype=None):
+        if dtype is not None:
+            return self.view().astype(dtype)
+        return self.view()
+
+    container_class.__array__ = __array__
+
+#-----------------------------------------------------------------------
+# Methods of typed containers
+#-----------------------------------------------------------------------
+
 def container_methods(item_type, notimplemented):
     # NOTE: numba will use the global 'notimplemented' function, not the
     # one passed in :(
 
-    @item_type(Py_ssize_t) # TODO: slicing!
+    dtype = item_type.get_dtype()
+
+    @item_type(Py_ssize_t) # Slices are handled by slicing_getitem()
     def getitem(self, key):
         if not (0 <= key < self.size):
             # TODO: Implement raise !
@@ -40,17 +147,21 @@ def container_methods(item_type, notimplemented):
         size = self.size
         if size >= self.buf.shape[0]:
             # NOTE: initial bufsize must be greater than zero
-            self.buf.resize(int(size * GROW), refcheck=False)
+            self.buf = reallocate(self.buf, size, int(size * GROW))
 
         self.buf[size] = value
         self.size = size + 1
 
     @void(object_)
     def extend(self, iterable):
-        # TODO: something fast for common cases (e.g. typedlist,
-        #                                        np.ndarray, etc)
-        for obj in iterable:
-            self.append(obj)
+        items = bulk_items(iterable, dtype)
+        if items != None:
+            size = self.size
+            self.buf = extend_buffer(self.buf, size, items)
+            self.size = size + len(items)
+        else:
+            for obj in iterable:
+                self.append(obj)
 
     @Py_ssize_t(item_type)
     def index(self, value):
@@ -2,6 +2,7 @@ from functools import partial
 
 from numba.containers import typedlist
 from numba.containers import typedtuple
+from numba.containers import typeddict
 from numba.containers import orderedcontainer
 from numba.type_inference.module_type_inference import register_inferer
 
@@ -24,3 +25,13 @@ def infer_ttuple(type_node, iterable_node):
         typedtuple.compile_typedtuple, type_node, iterable_node)
 
 register_inferer(typedtuple, 'typedtuple', infer_ttuple, pass_in_types=False)
+
+#-----------------------------------------------------------------------
+# Register type function for typeddict construction
+#-----------------------------------------------------------------------
+
+def infer_tdict(key_type_node, value_type_node, iterable_node):
+    return typeddict.typeddict_infer(key_type_node, value_type_node,
+                                     iterable_node)
+
+register_inferer(typeddict, 'typeddict', infer_tdict, pass_in_types=False)
@@ -0,0 +1,321 @@
+# -*- coding: utf-8 -*-
+from __future__ import print_function, division, absolute_import
+import numba as nb
+from numba import *
+from numba import nodes
+from numba.minivect import minitypes
+from numba.typesystem import get_type
+
+import numpy as np
+
+INITIAL_CAPACITY = 8
+
+# Slot states
+EMPTY = 0
+USED = 1
+DELETED = 2
+
+def keyerror(key):
+    raise KeyError(key)
+
+_dict_cache = {}
+
+#-----------------------------------------------------------------------
+# Runtime Constructor
+#-----------------------------------------------------------------------
+
+def typeddict(key_type, value_type, iterable=None):
+    """
+    >>> tdict = typeddict(int_, float_, {1: 2.0, 3: 4.0})
+    >>> tdict[1], tdict.get(5, -1.0)
+    (2.0, -1.0)
+    >>> 3 in tdict, 5 in tdict
+    (True, False)
+    >>> tdict[5] = 6
+    >>> del tdict[1]
+    >>> sorted(tdict.items())
+    [(3L, 4.0), (5L, 6.0)]
+    >>> tdict[1]
+    Traceback (most recent call last):
+        ...
+    KeyError: 1L
+    """
+    typeddict_ctor = compile_typeddict(key_type, value_type)
+    return typeddict_ctor(iterable)
+
+#-----------------------------------------------------------------------
+# Helpers
+#-----------------------------------------------------------------------
+
+def capacity_for(size):
+    "The table capacity (a power of two) for `size` items"
+    capacity = INITIAL_CAPACITY
+    while capacity <= 2 * size:
+        capacity *= 2
+    return capacity
+
+def initial_capacity(iterable):
+    try:
+        return capacity_for(len(iterable))
+    except TypeError:
+        return INITIAL_CAPACITY
+
+def dict_items(iterable):
+    "The (key, value) pairs of a mapping or an iterable of pairs"
+    if hasattr(iterable, 'keys'):
+        return [(key, iterable[key]) for key in iterable.keys()]
+    return iterable
+
+def hash_word_dtype(dtype):
+    """
+    Keys are hashed from the bits of their value, as an array of words of
+    this dtype.
+    """
+    if dtype.itemsize in (1, 2, 4):
+        return np.dtype('i%d' % dtype.itemsize)
+    assert dtype.itemsize % 8 == 0, dtype
+    return np.dtype(np.int64)
+
+#-----------------------------------------------------------------------
+# Typeddict implementation
+#-----------------------------------------------------------------------
+
+def compile_typeddict(key_type, value_type, _dict_cache=_dict_cache):
+    """
+    Compile a hash map from `key_type` to `value_type`. The keys, values
+    and slot states are stored in NumPy arrays, which form an open
+    addressing hash table with linear probing. Deleted slots are marked
+    and reused, and the table is rebuilt when more than 2/3 of the slots
+    are used or deleted.
+    """
+    if (key_type, value_type) in _dict_cache:
+        return _dict_cache[key_type, value_type]
+
+    # Keys are hashed from their bits, which identify numeric values only
+    if not (key_type.is_int or key_type.is_float or key_type.is_complex or
+            key_type.is_bool):
+        raise TypeError("typeddict keys must be int, float, complex or "
+                        "bool, got %s" % (key_type,))
+
+    key_dtype = key_type.get_dtype()
+    value_dtype = value_type.get_dtype()
+    word_dtype = hash_word_dtype(key_dtype)
+    word_type = minitypes.map_dtype(word_dtype)
+    nwords = key_dtype.itemsize // word_dtype.itemsize
+
+    @nb.jit(warn=False)
+    class typeddict(object):
+
+        keybuf = key_type[:]
+        valuebuf = value_type[:]
+        states = uint8[:]
+
+        # Number of used slots, and of used or deleted slots
+        size = Py_ssize_t
+        fill = Py_ssize_t
+
+        # Scratch buffer for hashing, 'hashkey' is a view of 'hashwords'
+        hashkey = key_type[:]
+        hashwords = word_type[:]
+
+        @void(object_)
+        def __init__(self, iterable):
+            self.size = 0
+            self.fill = 0
+            self.__allocate(initial_capacity(iterable))
+
+            self.hashwords = np.empty(nwords, dtype=word_dtype)
+            self.hashkey = self.hashwords.view(key_dtype)
+
+            if iterable != None:
+                self.update(iterable)
+
+        @void(Py_ssize_t)
+        def __allocate(self, capacity):
+            self.keybuf = np.empty(capacity, dtype=key_dtype)
+            self.valuebuf = np.empty(capacity, dtype=value_dtype)
+            self.states = np.zeros(capacity, dtype=np.uint8)
+
+        @int64(key_type)
+        def __hash(self, key):
+            # Equal keys have equal bits, except for -0.0 and 0.0
+            self.hashkey[0] = key + 0
+            words = self.hashwords
+            h = int64(0)
+            for i in range(nwords):
+                h = (h ^ int64(words[i])) * 1540483477
+
+            # Fold the high bits into the low bits, which index the table
+            h = h ^ (h >> 32)
+            h = h ^ (h >> 16)
+            h = h ^ (h >> 8)
+            return h ^ (h >> 4)
+
+        @Py_ssize_t(key_type)
+        def __lookup(self, key):
+            """
+            The slot of `key`, or if it is absent, the slot to insert it
+            (the first deleted slot of its probe sequence, or the empty
+            slot ending it).
+            """
+            keys = self.keybuf
+            states = self.states
+            mask = keys.shape[0] - 1
+
+            i = self.__hash(key) & mask
+            free = -1
+            while states[i] != EMPTY:
+                if states[i] == USED:
+                    if keys[i] == key:
+                        return i
+                elif free < 0:
+                    free = i
+
+                i = (i + 1) & mask
+
+            if free >= 0:
+                return free
+            return i
+
+        @void(Py_ssize_t)
+        def __resize(self, capacity):
+            keys = self.keybuf
+            values = self.valuebuf
+            states = self.states
+            self.__allocate(capacity)
+
+            for i in range(states.shape[0]):
+                if states[i] == USED:
+                    j = self.__lookup(keys[i])
+                    self.states[j] = USED
+                    self.keybuf[j] = keys[i]
+                    self.valuebuf[j] = values[i]
+
+            self.fill = self.size
+
+        @value_type(key_type)
+        def __getitem__(self, key):
+            i = self.__lookup(key)
+            if self.states[i] != USED:
+                keyerror(key)
+
+            return self.valuebuf[i]
+
+        @value_type(key_type, value_type)
+        def get(self, key, default):
+            # TODO: optional argument 'default'
+            i = self.__lookup(key)
+            if self.states[i] != USED:
+                return default
+
+            return self.valuebuf[i]
+
+        @void(key_type, value_type)
+        def __setitem__(self, key, value):
+            i = self.__lookup(key)
+            state = self.states[i]
+            self.valuebuf[i] = value
+            if state == USED:
+                return
+
+            self.states[i] = USED
+            self.keybuf[i] = key
+            self.size = self.size + 1
+            if state == EMPTY:
+                self.fill = self.fill + 1
+                if 3 * self.fill >= 2 * self.keybuf.shape[0]:
+                    self.__resize(capacity_for(self.size))
+
+        @void(key_type)
+        def __delitem__(self, key):
+            i = self.__lookup(key)
+            if self.states[i] != USED:
+                keyerror(key)
+
+            self.states[i] = DELETED
+            self.size = self.size - 1
+
+        @bool_(key_type)
+        def __contains__(self, key):
+            return self.states[self.__lookup(key)] == USED
+
+        @Py_ssize_t()
+        def __len__(self):
+            return self.size
+
+        @void()
+        def clear(self):
+            self.size = 0
+            self.fill = 0
+            self.__allocate(INITIAL_CAPACITY)
+
+        @void(object_)
+        def update(self, iterable):
+            for item in dict_items(iterable):
+                self[item[0]] = item[1]
+
+        @object_()
+        def keys(self):
+            result = []
+            for i in range(self.states.shape[0]):
+                if self.states[i] == USED:
+                    result.append(self.keybuf[i])
+            return result
+
+        @object_()
+        def values(self):
+            result = []
+            for i in range(self.states.shape[0]):
+                if self.states[i] == USED:
+                    result.append(self.valuebuf[i])
+            return result
+
+        @object_()
+        def items(self):
+            result = []
+            for i in range(self.states.shape[0]):
+                if self.states[i] == USED:
+                    result.append((self.keybuf[i], self.valuebuf[i]))
+            return result
+
+        @object_()
+        def __iter__(self):
+            return iter(self.keys())
+
+        @nb.c_string_type()
+        def __repr__(self):
+            items = []
+            for i in range(self.states.shape[0]):
+                if self.states[i] == USED:
+                    items.append(str(self.keybuf[i]) + ": " +
+                                 str(self.valuebuf[i]))
+            return "{" + ", ".join(items) + "}"
+
+    _dict_cache[key_type, value_type] = typeddict
+    return typeddict
+
+#-----------------------------------------------------------------------
+# Infer types for typeddict
+#-----------------------------------------------------------------------
+
+def typeddict_infer(key_type_node, value_type_node, iterable_node):
+    """
+    Type inferer for typeddict, register with numba.register_inferer().
+    """
+    key_type = get_type(key_type_node)
+    value_type = get_type(value_type_node)
+    if key_type.is_cast and value_type.is_cast:
+        # Pre-compile typed dict implementation
+        typeddict_ctor = compile_typeddict(key_type.dst_type,
+                                           value_type.dst_type)
+
+        iterable_node = iterable_node or nodes.const(None, object_)
+        result = nodes.call_pyfunc(typeddict_ctor, (iterable_node,))
+        return nodes.CoercionNode(result, typeddict_ctor.exttype)
+
+    return object_
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
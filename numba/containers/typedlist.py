@@ -31,6 +31,8 @@ def typedlist(item_type, iterable=None):
 
     >>> typedlist(float_, range(10))
     [0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0]
+    >>> tlist[2:8:2]
+    [2, 4, 6]
     """
     typedlist_ctor = compile_typedlist(item_type)
     return typedlist_ctor(iterable)
@@ -47,6 +49,7 @@ def compile_typedlist(item_type, _list_cache=_list_cache):
         return _list_cache[item_type]
 
     dtype = item_type.get_dtype()
+    array_type = item_type[:]
     methods = orderedcontainer.container_methods(item_type, notimplemented)
 
     @nb.jit(warn=False)
@@ -54,9 +57,9 @@ def compile_typedlist(item_type, _list_cache=_list_cache):
         @void(object_)
         def __init__(self, iterable):
             self.size = 0
-
-            # TODO: Use length hint of iterable for initial buffer size
-            self.buf = np.empty(INITIAL_BUFSIZE, dtype=dtype)
+            self.buf = np.empty(
+                orderedcontainer.length_hint(iterable, INITIAL_BUFSIZE),
+                dtype=dtype)
 
             # TODO: implement 'is'/'is not'
             if iterable != None:
@@ -79,17 +82,35 @@ def compile_typedlist(item_type, _list_cache=_list_cache):
             self.size = size
 
             if INITIAL_BUFSIZE < size < self.buf.shape[0] / 2:
-                self.buf.resize(int(SHRINK * size), refcheck=False)
+                self.buf = orderedcontainer.reallocate(self.buf, size,
+                                                       int(SHRINK * size))
 
             return item
 
         @void(Py_ssize_t, item_type)
         def insert(self, index, value):
-            notimplemented("insert")
+            size = self.size
+            if index < 0:
+                index = index + size
+                if index < 0:
+                    index = 0
+            elif index > size:
+                index = size
+
+            if size >= self.buf.shape[0]:
+                self.buf = orderedcontainer.reallocate(self.buf, size,
+                                                       int(size * GROW))
+
+            orderedcontainer.memmove(self.buf, index + 1, index, size - index)
+            self.buf[index] = value
+            self.size = size + 1
 
         @void(item_type)
         def remove(self, value):
-            notimplemented("remove")
+            index = self.index(value)
+            size = self.size - 1
+            orderedcontainer.memmove(self.buf, index, index + 1, size - index)
+            self.size = size
 
         @void()
         def reverse(self):
@@ -105,6 +126,15 @@ def compile_typedlist(item_type, _list_cache=_list_cache):
             # TODO: optional arguments cmp, key, reverse
             self.buf[:self.size].sort()
 
+        @array_type()
+        def view(self):
+            """
+            An ndarray view of the items, without copying them. The view
+            sees assignments to the list until its buffer is reallocated
+            (as it grows or shrinks).
+            """
+            return self.buf[:self.size]
+
         @Py_ssize_t()
         def __len__(self):
             return self.size
@@ -114,6 +144,9 @@ def compile_typedlist(item_type, _list_cache=_list_cache):
             buf = ", ".join([str(self.buf[i]) for i in range(self.size)])
             return "[" + buf + "]"
 
+    orderedcontainer.slicing_getitem(typedlist)
+    orderedcontainer.export_array(typedlist)
+    orderedcontainer.container_classes.add(typedlist)
     _list_cache[item_type] = typedlist
     return typedlist
 
@@ -31,6 +31,8 @@ def typedtuple(item_type, iterable=None, _tuple_cache=_tuple_cache):
 
     >>> typedtuple(nb.float_, range(10))
     (0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0)
+    >>> ttuple[::-3]
+    (9, 6, 3, 0)
     """
     typedtuple_ctor = compile_typedtuple(item_type)
     return typedtuple_ctor(iterable)
@@ -53,9 +55,9 @@ def compile_typedtuple(item_type, _tuple_cache=_tuple_cache):
         def __init__(self, iterable):
 
             self.size = 0
-
-            # TODO: Use length hint of iterable for initial buffer size
-            self.buf = np.empty(INITIAL_BUFSIZE, dtype=dtype)
+            self.buf = np.empty(
+                orderedcontainer.length_hint(iterable, INITIAL_BUFSIZE),
+                dtype=dtype)
 
             if iterable != None:
                 self.__extend(iterable)
@@ -67,8 +69,19 @@ def compile_typedtuple(item_type, _tuple_cache=_tuple_cache):
 
         @nb.void(nb.object_)
         def __extend(self, iterable):
-            for obj in iterable:
-                self.__append(obj)
+            items = orderedcontainer.bulk_items(iterable, dtype)
+            if items != None:
+                size = self.size
+                self.buf = orderedcontainer.extend_buffer(self.buf, size, items)
+                self.size = size + len(items)
+            else:
+                for obj in iterable:
+                    self.__append(obj)
+
+        @nb.object_()
+        def view(self):
+            "A read-only ndarray view of the items, without copying them"
+            return orderedcontainer.readonly(self.buf[:self.size])
 
         @nb.Py_ssize_t()
         def __len__(self):
@@ -79,6 +92,9 @@ def compile_typedtuple(item_type, _tuple_cache=_tuple_cache):
             buf = ", ".join([str(self.buf[i]) for i in range(self.size)])
             return "(" + buf + ")"
 
+    orderedcontainer.slicing_getitem(typedtuple)
+    orderedcontainer.export_array(typedtuple)
+    orderedcontainer.container_classes.add(typedtuple)
     _tuple_cache[item_type] = typedtuple
     return typedtuple
 
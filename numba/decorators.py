@@ -9,7 +9,7 @@ import inspect
 
 from numba import *
 from numba import typesystem, numbawrapper
-from numba import utils, functions
+from numba import utils, functions, background
 from numba.codegen import translate
 from numba import  pipeline, extension_type_inference
 from .minivect import minitypes
@@ -20,8 +20,6 @@ import llvm.core as _lc
 
 logger = logging.getLogger(__name__)
 
-environment.NumbaEnvironment.get_environment().link_cbuilder_utilities()
-
 #------------------------------------------------------------------------
 # PyCC decorators
 #------------------------------------------------------------------------
@@ -120,23 +118,26 @@ def compile_function(env, func, argtypes, restype=None, **kwds):
     # get the compile flags
     flags = None # stub
 
-    # Search in cache
-    result = function_cache.get_function(func, argtypes, flags)
-    if result is not None:
-        sig, lfunc, pycall = result
-        return sig, lfunc, pycall
+    with background.compile_lock:
+        # Search in cache
+        result = function_cache.get_function(func, argtypes, flags)
+        if result is not None:
+            sig, lfunc, pycall = result
+            return sig, lfunc, pycall
+
+        # Compile the function
+        from numba import pipeline
 
-    # Compile the function
-    from numba import pipeline
+        compile_only = getattr(func, '_numba_compile_only', False)
+        kwds['compile_only'] = kwds.get('compile_only', compile_only)
 
-    compile_only = getattr(func, '_numba_compile_only', False)
-    kwds['compile_only'] = kwds.get('compile_only', compile_only)
+        assert kwds.get('llvm_module') is None, kwds.get('llvm_module')
 
-    assert kwds.get('llvm_module') is None, kwds.get('llvm_module')
+        with functions.collect_live_objects() as live_objects:
+            func_env = pipeline.compile2(env, func, restype, argtypes, **kwds)
 
-    func_env = pipeline.compile2(env, func, restype, argtypes, **kwds)
+        function_cache.register_specialization(func_env, live_objects)
 
-    function_cache.register_specialization(func_env)
     return (func_env.func_signature,
             func_env.lfunc,
             func_env.numba_wrapper_func)
@@ -184,6 +185,7 @@ def resolve_argtypes(numba_func, template_signature,
     return minitypes.FunctionType(return_type, tuple(argtypes))
 
 def _autojit(template_signature, target, nopython, env_name=None, env=None,
+             background_compile=False, max_specializations=None,
              **translator_kwargs):
     if env is None:
         env = environment.NumbaEnvironment.get_environment(env_name)
@@ -193,10 +195,9 @@ def _autojit(template_signature, target, nopython, env_name=None, env=None,
         types. Uses the AST translator backend. For the bytecode translator,
         use @autojit.
         """
-        def compile_function(args, kwargs):
-            "Compile the function given its positional and keyword arguments"
-            signature = resolve_argtypes(numba_func, template_signature,
-                                         args, kwargs, translator_kwargs)
+        def compile_signature(signature):
+            "Compile the function given a signature from resolve_argtypes()"
+            env.specializations.record_signature(f, signature)
 
             jitter = jit_targets[(target, 'ast')]
             dec = jitter(restype=signature.return_type,
@@ -207,11 +208,23 @@ def _autojit(template_signature, target, nopython, env_name=None, env=None,
             compiled_function = dec(f)
             return compiled_function
 
+        def compile_function(args, kwargs):
+            "Compile the function given its positional and keyword arguments"
+            signature = resolve_argtypes(numba_func, template_signature,
+                                         args, kwargs, translator_kwargs)
+            return compile_signature(signature)
+
         env.specializations.register(f)
+        if max_specializations is not None:
+            env.specializations.set_function_limit(f, max_specializations)
         cache = env.specializations.get_autojit_cache(f)
 
         wrapper = autojit_wrappers[(target, 'ast')]
         numba_func = wrapper(f, compile_function, cache)
+        numba_func.compile_signature = compile_signature
+        if background_compile:
+            numba_func.background_compiler = (
+                background.get_background_compiler())
         return numba_func
 
     return _autojit_decorator
@@ -223,6 +236,13 @@ def autojit(template_signature=None, backend='ast', target='cpu',
     functions based on the input argument types.  If no specialized
     function exists for a set of input argument types, the dispatcher
     creates and caches a new specialized function at call time.
+
+    With background_compile=True, a call for new input types runs the
+    Python function in the interpreter while the specialization is compiled
+    on a worker thread (see numba.background).
+
+    With max_specializations=N, at most N specializations are kept; the least
+    recently used ones are evicted (see NumbaEnvironment.limit_specializations).
     """
     if template_signature and not isinstance(template_signature, minitypes.Type):
         if callable(template_signature):
@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+"""
+Persistent on-disk cache for compiled @jit and @autojit specializations.
+
+The cache is opt-in. Enable it for an environment with
+NumbaEnvironment.enable_disk_cache(), or for the default environment by
+setting the NUMBA_CACHE_DIR environment variable.
+
+Each entry holds the optimized LLVM bitcode of the specialization and its
+FunctionType signature. Entries are keyed on the function source and
+bytecode, the argument types, the numba version and the target machine.
+Loading an entry links the bitcode into the LLVMContextManager without
+running type inference, the specializers or codegen for the function.
+
+The Python-callable wrapper is rebuilt on load. It embeds addresses of
+Python objects in this process, so it cannot be stored. The cheap
+'late_translate' pipeline builds it from the cached signature.
+
+Functions whose code embeds other process-local addresses (e.g. object
+constants) or calls other numba specializations are not cached.
+Values of globals are not part of the key. Clear the cache directory
+after changing a global that a cached function reads as a constant.
+"""
+from __future__ import print_function, division, absolute_import
+
+import os
+import sys
+import types
+import inspect
+import hashlib
+import logging
+import tempfile
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+try:
+    from io import BytesIO
+except ImportError:
+    from StringIO import StringIO as BytesIO
+
+import llvm.core
+
+import numba
+from numba.minivect import minitypes
+
+logger = logging.getLogger(__name__)
+
+# Bump this when the format of cache entries changes
+cache_format_version = 1
+
+def _as_bytes(s):
+    if isinstance(s, bytes):
+        return s
+    return s.encode('utf-8')
+
+def _hash_code(h, code):
+    "Hash a code object, recursing into nested code objects (closures)"
+    h.update(code.co_code)
+    h.update(_as_bytes(repr(code.co_names)))
+    h.update(_as_bytes(repr(code.co_varnames)))
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            _hash_code(h, const)
+        else:
+            h.update(_as_bytes(repr(const)))
+
+def _get_source(py_func):
+    try:
+        return inspect.getsource(py_func)
+    except (IOError, TypeError):
+        return ""
+
+def target_description(llvm_context):
+    "Describe the target machine code is generated for"
+    tm = llvm_context.target_machine
+    return "%s/%s/%s" % (tm.triple,
+                         getattr(tm, 'cpu', ''),
+                         getattr(tm, 'feature_string', ''))
+
+def is_relocatable(llvm_module, lfunc_name):
+    """
+    Check whether the code in the given module only references symbols
+    that can be resolved in another process.
+
+    Object constants are injected as 'inttoptr' constants of their address,
+    and calls to other numba specializations refer to them by mangled name,
+    which is only valid within this process.
+    """
+    for lfunc in llvm_module.functions:
+        if (lfunc.is_declaration and lfunc.name != lfunc_name and
+                lfunc.name.startswith('__numba_specialized_')):
+            return False
+
+    for line in str(llvm_module).splitlines():
+        # PyArray_API is patched when the entry is loaded
+        if 'inttoptr' in line and not line.startswith('@PyArray_API'):
+            return False
+
+    return True
+
+class DiskCache(object):
+    """
+    Directory of compiled specializations.
+
+        cache_dir: directory holding the cache entries
+    """
+
+    def __init__(self, cache_dir=None):
+        if cache_dir is None:
+            cache_dir = os.path.join(tempfile.gettempdir(), 'numba_cache')
+        self.cache_dir = cache_dir
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def key(self, llvm_context, py_func, argtypes):
+        "Return the hex digest identifying a specialization"
+        h = hashlib.sha1()
+        h.update(_as_bytes(_get_source(py_func)))
+        _hash_code(h, py_func.__code__)
+        h.update(_as_bytes(repr(tuple(argtypes))))
+        h.update(_as_bytes(str(numba.__version__)))
+        h.update(_as_bytes(target_description(llvm_context)))
+        h.update(_as_bytes("%s/%d" % (sys.version, cache_format_version)))
+        return h.hexdigest()
+
+    def entry_path(self, llvm_context, py_func, argtypes):
+        name = "%s.%s" % (py_func.__module__, py_func.__name__)
+        digest = self.key(llvm_context, py_func, argtypes)
+        return os.path.join(self.cache_dir, "%s-%s.nbc" % (name, digest))
+
+    def is_cacheable(self, env, func_env):
+        return (isinstance(func_env.func, types.FunctionType) and
+                func_env.link and func_env.wrap and
+                not func_env.is_closure and
+                not env.translation.is_pycc)
+
+    # ____________________________________________________________
+    # Storing
+
+    def store(self, env, func_env):
+        """
+        Store the optimized (but not yet linked) module of the function.
+        Return whether an entry was written.
+        """
+        lfunc = func_env.lfunc
+        if not is_relocatable(lfunc.module, lfunc.name):
+            logger.debug("Not caching %s, code is not relocatable",
+                         func_env.func_name)
+            return False
+
+        bitcode = BytesIO()
+        lfunc.module.to_bitcode(bitcode)
+
+        try:
+            signature = pickle.dumps(func_env.func_signature,
+                                     pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logger.debug("Not caching %s, cannot pickle signature: %s",
+                         func_env.func_name, e)
+            return False
+
+        entry = dict(name=lfunc.name, signature=signature,
+                     bitcode=bitcode.getvalue())
+
+        path = self.entry_path(env.llvm_context, func_env.func,
+                               func_env.func_signature.args)
+
+        # Write atomically, concurrent processes may share the cache
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(entry, f, pickle.HIGHEST_PROTOCOL)
+            os.rename(tmp_path, path)
+        except EnvironmentError as e:
+            logger.warning("Could not write numba cache entry %s: %s",
+                           path, e)
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+
+        self.stores += 1
+        return True
+
+    # ____________________________________________________________
+    # Loading
+
+    def load(self, env, py_func, argtypes):
+        """
+        Load a specialization of py_func for the given argument types.
+        Returns a FunctionEnvironment with the signature, the linked LLVM
+        function and the NumbaFunction wrapper, or None on a cache miss.
+        """
+        if not isinstance(py_func, types.FunctionType):
+            return None
+
+        path = self.entry_path(env.llvm_context, py_func, argtypes)
+        try:
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+        except EnvironmentError:
+            self.misses += 1
+            return None
+        except Exception as e:
+            logger.warning("Ignoring corrupt numba cache entry %s: %s",
+                           path, e)
+            self.misses += 1
+            return None
+
+        signature = pickle.loads(entry['signature'])
+        assert isinstance(signature, minitypes.FunctionType)
+
+        llvm_module = llvm.core.Module.from_bitcode(BytesIO(entry['bitcode']))
+        self._fixup_module(env, llvm_module)
+
+        lfunc = llvm_module.get_function_named(entry['name'])
+        lfunc = env.llvm_context.link(lfunc, optimize=False)
+
+        func_env = self._build_wrapper(env, py_func, signature, lfunc)
+        self.hits += 1
+        return func_env
+
+    def _fixup_module(self, env, llvm_module):
+        "Patch process-specific values into a loaded module"
+        from numba.llvm_types import _intp, _void_star_star
+        from numba.multiarray_api import get_multiarray_api
+
+        api = get_multiarray_api()
+        try:
+            api_var = llvm_module.get_global_variable_named("PyArray_API")
+        except llvm.LLVMException:
+            return
+
+        if api.api_addr is None:
+            api.calculate_api_addr()
+        api_var.initializer = llvm.core.Constant.inttoptr(
+            llvm.core.Constant.int(_intp, api.api_addr), _void_star_star)
+
+    def _build_wrapper(self, env, py_func, signature, lfunc):
+        from numba import functions
+        from numba.codegen import llvmwrapper
+
+        func_ast = functions._get_ast(py_func)
+        with env.TranslationContext(env, py_func, func_ast, signature,
+                                    mangled_name=lfunc.name) as func_env:
+            func_env.lfunc = lfunc
+            func_env.lfunc_pointer = env.llvm_context.get_pointer_to_function(
+                                                                        lfunc)
+            t = llvmwrapper.build_wrapper_translation(env)
+            methoddef, wrapper = llvmwrapper.numbafunction_new(
+                py_func,
+                func_env.func_name,
+                func_env.func_doc,
+                py_func.__module__,
+                t.lfunc_pointer,            # Wrapper
+                func_env.lfunc_pointer,     # Wrapped
+                signature)
+
+            func_env.numba_wrapper_func = wrapper
+            func_env.llvm_wrapper_func = t.lfunc
+
+        return func_env
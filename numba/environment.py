@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 from __future__ import print_function, division, absolute_import
+import os
 import weakref
 import ast as ast_module
 import types
@@ -12,7 +13,8 @@ from numba import pipeline, naming, error, reporting, PY3
 from numba.control_flow.control_flow import ControlFlow
 from numba.utils import TypedProperty, WriteOnceTypedProperty, NumbaContext
 from numba.minivect.minitypes import FunctionType
-from numba import functions, symtab
+from numba import functions, symtab, compilestats, tiered, parallel
+from numba import autotune
 from numba.utility.cbuilder import library
 from numba.nodes import metadata
 from numba.codegen import translate
@@ -324,6 +326,18 @@ class FunctionEnvironment(object):
         default='fancy'
     )
 
+    code_size = TypedProperty(
+        (int, long),
+        'Size in bytes of the object code of the function, if measured (see '
+        'FunctionCache.track_code_size).',
+        0)
+
+    tier = TypedProperty(
+        object,
+        'numba.tiered.TieredSpecialization if the function was compiled in '
+        'the low tier of tiered compilation, otherwise None.',
+        None)
+
     kwargs = TypedProperty(
         dict,
         'Additional keyword arguments.  Deprecated, but kept for backward '
@@ -709,6 +723,22 @@ class NumbaEnvironment(_AbstractNumbaEnvironment):
         "Manages the global LLVM module and linkages of new translations."
     )
 
+    stats = TypedProperty(
+        compilestats.CompileStats,
+        "Compile-time statistics, see compile_stats()")
+
+    tiering = TypedProperty(
+        tiered.TieredCompilation,
+        "Tiered compilation settings, see enable_tiered_compilation()")
+
+    parallel = TypedProperty(
+        parallel.ParallelSettings,
+        "Parallel execution of array expressions, see enable_parallel()")
+
+    tuning = TypedProperty(
+        autotune.TuningDatabase,
+        "Tuned code generation parameters, see numba.autotune")
+
     constants_manager = TypedProperty(
         globalconstants.LLVMConstantsManager,
         "Holds constant values in an LLVM module.",
@@ -765,12 +795,129 @@ class NumbaEnvironment(_AbstractNumbaEnvironment):
         context.utility_library = default_utility_library(context)
         self.llvm_context = translate.LLVMContextManager()
 
+        cache_dir = os.environ.get('NUMBA_CACHE_DIR')
+        if cache_dir:
+            self.enable_disk_cache(cache_dir)
+
+        limit = os.environ.get('NUMBA_MAX_SPECIALIZATIONS')
+        if limit:
+            self.specializations.set_limits(int(limit))
+
+        self.tiering = tiered.TieredCompilation()
+        threshold = int(os.environ.get('NUMBA_TIERED_THRESHOLD', 0))
+        if threshold:
+            self.enable_tiered_compilation(threshold)
+
+        self.parallel = parallel.ParallelSettings()
+        threshold = int(os.environ.get('NUMBA_PARALLEL_THRESHOLD', 0))
+        if threshold:
+            self.enable_parallel(threshold)
+
+        self.tuning = autotune.TuningDatabase(
+            os.environ.get('NUMBA_TUNING_DB'))
+
+        self.stats = compilestats.CompileStats()
+        if int(os.environ.get('NUMBA_COMPILE_STATS', 0)):
+            import atexit
+            self.enable_compile_stats()
+            atexit.register(self._print_compile_stats)
+
+    def enable_disk_cache(self, cache_dir=None):
+        """
+        Persist compiled specializations in cache_dir and reuse them across
+        processes. See numba.diskcache.
+        """
+        from numba import diskcache
+
+        disk_cache = diskcache.DiskCache(cache_dir)
+        self.specializations.disk_cache = disk_cache
+        return disk_cache
+
+    def disable_disk_cache(self):
+        self.specializations.disk_cache = None
+
+    def limit_specializations(self, limit=None, function_limit=None,
+                              track_code_size=None):
+        """
+        Bound the number of compiled specializations kept in total
+        (`limit`) and per function (`function_limit`). The least recently
+        used specializations are evicted and their machine code is freed.
+        None means unbounded. See functions.FunctionCache.
+        """
+        if track_code_size is not None:
+            self.specializations.track_code_size = track_code_size
+        self.specializations.set_limits(limit, function_limit)
+        return self.specializations
+
+    def enable_tiered_compilation(self, threshold=1000, low_opt=0):
+        """
+        Optimize new specializations at level low_opt, and re-optimize them
+        in the background after `threshold` calls. See numba.tiered.
+        """
+        self.tiering.enabled = True
+        self.tiering.threshold = threshold
+        self.tiering.low_opt = low_opt
+        return self.tiering
+
+    def disable_tiered_compilation(self):
+        self.tiering.enabled = False
+
+    def enable_parallel(self, threshold=None, num_threads=None):
+        """
+        Run array expressions of at least `threshold` elements on multiple
+        threads. This affects functions compiled afterwards. See
+        numba.parallel. Without a threshold, the tuned threshold is used
+        (see numba.autotune).
+        """
+        self.parallel.enabled = True
+        self.parallel.threshold = threshold
+        if num_threads is not None:
+            parallel.set_num_threads(num_threads)
+        return self.parallel
+
+    def disable_parallel(self):
+        self.parallel.enabled = False
+
+    def enable_tuning(self, path=None):
+        """
+        Read tuned code generation parameters (tile sizes, parallel
+        thresholds) from the tuning database at `path` when compiling array
+        expressions. See numba.autotune.
+        """
+        if path is not None and path != self.tuning.path:
+            self.tuning = autotune.TuningDatabase(path)
+        self.tuning.enabled = True
+        return self.tuning
+
+    def disable_tuning(self):
+        self.tuning.enabled = False
+
+    def compile_stats(self):
+        """
+        Return the numba.compilestats.CompileStats with the per-stage and
+        per-function compile times.
+        """
+        return self.stats
+
+    def enable_compile_stats(self, track_allocations=False):
+        self.stats.enabled = True
+        self.stats.track_allocations = track_allocations
+        return self.stats
+
+    def disable_compile_stats(self):
+        self.stats.enabled = False
+
+    def _print_compile_stats(self):
+        import sys
+        sys.stderr.write(self.stats.report())
+
     def link_cbuilder_utilities(self):
+        """
+        Create the cbuilder library. Utilities are defined on first use,
+        and linked into the global module when they are defined.
+        """
         self.context.cbuilder_library = library.CBuilderLibrary()
-        self.context.cbuilder_library.declare_registered(self)
-
-        # Link modules
-        self.context.cbuilder_library.link(self.llvm_context.module)
+        self.context.cbuilder_library.link_on_demand(self.llvm_context.module)
 
     @classmethod
     def get_environment(cls, environment_key = None, *args, **kws):
@@ -786,6 +933,10 @@ class NumbaEnvironment(_AbstractNumbaEnvironment):
         else:
             ret_val = cls(environment_key or 'numba', *args, **kws)
             cls.environment_map[environment_key] = ret_val
+            if environment_key is None:
+                # The default environment is created on first use, not
+                # when numba is imported
+                ret_val.link_cbuilder_utilities()
         return ret_val
 
     @property
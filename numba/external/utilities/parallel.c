@@ -0,0 +1,280 @@
+/*
+    A pool of native threads that runs the chunks of an iteration space
+    in parallel. See numba/parallel.py.
+
+    __Numba_parallel_for(kernel, closure, n, grain) splits range(n) into
+    at most one chunk per thread (of at least `grain` iterations), and
+    calls kernel(closure, start, stop) for each chunk. The calling thread
+    runs one of the chunks, and releases the GIL while the chunks run.
+
+    There is one parallel region at a time. A region started while
+    another one runs (from a worker thread, or from another Python thread)
+    runs serially in the calling thread.
+
+    __Numba_parallel_lock() and __Numba_parallel_unlock() protect the
+    combination of the partial results of reductions.
+*/
+
+#ifdef _WIN32
+/* No thread pool on Windows yet, parallel regions run serially */
+#define NUMBA_NO_THREADS
+#else
+#include <pthread.h>
+#include <unistd.h>
+#endif
+
+#define NUMBA_MAX_THREADS 256
+
+/* Returns 0 on success */
+typedef int (*__Numba_range_kernel)(void *closure, Py_ssize_t start,
+                                    Py_ssize_t stop);
+
+typedef struct {
+    __Numba_range_kernel kernel;
+    void *closure;
+    Py_ssize_t start;
+    Py_ssize_t stop;
+    int result;
+} __Numba_task;
+
+/* Number of threads to use in a parallel region, 0 if not determined yet */
+static int num_threads = 0;
+
+static int
+default_num_threads(void)
+{
+    char *env = getenv("NUMBA_NUM_THREADS");
+    long n = 0;
+
+    if (env)
+        n = strtol(env, NULL, 10);
+#ifdef _SC_NPROCESSORS_ONLN
+    if (n <= 0)
+        n = sysconf(_SC_NPROCESSORS_ONLN);
+#endif
+    if (n <= 0)
+        n = 1;
+    return n > NUMBA_MAX_THREADS ? NUMBA_MAX_THREADS : (int) n;
+}
+
+static int
+__Numba_get_num_threads(void)
+{
+    if (num_threads == 0)
+        num_threads = default_num_threads();
+    return num_threads;
+}
+
+static void
+__Numba_set_num_threads(int n)
+{
+    if (n < 1)
+        n = 1;
+    num_threads = n > NUMBA_MAX_THREADS ? NUMBA_MAX_THREADS : n;
+}
+
+static int
+__Numba_holds_gil(void)
+{
+#if PY_VERSION_HEX >= 0x03040000
+    return PyGILState_Check();
+#else
+    PyThreadState *tstate = PyGILState_GetThisThreadState();
+#if PY_VERSION_HEX >= 0x03020000
+    /* An _Py_atomic_address on Python 3.2 and 3.3 */
+    PyThreadState *current = (PyThreadState *)
+        _Py_atomic_load_relaxed(&_PyThreadState_Current);
+#else
+    PyThreadState *current = _PyThreadState_Current;
+#endif
+    return tstate != NULL && tstate == current;
+#endif
+}
+
+#ifndef NUMBA_NO_THREADS
+
+/* Held for the duration of a parallel region */
+static pthread_mutex_t region_lock = PTHREAD_MUTEX_INITIALIZER;
+
+/* Protects the task queue below */
+static pthread_mutex_t pool_lock = PTHREAD_MUTEX_INITIALIZER;
+static pthread_cond_t work_cond = PTHREAD_COND_INITIALIZER;
+static pthread_cond_t done_cond = PTHREAD_COND_INITIALIZER;
+
+/* Protects the results of reductions */
+static pthread_mutex_t reduction_lock = PTHREAD_MUTEX_INITIALIZER;
+
+static __Numba_task tasks[NUMBA_MAX_THREADS];
+static int num_tasks = 0;       /* tasks in the current region */
+static int next_task = 0;       /* next task to pick up */
+static int pending_tasks = 0;   /* tasks that have not finished */
+static int num_workers = 0;     /* started worker threads */
+
+/* Run tasks until the queue is empty. Called with pool_lock held. */
+static void
+run_pending_tasks(void)
+{
+    __Numba_task *task;
+
+    while (next_task < num_tasks) {
+        task = &tasks[next_task++];
+        pthread_mutex_unlock(&pool_lock);
+        task->result = task->kernel(task->closure, task->start, task->stop);
+        pthread_mutex_lock(&pool_lock);
+        if (--pending_tasks == 0)
+            pthread_cond_signal(&done_cond);
+    }
+}
+
+static void *
+worker_main(void *arg)
+{
+    pthread_mutex_lock(&pool_lock);
+    for (;;) {
+        while (next_task >= num_tasks)
+            pthread_cond_wait(&work_cond, &pool_lock);
+        run_pending_tasks();
+    }
+    return NULL;
+}
+
+/* Start workers until there are `n`. Called with pool_lock held. */
+static void
+start_workers(int n)
+{
+    pthread_t thread;
+    pthread_attr_t attr;
+
+    pthread_attr_init(&attr);
+    pthread_attr_setdetachstate(&attr, PTHREAD_CREATE_DETACHED);
+    while (num_workers < n) {
+        /* If no thread can be started, the caller runs the tasks */
+        if (pthread_create(&thread, &attr, worker_main, NULL) != 0)
+            break;
+        num_workers++;
+    }
+    pthread_attr_destroy(&attr);
+}
+
+/* The workers do not exist in a forked child */
+static void
+reset_pool_after_fork(void)
+{
+    pthread_mutex_init(&region_lock, NULL);
+    pthread_mutex_init(&pool_lock, NULL);
+    pthread_mutex_init(&reduction_lock, NULL);
+    pthread_cond_init(&work_cond, NULL);
+    pthread_cond_init(&done_cond, NULL);
+    num_tasks = next_task = pending_tasks = num_workers = 0;
+}
+
+static int
+__Numba_parallel_for(__Numba_range_kernel kernel, void *closure,
+                     Py_ssize_t n, Py_ssize_t grain)
+{
+    Py_ssize_t ntasks, chunksize, remainder, start;
+    PyThreadState *thread_state = NULL;
+    int i, result = 0;
+
+    if (grain < 1)
+        grain = 1;
+
+    ntasks = (n + grain - 1) / grain;
+    if (ntasks > __Numba_get_num_threads())
+        ntasks = __Numba_get_num_threads();
+
+    if (ntasks <= 1 || pthread_mutex_trylock(&region_lock) != 0)
+        return kernel(closure, 0, n);
+
+    chunksize = n / ntasks;
+    remainder = n % ntasks;
+    start = 0;
+    for (i = 0; i < ntasks; i++) {
+        tasks[i].kernel = kernel;
+        tasks[i].closure = closure;
+        tasks[i].start = start;
+        start += chunksize + (i < remainder);
+        tasks[i].stop = start;
+        tasks[i].result = 0;
+    }
+
+    if (__Numba_holds_gil())
+        thread_state = PyEval_SaveThread();
+
+    pthread_mutex_lock(&pool_lock);
+    start_workers((int) ntasks - 1);
+    num_tasks = (int) ntasks;
+    next_task = 0;
+    pending_tasks = (int) ntasks;
+    pthread_cond_broadcast(&work_cond);
+
+    run_pending_tasks();
+    while (pending_tasks > 0)
+        pthread_cond_wait(&done_cond, &pool_lock);
+    num_tasks = next_task = 0;
+    pthread_mutex_unlock(&pool_lock);
+
+    pthread_mutex_unlock(&region_lock);
+    if (thread_state)
+        PyEval_RestoreThread(thread_state);
+
+    for (i = 0; i < ntasks; i++) {
+        if (tasks[i].result != 0) {
+            result = tasks[i].result;
+            break;
+        }
+    }
+    return result;
+}
+
+static void
+__Numba_parallel_lock(void)
+{
+    pthread_mutex_lock(&reduction_lock);
+}
+
+static void
+__Numba_parallel_unlock(void)
+{
+    pthread_mutex_unlock(&reduction_lock);
+}
+
+#else /* NUMBA_NO_THREADS */
+
+static int
+__Numba_parallel_for(__Numba_range_kernel kernel, void *closure,
+                     Py_ssize_t n, Py_ssize_t grain)
+{
+    return kernel(closure, 0, n);
+}
+
+static void
+__Numba_parallel_lock(void)
+{
+}
+
+static void
+__Numba_parallel_unlock(void)
+{
+}
+
+#endif /* NUMBA_NO_THREADS */
+
+static int
+export_parallel(PyObject *module)
+{
+#ifndef NUMBA_NO_THREADS
+    if (pthread_atfork(NULL, NULL, reset_pool_after_fork) != 0)
+        goto error;
+#endif
+
+    EXPORT_FUNCTION(__Numba_parallel_for, module, error)
+    EXPORT_FUNCTION(__Numba_get_num_threads, module, error)
+    EXPORT_FUNCTION(__Numba_set_num_threads, module, error)
+    EXPORT_FUNCTION(__Numba_parallel_lock, module, error)
+    EXPORT_FUNCTION(__Numba_parallel_unlock, module, error)
+
+    return 0;
+error:
+    return -1;
+}
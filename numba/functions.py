@@ -3,6 +3,8 @@ from __future__ import print_function, division, absolute_import
 import ast, inspect, os
 import logging
 import textwrap
+import weakref
+import contextlib
 from collections import defaultdict
 
 from numba import *
@@ -55,63 +57,203 @@ def _fix_ast(myast):
     else:
         myast.decorator_list = []
 
+# Source of the function definitions parsed by _get_ast():
+# py_func -> flags -> (source, filename, flags, lineoffset)
+_ast_sources = weakref.WeakKeyDictionary()
+
+def _get_source(func, flags):
+    """
+    Get the source of the function definition without decorators, and the
+    compiler flags and line offset to parse it with.
+    """
+    source = inspect.getsource(func)
+    source_module = inspect.getmodule(func)
+
+    # Split off decorators
+    # TODO: This is not quite correct, we can have comments or strings
+    # starting at column 0 and an indented function !
+    source = textwrap.dedent(source)
+    decorators = 0
+    while not source.lstrip().startswith('def'): # decorator can have multiple lines
+        assert source
+        decorator, sep, source = source.partition('\n')
+        decorators += 1
+    if (hasattr(source_module, "print_function") and
+            hasattr(source_module.print_function, "compiler_flag")):
+        flags |= source_module.print_function.compiler_flag
+    source_file = getattr(source_module, '__file__', '<unknown file>')
+    lineoffset = func.__code__.co_firstlineno + decorators
+    return source, source_file, flags, lineoffset
+
 def _get_ast(func, flags=0):
+    """
+    Get a new, fixed-up ast.FunctionDef for the function. The source lookup
+    is done once per function, after that the AST of each specialization is
+    parsed directly from the cached source.
+    """
     if int(os.environ.get('NUMBA_FORCE_META_AST', 0)):
         func_def = decompile_func(func)
         assert isinstance(func_def, ast.FunctionDef)
         return func_def
-    try:
-        source = inspect.getsource(func)
-        source_module = inspect.getmodule(func)
-    except IOError:
-        return decompile_func(func)
+
+    sources = _ast_sources.get(func)
+    if sources is None or flags not in sources:
+        try:
+            source_info = _get_source(func, flags)
+        except IOError:
+            return decompile_func(func)
+        _ast_sources.setdefault(func, {})[flags] = source_info
     else:
-        # Split off decorators
-        # TODO: This is not quite correct, we can have comments or strings
-        # starting at column 0 and an indented function !
-        source = textwrap.dedent(source)
-        decorators = 0
-        while not source.lstrip().startswith('def'): # decorator can have multiple lines
-            assert source
-            decorator, sep, source = source.partition('\n')
-            decorators += 1
-        if (hasattr(source_module, "print_function") and
-                hasattr(source_module.print_function, "compiler_flag")):
-            flags |= source_module.print_function.compiler_flag
-        source_file = getattr(source_module, '__file__', '<unknown file>')
-        module_ast = compile(source, source_file, "exec",
-                             ast.PyCF_ONLY_AST | flags, True)
-
-        # fix line numbering
-        lineoffset = func.__code__.co_firstlineno + decorators
-        ast.increment_lineno(module_ast, lineoffset)
-
-        assert len(module_ast.body) == 1
-        func_def = module_ast.body[0]
-        _fix_ast(func_def)
-        assert isinstance(func_def, ast.FunctionDef)
-        return func_def
+        source_info = sources[flags]
+
+    source, source_file, flags, lineoffset = source_info
+    module_ast = compile(source, source_file, "exec",
+                         ast.PyCF_ONLY_AST | flags, True)
+
+    # fix line numbering
+    ast.increment_lineno(module_ast, lineoffset)
+
+    assert len(module_ast.body) == 1
+    func_def = module_ast.body[0]
+    _fix_ast(func_def)
+    assert isinstance(func_def, ast.FunctionDef)
+    return func_def
 
 live_objects = [] # These are never collected
 
+# Stack of lists collecting the live objects of the specializations
+# being compiled (see collect_live_objects())
+_live_object_lists = []
+
 def keep_alive(py_func, obj):
     """
     Keep an object alive for the lifetime of the translated unit.
 
-    This is a HACK. Make live objects part of the function-cache
+    Objects kept alive while compiling a specialization belong to the
+    specialization, and are released when it is evicted from the
+    FunctionCache. Other objects are never collected.
 
     NOTE: py_func may be None, so we can't make it a function attribute
     """
-    live_objects.append(obj)
+    if _live_object_lists:
+        _live_object_lists[-1].append(obj)
+    else:
+        live_objects.append(obj)
+
+@contextlib.contextmanager
+def collect_live_objects():
+    "Collect the objects kept alive in the with block in a list"
+    objects = []
+    _live_object_lists.append(objects)
+    try:
+        yield objects
+    finally:
+        _live_object_lists.pop()
+
+class Specialization(object):
+    """
+    A specialization registered in the FunctionCache.
+
+        compiled: (signature, llvm_func, numba_wrapper_func)
+        live_objects: objects to keep alive for the compiled code, or None
+                      while the specialization is being compiled
+        llvm_wrapper_func: LLVM wrapper function of numba_wrapper_func
+        code_size: size of the object code in bytes, if measured
+        last_use: use tick of the last lookup (numbawrapper.next_use_tick)
+        tier: TieredSpecialization while in the low tier (see numba.tiered)
+    """
+
+    def __init__(self, py_func, key, compiled):
+        self.py_func = py_func
+        self.key = key
+        self.compiled = compiled
+        self.live_objects = None
+        self.llvm_wrapper_func = None
+        self.code_size = 0
+        self.last_use = numbawrapper.next_use_tick()
+        self.tier = None
+
+    @property
+    def lfunc(self):
+        return self.compiled[1]
+
+    @property
+    def numba_wrapper(self):
+        return self.compiled[2]
+
+    def is_evictable(self):
+        """
+        Whether the specialization is compiled, and its LLVM function is not
+        called natively by functions other than its wrapper.
+        """
+        if (self.live_objects is None or self.llvm_wrapper_func is None or
+                not numbawrapper.is_numba_wrapper(self.numba_wrapper)):
+            return False
+        return self.lfunc.use_count <= 1
+
+class CacheStats(object):
+    """
+    Statistics of a FunctionCache.
+
+        resident: number of compiled specializations in the cache
+        code_size: bytes of object code of the resident specializations
+                   (only measured if FunctionCache.track_code_size is set)
+        evicted: number of evicted specializations
+        released: number of evicted specializations whose machine code was
+                  freed
+        pending: number of evicted specializations that are still referenced
+    """
+
+    def __init__(self, resident, code_size, evicted, released, pending):
+        self.resident = resident
+        self.code_size = code_size
+        self.evicted = evicted
+        self.released = released
+        self.pending = pending
+
+    def __repr__(self):
+        return ("CacheStats(resident=%d, code_size=%d, evicted=%d, "
+                "released=%d, pending=%d)" % (
+                    self.resident, self.code_size, self.evicted,
+                    self.released, self.pending))
 
 class FunctionCache(object):
     """
     Cache for compiler functions, declared external functions and constants.
+
+    The number of specializations can be bounded with set_limits(). When a
+    limit is exceeded, the least recently used specialization is evicted:
+    it is removed from the caches, and once its NumbaFunction is no longer
+    referenced its machine code is freed and its live objects released.
+    Specializations that are called natively by other compiled functions
+    are never evicted.
     """
     def __init__(self, context=None, env=None):
         self.context = context
         self.env = env
 
+        # Maximum number of specializations for the environment, and for
+        # each function (None means unbounded)
+        self.limit = None
+        self.function_limit = None
+        self.function_limits = {}
+
+        # Whether to measure the object code size of specializations
+        self.track_code_size = False
+
+        # (py_func, argtypes_flags) -> Specialization
+        self.__specializations = {}
+        # Evicted specializations: weakref(numba_wrapper) -> Specialization,
+        # and those ready to be released
+        self.__evicted = {}
+        self.__released = []
+        # Replaced code of live functions (see retire()):
+        # weakref(numba_wrapper) -> (llvm_wrapper_func, lfunc, live_objects)
+        self.__retired = {}
+        self.__released_code = []
+        self.num_evicted = 0
+        self.num_released = 0
+
         # All numba-compiled functions
         # (py_func) -> (arg_types, flags) -> (signature, llvm_func, ctypes_func)
         self.__compiled_funcs = defaultdict(dict)
@@ -119,6 +261,13 @@ class FunctionCache(object):
         # specialization. (py_func) -> (NumbaFunction)
         self.__local_caches = defaultdict(numbawrapper.AutojitFunctionCache)
 
+        # Signatures resolved for autojit functions, in order of appearance
+        # (py_func) -> [FunctionType]
+        self.__autojit_signatures = defaultdict(list)
+
+        # Optional persistent cache (numba.diskcache.DiskCache)
+        self.disk_cache = None
+
     def get_function(self, py_func, argtypes, flags):
         '''Get a compiled function in the the function cache.
         The function must not be an external function.
@@ -132,6 +281,16 @@ class FunctionCache(object):
         argtypes_flags = tuple(argtypes), flags
         if py_func in self.__compiled_funcs:
             result = self.__compiled_funcs[py_func].get(argtypes_flags)
+            if result is not None and self.is_bounded:
+                key = py_func, argtypes_flags
+                self.__specializations[key].last_use = (
+                    numbawrapper.next_use_tick())
+
+        if result is None and self.disk_cache is not None:
+            with collect_live_objects() as live_objects:
+                func_env = self.disk_cache.load(self.env, py_func, argtypes)
+            if func_env is not None:
+                result = self.register_specialization(func_env, live_objects)
 
         return result
 
@@ -140,7 +299,36 @@ class FunctionCache(object):
         Get the numbawrapper.AutojitFunctionCache that does a quick lookup
         for the cached case.
         """
-        return self.__local_caches[py_func]
+        autojit_cache = self.__local_caches[py_func]
+        autojit_cache.track_usage = self.is_bounded
+        return autojit_cache
+
+    def record_signature(self, py_func, signature):
+        """
+        Record a signature resolved for an autojit function
+        (see decorators.resolve_argtypes).
+        """
+        signatures = self.__autojit_signatures[py_func]
+        if signature not in signatures:
+            signatures.append(signature)
+
+    def iter_signatures(self):
+        """
+        Yield (py_func, signature) for all signatures seen by this cache:
+        the signatures resolved for autojit functions, and the specializations
+        of all other functions.
+        """
+        for py_func, signatures in self.__autojit_signatures.items():
+            for signature in signatures:
+                yield py_func, signature
+
+        for py_func, specializations in self.__compiled_funcs.items():
+            if py_func in self.__autojit_signatures:
+                continue
+            for (argtypes, flags), compiled in specializations.items():
+                signature = compiled[0]
+                yield py_func, minitypes.FunctionType(signature.return_type,
+                                                      argtypes)
 
     def is_registered(self, func):
         '''Check if a function is registered to the FunctionCache instance.
@@ -156,7 +344,12 @@ class FunctionCache(object):
         '''
         return self.__compiled_funcs[func]
 
-    def register_specialization(self, func_env):
+    def register_specialization(self, func_env, live_objects=None):
+        """
+        Register a (possibly partially compiled) specialization. Pass the
+        objects kept alive for it (see collect_live_objects()) once it is
+        compiled, which makes it a candidate for eviction.
+        """
         func = func_env.func
         argtypes = func_env.func_signature.args
         compiled = (
@@ -171,3 +364,153 @@ class FunctionCache(object):
 
         argtypes_flags = tuple(argtypes), None
         self.__compiled_funcs[func][argtypes_flags] = compiled
+
+        key = func, argtypes_flags
+        specialization = self.__specializations.get(key)
+        if specialization is None:
+            specialization = Specialization(func, argtypes_flags, compiled)
+            self.__specializations[key] = specialization
+
+        specialization.compiled = compiled
+        specialization.llvm_wrapper_func = func_env.llvm_wrapper_func
+        specialization.code_size = func_env.code_size
+        specialization.tier = func_env.tier
+        if live_objects is not None:
+            if specialization.live_objects is not None:
+                live_objects = specialization.live_objects + live_objects
+            specialization.live_objects = live_objects
+            self.enforce_limits(func)
+
+        return compiled
+
+    # ____________________________________________________________
+    # Eviction
+
+    @property
+    def is_bounded(self):
+        return (self.limit is not None or self.function_limit is not None or
+                bool(self.function_limits))
+
+    def set_limits(self, limit=None, function_limit=None):
+        """
+        Set the maximum number of specializations in the cache, and for each
+        function. None means unbounded.
+        """
+        self.limit = limit
+        self.function_limit = function_limit
+        self._update_usage_tracking()
+        self.enforce_limits()
+
+    def set_function_limit(self, py_func, limit):
+        "Set the maximum number of specializations for a single function"
+        if limit is None:
+            self.function_limits.pop(py_func, None)
+        else:
+            self.function_limits[py_func] = limit
+        self._update_usage_tracking()
+        self.enforce_limits(py_func)
+
+    def _update_usage_tracking(self):
+        for autojit_cache in self.__local_caches.values():
+            autojit_cache.track_usage = self.is_bounded
+
+    def _last_use(self, specialization):
+        last_use = specialization.last_use
+        autojit_cache = self.__local_caches.get(specialization.py_func)
+        if autojit_cache is not None:
+            last_use = max(last_use, autojit_cache.last_use(
+                                            specialization.numba_wrapper))
+        return last_use
+
+    def _evict_lru(self, specializations, limit):
+        candidates = [s for s in specializations if s.is_evictable()]
+        candidates.sort(key=self._last_use)
+        for specialization in candidates[:len(specializations) - limit]:
+            self.evict(specialization)
+
+    def enforce_limits(self, py_func=None):
+        "Evict least recently used specializations until within the limits"
+        if py_func is not None:
+            limit = self.function_limits.get(py_func, self.function_limit)
+            if limit is not None:
+                specializations = [s for s in self.__specializations.values()
+                                       if s.py_func is py_func]
+                self._evict_lru(specializations, limit)
+        elif self.function_limit is not None or self.function_limits:
+            for func in set(s.py_func for s in self.__specializations.values()):
+                self.enforce_limits(func)
+
+        if self.limit is not None:
+            self._evict_lru(list(self.__specializations.values()), self.limit)
+
+        self.release_evicted()
+
+    def evict(self, specialization):
+        """
+        Remove a specialization from the caches. Its machine code is freed
+        by release_evicted() once its NumbaFunction is no longer referenced.
+        """
+        py_func, argtypes_flags = specialization.py_func, specialization.key
+        del self.__specializations[py_func, argtypes_flags]
+        del self.__compiled_funcs[py_func][argtypes_flags]
+
+        numba_wrapper = specialization.numba_wrapper
+        if py_func in self.__local_caches:
+            self.__local_caches[py_func].remove(numba_wrapper)
+
+        ref = weakref.ref(numba_wrapper, self.__on_collect)
+        self.__evicted[ref] = specialization
+        specialization.compiled = specialization.compiled[:2]
+        if specialization.tier is not None:
+            # The low tier wrapper uses the counter and callback of the
+            # tier until release_evicted() frees it
+            specialization.tier.drop()
+        self.num_evicted += 1
+        logger.debug("Evicted specialization %s%s", py_func.__name__,
+                     argtypes_flags[0])
+
+    def __on_collect(self, ref):
+        # Don't free code from within the deallocator of the NumbaFunction
+        self.__released.append(self.__evicted.pop(ref))
+
+    def retire(self, numba_wrapper, llvm_wrapper_func, lfunc, live_objects):
+        """
+        Free the replaced code of a NumbaFunction (e.g. the low tier of a
+        re-optimized specialization, see numba.tiered) once the
+        NumbaFunction is no longer referenced, as a call may still run in
+        it until then. `live_objects` are kept alive until the code is
+        freed. lfunc is kept if other functions call it.
+        """
+        ref = weakref.ref(numba_wrapper, self.__on_collect_retired)
+        self.__retired[ref] = (llvm_wrapper_func, lfunc, live_objects)
+
+    def __on_collect_retired(self, ref):
+        self.__released_code.append(self.__retired.pop(ref))
+
+    def release_evicted(self):
+        "Free the machine code of evicted and unreferenced specializations"
+        llvm_context = self.env.llvm_context
+        while self.__released:
+            specialization = self.__released.pop()
+            llvm_context.free_function(specialization.llvm_wrapper_func)
+            llvm_context.free_function(specialization.lfunc)
+            specialization.compiled = None
+            specialization.live_objects = None
+            specialization.tier = None
+            self.num_released += 1
+
+        while self.__released_code:
+            llvm_wrapper_func, lfunc, live_objects = self.__released_code.pop()
+            llvm_context.free_function(llvm_wrapper_func)
+            if lfunc.use_count == 0:
+                llvm_context.free_function(lfunc)
+
+    def stats(self):
+        "Return CacheStats for the resident and evicted specializations"
+        resident = [s for s in self.__specializations.values()
+                          if s.live_objects is not None]
+        return CacheStats(resident=len(resident),
+                          code_size=sum(s.code_size for s in resident),
+                          evicted=self.num_evicted,
+                          released=self.num_released,
+                          pending=len(self.__evicted) + len(self.__released))
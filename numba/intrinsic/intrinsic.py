@@ -67,7 +67,7 @@ class IntrinsicLibrary(object):
         pmb.populate(self._fpm)
 
     def add(self, intr):
-        '''Add a new intrinsic.
+        '''Add a new intrinsic. It is implemented on first use.
         intr --- an Intrinsic class
         '''
         if __debug__:
@@ -76,9 +76,6 @@ class IntrinsicLibrary(object):
                 raise NameError("Duplicated intrinsic function: %s" \
                                 % intr.__name__)
         self._functions[intr.__name__] = intr
-        if intr.arg_types and intr.return_type:
-            # only if it defines arg_types and return_type
-            self.implement(intr())
 
     def implement(self, intr):
         '''Implement a new intrinsic.
@@ -129,6 +126,8 @@ class IntrinsicLibrary(object):
                 if not intr.arg_types and not intr.return_type:
                     self.implement(intr(arg_types=arg_types,
                                         return_type=return_type))
+                else:
+                    self.implement(intr())
                 sig, lfunc = self._compiled[key]
 
         return sig, lfunc
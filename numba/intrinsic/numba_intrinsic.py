@@ -65,7 +65,6 @@ numbawrapper.add_hash_by_value_type(Intrinsic)
 #------------------------------------------------------------------------
 
 cache = {}
-env = environment.NumbaEnvironment.get_environment()
 
 def make_intrinsic(intrinsic):
     """
@@ -92,6 +91,7 @@ def make_intrinsic(intrinsic):
     func_ast = mod_ast.body[0]
 
     # Compile
+    env = environment.NumbaEnvironment.get_environment()
     func_env, _ = pipeline.run_pipeline2(
         env, func=None, func_ast=func_ast,
         func_signature=intrinsic.func_signature,
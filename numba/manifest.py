@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+Specialization manifests: record the signatures a process compiled, and
+compile them eagerly at the start of another process.
+
+    # In a warmed-up process
+    numba.dump_manifest('specializations.manifest')
+
+    # During startup, before accepting load
+    numba.precompile('specializations.manifest')
+
+Functions are identified by their qualified name ('module.function'), so
+only module-level functions can be precompiled. Other entries (closures,
+methods) are skipped.
+
+Precompiling populates the FunctionCache. The first call to an autojit
+function for a precompiled signature still goes through the slow
+dispatch path once, but does not compile anything.
+"""
+from __future__ import print_function, division, absolute_import
+
+import sys
+import logging
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+from numba import environment
+
+logger = logging.getLogger(__name__)
+
+manifest_format_version = 1
+
+def get_manifest_entries(env=None):
+    """
+    Return the list of manifest entries for all signatures seen by the
+    environment. Each entry is a (module_name, func_name, signature) tuple.
+    """
+    if env is None:
+        env = environment.NumbaEnvironment.get_environment()
+
+    entries = []
+    for py_func, signature in env.specializations.iter_signatures():
+        entry = (py_func.__module__, py_func.__name__, signature)
+        if entry not in entries:
+            entries.append(entry)
+
+    return entries
+
+def dump_manifest(filename, env=None):
+    "Write the signatures seen by the environment to a manifest file"
+    entries = get_manifest_entries(env)
+    with open(filename, 'wb') as f:
+        pickle.dump((manifest_format_version, entries), f,
+                    pickle.HIGHEST_PROTOCOL)
+
+    return entries
+
+def load_manifest(filename):
+    with open(filename, 'rb') as f:
+        version, entries = pickle.load(f)
+
+    if version != manifest_format_version:
+        raise ValueError("Unsupported manifest version %s in %s" % (version,
+                                                                    filename))
+    return entries
+
+# ______________________________________________________________________
+
+def lookup_function(module_name, func_name):
+    "Find a numba function by its qualified name, or return None"
+    try:
+        __import__(module_name)
+    except ImportError as e:
+        logger.warning("Cannot precompile %s.%s: %s", module_name,
+                       func_name, e)
+        return None
+
+    module = sys.modules[module_name]
+    return getattr(module, func_name, None)
+
+def precompile_entry(env, module_name, func_name, signature):
+    """
+    Compile a single manifest entry. Return whether the specialization is
+    available after the call.
+    """
+    from numba import decorators
+
+    numba_func = lookup_function(module_name, func_name)
+    if numba_func is None:
+        return False
+
+    if hasattr(numba_func, 'compile_signature'):
+        # @autojit function
+        numba_func.compile_signature(signature)
+    elif hasattr(numba_func, 'py_func'):
+        # @jit function, compiled when its module was imported
+        decorators.compile_function(env, numba_func.py_func, signature.args,
+                                    restype=signature.return_type)
+    else:
+        logger.warning("Cannot precompile %s.%s: not a numba function",
+                       module_name, func_name)
+        return False
+
+    return True
+
+def _precompile_worker(args):
+    "Compile entries in a subprocess, and store them in the disk cache"
+    cache_dir, entries = args
+    env = environment.NumbaEnvironment.get_environment()
+    env.enable_disk_cache(cache_dir)
+    for entry in entries:
+        try:
+            precompile_entry(env, *entry)
+        except Exception:
+            # The parent process will compile (and report) it
+            logger.debug("Precompiling %s.%s failed", *entry[:2])
+
+def precompile(manifest, processes=1, env=None):
+    """
+    Compile all specializations listed in a manifest (a filename or a list
+    of entries from get_manifest_entries()).
+
+    With processes > 1 and the disk cache enabled (see
+    NumbaEnvironment.enable_disk_cache()), the entries are compiled in
+    parallel in worker processes. The results are then loaded from the
+    disk cache into this process.
+
+    Returns the number of specializations that are available.
+    """
+    if env is None:
+        env = environment.NumbaEnvironment.get_environment()
+
+    if isinstance(manifest, (list, tuple)):
+        entries = manifest
+    else:
+        entries = load_manifest(manifest)
+
+    disk_cache = env.specializations.disk_cache
+    if processes > 1 and disk_cache is not None and len(entries) > 1:
+        import multiprocessing
+
+        chunks = [entries[i::processes] for i in range(processes)]
+        pool = multiprocessing.Pool(processes)
+        try:
+            pool.map(_precompile_worker,
+                     [(disk_cache.cache_dir, chunk) for chunk in chunks])
+        finally:
+            pool.close()
+            pool.join()
+
+    ncompiled = 0
+    for entry in entries:
+        try:
+            ncompiled += precompile_entry(env, *entry)
+        except Exception as e:
+            # A stale entry, e.g. a signature that no longer type checks
+            logger.warning("Cannot precompile %s.%s%s: %s",
+                           entry[0], entry[1], entry[2], e)
+
+    return ncompiled
@@ -52,6 +52,15 @@ else:
     PyCapsule_GetContext.argtypes = [ctypes.py_object]
 
 
+_multiarray_api = None
+
+def get_multiarray_api():
+    "Return the MultiarrayAPI, scraping the NumPy headers on first use"
+    global _multiarray_api
+    if _multiarray_api is None:
+        _multiarray_api = MultiarrayAPI()
+    return _multiarray_api
+
 class MultiarrayAPI (object):
     _type_map = {
             'char' : _int8,
@@ -160,6 +160,10 @@ class FunctionWrapperNode(Node):
 
     _fields = ['body', 'return_result']
 
+    # (counter address, threshold, callback address) to count calls for
+    # tiered compilation (see numba.tiered)
+    call_counter = None
+
     def __init__(self, wrapped_function, signature, orig_py_func, fake_pyfunc,
                  orig_py_func_name):
         self.wrapped_function = wrapped_function
@@ -129,13 +129,7 @@ class DataPointerNode(ExprNode):
         acc = PyArrayAccessor(builder, llvm_value, tbaa, self.type)
 
         var = self.node.variable
-
-        # Load the data pointer. Use preloaded value if available
-        if var.preload_data:
-            # print "using preloaded data", var.preloaded_data
-            dptr = var.preloaded_data
-        else:
-            dptr = acc.data
+        dptr = self.data_pointer(builder, tbaa, llvm_value)
 
         # Load the strides. Use preloaded values if available
         if var.preload_strides:
@@ -150,6 +144,68 @@ class DataPointerNode(ExprNode):
 
         return dptr, strides
 
+    def data_pointer(self, builder, tbaa, llvm_value):
+        "Load the data pointer. Use preloaded value if available"
+        var = self.node.variable
+        if var.preload_data:
+            # print "using preloaded data", var.preloaded_data
+            return var.preloaded_data
+
+        acc = PyArrayAccessor(builder, llvm_value, tbaa, self.type)
+        return acc.data
+
+    def shape(self, builder, tbaa, llvm_value):
+        "Load the extents. Use preloaded values if available"
+        var = self.node.variable
+        if var.preload_shape:
+            return var.preloaded_shape
+
+        acc = PyArrayAccessor(builder, llvm_value, tbaa, self.type)
+        return list(get_shape(builder, tbaa, acc.shape, self.ndim))
+
+    @property
+    def is_contig(self):
+        array_type = self.node.type
+        return self.ndim > 0 and (array_type.is_c_contig or
+                                  array_type.is_f_contig)
+
+    def subscript_contig(self, translator, tbaa, llvm_value, indices):
+        """
+        Index a C or F contiguous array. The element offset is computed
+        from the extents, which gives unit-stride accesses in the inner
+        dimension that LLVM can vectorize. No strides are loaded.
+        """
+        builder = translator.builder
+        caster = translator.caster
+        context = translator.context
+
+        indices = list(indices)
+        if self.ndim > 1:
+            shape = self.shape(builder, tbaa, llvm_value)
+        else:
+            shape = None
+
+        if not self.node.type.is_c_contig:
+            # Fortran order, the first dimension is the inner dimension
+            indices.reverse()
+            if shape is not None:
+                shape = shape[::-1]
+
+        intp_ltype = npy_intp.to_llvm(context)
+        offset = None
+        for i, index in enumerate(indices):
+            index = caster.cast(index, intp_ltype, unsigned=False)
+            if offset is None:
+                offset = index
+            else:
+                extent = caster.cast(shape[i], intp_ltype, unsigned=False)
+                offset = builder.add(builder.mul(offset, extent), index)
+
+        data_ptr_ty = llvm.core.Type.pointer(self.type.to_llvm(context))
+        dptr = builder.bitcast(self.data_pointer(builder, tbaa, llvm_value),
+                               data_ptr_ty)
+        return builder.gep(dptr, [offset])
+
     def subscript(self, translator, tbaa, llvm_value, indices):
         builder = translator.builder
         caster = translator.caster
@@ -160,6 +216,10 @@ class DataPointerNode(ExprNode):
         if not isinstance(indices, collections.Iterable):
             indices = (indices,)
 
+        if self.is_contig and len(indices) == self.ndim:
+            return self.subscript_contig(translator, tbaa, llvm_value,
+                                         indices)
+
         dptr, strides = self.data_descriptors(builder, tbaa, llvm_value)
 
         for i, (stride, index) in enumerate(zip(strides, indices)):
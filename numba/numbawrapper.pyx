@@ -1,4 +1,5 @@
 cimport cython
+from libc.string cimport memcmp, memcpy
 from numba._numba cimport *
 cimport numpy as cnp
 
@@ -16,8 +17,17 @@ cdef extern from *:
     ctypedef struct PyTypeObject:
         PyObject *tp_dict
 
+    ctypedef object (*PyCFunction)(object, object)
+
     ctypedef struct PyMethodDef:
-        pass
+        PyCFunction ml_meth
+        int ml_flags
+
+    ctypedef struct PyCFunctionObject:
+        PyMethodDef *m_ml
+
+    int METH_VARARGS
+    PyTypeObject *Py_TYPE(object)
 
 cdef extern from "numbafunction.h":
     cdef size_t closure_field_offset
@@ -154,15 +164,30 @@ cdef class _NumbaSpecializingWrapper(NumbaWrapper):
                              (args, kwargs) -> compiled_callable
         funccache: AutojitFunctionCache that can quickly lookup the right
                    specialization
+        background_compiler: numba.background.BackgroundCompiler or None.
+                             If set, cache misses run py_func in the
+                             interpreter while the specialization is
+                             compiled on a worker thread.
+        fallback_calls: number of calls that ran in the interpreter because
+                        the specialization was not compiled yet
     """
 
     cdef public AutojitFunctionCache funccache
     cdef public object compiling_decorator
+    cdef public object background_compiler
+    cdef public Py_ssize_t fallback_calls
 
-    def __init__(self, py_func, compiling_decorator, funccache):
+    # Keys submitted to the background compiler
+    cdef set submitted
+
+    def __init__(self, py_func, compiling_decorator, funccache,
+                 background_compiler=None):
         super(_NumbaSpecializingWrapper, self).__init__(py_func)
         self.compiling_decorator = compiling_decorator
         self.funccache = funccache
+        self.background_compiler = background_compiler
+        self.fallback_calls = 0
+        self.submitted = set()
 
     def __repr__(self):
         return '<specializing numba function(%s)>' % self.py_func
@@ -173,13 +198,40 @@ cdef class _NumbaSpecializingWrapper(NumbaWrapper):
 
         numba_wrapper = self.funccache.lookup(args)
         if numba_wrapper is None:
+            if self.background_compiler is not None:
+                return self.fallback(args)
+
             # print "Cache miss for function:", self.py_func.__name__
             numba_wrapper = self.compiling_decorator(args, kwargs)
             self.funccache.add(args, numba_wrapper)
 
-        return PyObject_Call(<PyObject *> numba_wrapper,
+        return call_numba_function(numba_wrapper, args)
+
+    cdef fallback(self, tuple args):
+        "Run py_func, and compile the specialization in the background"
+        key = getkey(args)
+        if key not in self.submitted:
+            self.submitted.add(key)
+            self.background_compiler.submit(self, args)
+
+        self.fallback_calls += 1
+        return PyObject_Call(<PyObject *> self.py_func,
                              <PyObject *> args, NULL)
 
+cdef inline call_numba_function(numba_wrapper, tuple args):
+    """
+    Call a NumbaFunction through its wrapper function, skipping the generic
+    call machinery. The PyMethodDef is read on every call, since tiered
+    compilation swaps in new code (see numba.tiered).
+    """
+    cdef PyMethodDef *ml
+    if Py_TYPE(numba_wrapper) == NumbaFunctionType:
+        ml = (<PyCFunctionObject *> numba_wrapper).m_ml
+        if ml.ml_flags == METH_VARARGS:
+            return ml.ml_meth(numba_wrapper, args)
+
+    return PyObject_Call(<PyObject *> numba_wrapper, <PyObject *> args, NULL)
+
 class NumbaSpecializingWrapper(_NumbaSpecializingWrapper):
 
     @property
@@ -256,6 +308,65 @@ cpdef inline getkey(tuple args): # 3.0x
     return key
 
 
+# Use counter for the LRU eviction of specializations
+# (see functions.FunctionCache)
+cdef Py_ssize_t use_tick = 0
+
+cpdef Py_ssize_t next_use_tick():
+    global use_tick
+    use_tick += 1
+    return use_tick
+
+#------------------------------------------------------------------------
+# Autojit Inline Cache
+#------------------------------------------------------------------------
+
+# Number of entries of the polymorphic inline cache, and the maximum number
+# of arguments of calls that use it
+DEF INLINE_CACHE_SIZE = 4
+DEF INLINE_CACHE_MAX_ARGS = 8
+
+cdef struct ArgKey:
+    # The same information as a getkey() triple, without allocating it
+    PyTypeObject *type
+    PyObject *descr
+    Py_ssize_t ndim_flags
+
+cdef struct InlineCacheEntry:
+    Py_ssize_t nargs
+    ArgKey argkeys[INLINE_CACHE_MAX_ARGS]
+    PyObject *key       # getkey() tuple (owned reference)
+    PyObject *wrapper   # (owned reference)
+
+cdef inline bint fill_argkeys(ArgKey *argkeys, tuple args, Py_ssize_t nargs):
+    """
+    Fill in the ArgKeys of the arguments. Return False if an argument is
+    hashed on its value (see getkey()), these calls don't use the inline
+    cache.
+    """
+    cdef Py_ssize_t i
+    cdef cnp.ndarray array
+
+    for i in range(nargs):
+        arg = <object> PyTuple_GET_ITEM(args, i)
+        argkeys[i].type = Py_TYPE(arg)
+        if isinstance(arg, cnp.ndarray):
+            array = <cnp.ndarray> arg
+            argkeys[i].descr = <PyObject *> array.descr
+            argkeys[i].ndim_flags = array.ndim | (cnp.PyArray_FLAGS(arg) << 5)
+        elif isinstance(arg, hash_on_value_types):
+            return False
+        else:
+            argkeys[i].descr = NULL
+            argkeys[i].ndim_flags = 0
+
+    return True
+
+cdef inline void clear_entry(InlineCacheEntry *entry):
+    Py_CLEAR(entry.key)
+    Py_CLEAR(entry.wrapper)
+    entry.nargs = 0
+
 cdef class AutojitFunctionCache(object):
     """
     Try a faster lookup for autojit functions.
@@ -263,32 +374,120 @@ cdef class AutojitFunctionCache(object):
     This function cache may give none where a compiled specialization does
     exist. This is caught by the slow path going through
     functions.FunctionCache.
+
+    Lookups first try a small polymorphic inline cache of the last used
+    specializations, which compares argument types, dtypes, ndim and flags
+    without allocating a key. Misses fall back to the dict of
+    specializations keyed by getkey().
+
+        track_usage: whether to record when each specialization was last
+                     used, for the LRU eviction in functions.FunctionCache
     """
 
     cdef dict specializations
 
-    # list of dtypes that need to be alive in order for the id() hash to
-    # remain valid
-    cdef list dtypes
+    # dtypes that need to be alive in order for the id() hash of a key
+    # to remain valid: key -> [dtype]
+    cdef dict dtypes
+
+    # key -> use tick of the last lookup, if track_usage is set
+    cdef dict last_used
+    cdef public bint track_usage
+
+    cdef InlineCacheEntry inline_cache[INLINE_CACHE_SIZE]
+    cdef int inline_cache_next
 
     def __init__(self):
         self.specializations = {}
-        self.dtypes = []
+        self.dtypes = {}
+        self.last_used = {}
+        self.track_usage = False
+
+    def __dealloc__(self):
+        self.clear_inline_cache()
+
+    cdef clear_inline_cache(self):
+        cdef int i
+        for i in range(INLINE_CACHE_SIZE):
+            clear_entry(&self.inline_cache[i])
+
+    cdef inline_cache_insert(self, ArgKey *argkeys, Py_ssize_t nargs,
+                             key, wrapper):
+        "Replace the oldest inline cache entry"
+        cdef InlineCacheEntry *entry = &self.inline_cache[
+                                                self.inline_cache_next]
+        self.inline_cache_next = (self.inline_cache_next + 1) % \
+                                                        INLINE_CACHE_SIZE
+        clear_entry(entry)
+
+        entry.nargs = nargs
+        memcpy(entry.argkeys, argkeys, nargs * sizeof(ArgKey))
+        Py_INCREF(<PyObject *> key)
+        entry.key = <PyObject *> key
+        Py_INCREF(<PyObject *> wrapper)
+        entry.wrapper = <PyObject *> wrapper
 
     cpdef add(self, args, wrapper):
         # self.specializations[0] = wrapper
 #        key = (0x19228, 0x384726)
         key = getkey(args)
         self.specializations[key] = wrapper
+        self.dtypes[key] = [arg.dtype for arg in args
+                                          if isinstance(arg, np.ndarray)]
+        if self.track_usage:
+            self.last_used[key] = next_use_tick()
 
-        for arg in args:
-            if isinstance(arg, np.ndarray):
-                self.dtypes.append(arg.dtype)
+        # The key may have mapped to another wrapper
+        self.clear_inline_cache()
 
     cdef lookup(self, tuple args):
+        cdef Py_ssize_t i
+        cdef Py_ssize_t nargs = PyTuple_GET_SIZE(args)
+        cdef ArgKey argkeys[INLINE_CACHE_MAX_ARGS]
+        cdef InlineCacheEntry *entry
+        cdef bint use_inline_cache = (nargs <= INLINE_CACHE_MAX_ARGS and
+                                      fill_argkeys(argkeys, args, nargs))
+
+        if use_inline_cache:
+            for i in range(INLINE_CACHE_SIZE):
+                entry = &self.inline_cache[i]
+                if (entry.wrapper != NULL and entry.nargs == nargs and
+                        memcmp(entry.argkeys, argkeys,
+                               nargs * sizeof(ArgKey)) == 0):
+                    if self.track_usage:
+                        self.last_used[<object> entry.key] = next_use_tick()
+                    return <object> entry.wrapper
+
         # return self.specializations[0]
         key = getkey(args)
 
 #        key = (0x19228, 0x384726)
         wrapper = self.specializations.get(key)
+        if wrapper is not None:
+            if self.track_usage:
+                self.last_used[key] = next_use_tick()
+            if use_inline_cache:
+                self.inline_cache_insert(argkeys, nargs, key, wrapper)
         return wrapper
+
+    cpdef Py_ssize_t last_use(self, wrapper):
+        "Return the use tick of the last lookup of wrapper, or 0"
+        cdef Py_ssize_t result = 0
+        for key, value in self.specializations.items():
+            if value is wrapper:
+                result = max(result, self.last_used.get(key, 0))
+        return result
+
+    cpdef remove(self, wrapper):
+        "Remove all keys that map to the given wrapper"
+        keys = [key for key, value in self.specializations.items()
+                        if value is wrapper]
+        for key in keys:
+            del self.specializations[key]
+            del self.dtypes[key]
+            self.last_used.pop(key, None)
+
+        self.clear_inline_cache()
+
+    def __len__(self):
+        return len(self.specializations)
@@ -100,10 +100,16 @@ class Preloader(visitors.NumbaTransformer):
 
         if is_full_index and is_name and not maybe_null:
             array_variable = node.value.variable
+            array_type = array_variable.type
 
-            # Set the preload conditions
+            # Set the preload conditions. Indexing contiguous arrays uses
+            # the extents instead of the strides (see DataPointerNode)
             array_variable.preload_data = True
-            array_variable.preload_strides = True
+            if array_type.is_c_contig or array_type.is_f_contig:
+                if array_type.ndim > 1:
+                    array_variable.preload_shape = True
+            else:
+                array_variable.preload_strides = True
 
         self.visitchildren(node)
         return node
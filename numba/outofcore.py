@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+"""
+Out-of-core evaluation of ufuncs and array expression kernels over
+(memory-mapped) arrays that do not fit in memory.
+
+    a = np.memmap('a.f8', dtype=np.float64, mode='r', shape=(N,))
+    b = np.memmap('b.f8', dtype=np.float64, mode='r', shape=(N,))
+
+    # A vectorize ufunc (or any NumPy ufunc), with a new memory-mapped
+    # output file
+    out = outofcore.stream_ufunc(ufunc, [a, b], out='out.f8')
+
+    # An @autojit function with an array expression writing its first
+    # argument, out[...] = a * b + 1.0
+    outofcore.stream(kernel, out, [a, b])
+
+The operands are broadcast, and walked in chunks along the first
+dimension. The chunks of all operands together span about `chunk_bytes`
+(4 MB by default), and the chunks of the output start at page
+boundaries. Each chunk is written straight into the output.
+
+After a chunk is done, the pages of memory-mapped operands it touched are
+released with madvise(MADV_DONTNEED), so the resident set stays bounded
+regardless of the size of the operands. Dirty output pages stay in the
+page cache and are written back by the kernel. With prefetch=True, a
+background thread advises the kernel (madvise(MADV_WILLNEED)) to read
+the next chunk of the inputs while the current one is computed.
+
+Pages are released on Linux only, where MADV_DONTNEED keeps the data of
+shared file mappings. Copy-on-write memmaps (mode 'c') are never released.
+Elsewhere, or without memory-mapped operands, the chunks still bound the
+size of temporaries.
+"""
+from __future__ import print_function, division, absolute_import
+
+import sys
+import mmap
+import ctypes
+import ctypes.util
+import logging
+import threading
+
+try:
+    import Queue as queue
+except ImportError:
+    import queue
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+default_chunk_bytes = 4 * 1024 * 1024
+
+MADV_WILLNEED = 3
+MADV_DONTNEED = 4
+
+#------------------------------------------------------------------------
+# madvise
+#------------------------------------------------------------------------
+
+_madvise = None
+if sys.platform.startswith('linux') or sys.platform == 'darwin':
+    try:
+        _libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        _madvise = _libc.madvise
+        _madvise.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_int]
+        _madvise.restype = ctypes.c_int
+    except (OSError, AttributeError):
+        _madvise = None
+
+# Whether MADV_DONTNEED keeps the data of dirty pages of shared mappings
+can_release_dirty = sys.platform.startswith('linux')
+
+def madvise(low, high, advice):
+    """
+    Advise the kernel about the use of the pages spanning the addresses
+    [low, high). Returns whether the advice was given.
+    """
+    if _madvise is None or high <= low:
+        return False
+
+    page = mmap.PAGESIZE
+    start = low - low % page
+    if _madvise(start, high - start, advice) != 0:
+        logger.debug("madvise(%d) failed: %s", advice,
+                     ctypes.get_errno())
+        return False
+    return True
+
+def _is_file_mapping(arr):
+    """
+    Whether `arr` is backed by a shared file mapping. Arrays derived from
+    a memmap (e.g. memmap * 2) are np.memmap instances on the heap, with
+    no _mmap and no mode.
+    """
+    return (getattr(arr, '_mmap', None) is not None and
+            getattr(arr, 'mode', None) in ('r', 'r+', 'w+'))
+
+def _is_memmap(arr, dirty):
+    "Whether the pages of the memmap `arr` can be released"
+    if not _is_file_mapping(arr):
+        return False
+    return not dirty or can_release_dirty
+
+#------------------------------------------------------------------------
+# Prefetching
+#------------------------------------------------------------------------
+
+class Prefetcher(object):
+    "Background thread reading ahead the pages of address ranges"
+
+    def __init__(self):
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self.run,
+                                       name="numba-prefetcher")
+        self.thread.daemon = True
+        self.thread.start()
+
+    def prefetch(self, ranges):
+        self.queue.put(ranges)
+
+    def run(self):
+        while True:
+            ranges = self.queue.get()
+            if ranges is None:
+                break
+            # madvise() releases the GIL (ctypes), and may block on I/O
+            for low, high in ranges:
+                madvise(low, high, MADV_WILLNEED)
+
+    def close(self):
+        self.queue.put(None)
+        self.thread.join()
+
+#------------------------------------------------------------------------
+# Chunked evaluation
+#------------------------------------------------------------------------
+
+def _gcd(a, b):
+    while b:
+        a, b = b, a % b
+    return a
+
+def chunk_rows(out, operands, chunk_bytes):
+    """
+    Number of rows (elements of the first dimension) per chunk, such that
+    the chunks of all operands span about `chunk_bytes`, and chunks of a
+    contiguous output start at page boundaries unless page aligned chunks
+    would exceed `chunk_bytes`.
+    """
+    row_bytes = sum(op.nbytes // max(op.shape[0], 1) for op in operands)
+    rows = max(1, chunk_bytes // max(row_bytes, 1))
+
+    out_row_bytes = out.nbytes // max(out.shape[0], 1)
+    if out.flags.c_contiguous and out_row_bytes:
+        page = mmap.PAGESIZE
+        step = page // _gcd(page, out_row_bytes)
+        if step * out_row_bytes <= chunk_bytes:
+            rows = max(step, rows - rows % step)
+
+    return rows
+
+def _byte_bounds(chunks):
+    """
+    The address ranges of the contiguous chunks. Rows of a Fortran-ordered,
+    transposed or broadcast operand span about all of its memory, so their
+    pages are neither prefetched nor released.
+    """
+    return [np.byte_bounds(chunk) for chunk in chunks
+                if chunk.size and chunk.flags.c_contiguous]
+
+def stream(kernel, out, inputs, chunk_bytes=default_chunk_bytes,
+           prefetch=True):
+    """
+    Call kernel(out_chunk, *input_chunks) for chunks along the first
+    dimension of `out`, with the inputs broadcast to the shape of `out`.
+    The kernel writes its result into out_chunk, e.g. an @autojit function
+    with an array expression (out[...] = a * b). Returns `out`.
+    """
+    if out.ndim == 0:
+        kernel(out, *inputs)
+        return out
+
+    originals = list(inputs)
+    inputs = [np.asarray(x) for x in inputs]
+    broadcast = np.broadcast_arrays(out, *inputs)[1:]
+    # Operands that are not arrays (scalars) stay as they are
+    inputs = [x if np.ndim(original) else original
+                  for x, original in zip(broadcast, originals)]
+    arrays = [(x, original) for x, original in zip(inputs, originals)
+                  if np.ndim(original)]
+
+    # Writable memmaps may have dirty pages
+    release_inputs = [x for x, original in arrays
+                          if _is_memmap(original,
+                                        getattr(original, 'mode', None) != 'r')]
+    prefetch_inputs = [x for x, original in arrays
+                           if _is_file_mapping(original)]
+    release_out = _is_memmap(out, dirty=True)
+
+    rows = chunk_rows(out, [out] + [x for x, original in arrays],
+                      chunk_bytes)
+    n = out.shape[0]
+
+    prefetcher = None
+    if prefetch and prefetch_inputs and _madvise is not None and n > rows:
+        prefetcher = Prefetcher()
+
+    try:
+        for start in range(0, n, rows):
+            stop = min(start + rows, n)
+            if prefetcher is not None and stop < n:
+                next_stop = min(stop + rows, n)
+                prefetcher.prefetch(_byte_bounds(
+                    x[stop:next_stop] for x in prefetch_inputs))
+
+            out_chunk = out[start:stop]
+            kernel(out_chunk, *[x[start:stop] if np.ndim(x) else x
+                                    for x in inputs])
+
+            # Release the pages of the chunk
+            released = [x[start:stop] for x in release_inputs]
+            if release_out:
+                released.append(out_chunk)
+            for low, high in _byte_bounds(released):
+                madvise(low, high, MADV_DONTNEED)
+    finally:
+        if prefetcher is not None:
+            prefetcher.close()
+
+    return out
+
+def _ufunc_kernel(ufunc):
+    def kernel(out, *inputs):
+        ufunc(*inputs, out=out)
+    return kernel
+
+def stream_ufunc(ufunc, inputs, out=None, chunk_bytes=default_chunk_bytes,
+                 prefetch=True):
+    """
+    Evaluate ufunc(*inputs) in chunks (see stream()). `out` is the output
+    array, or the filename of a new memory-mapped output, or None for a
+    new in-memory array. Returns the output.
+    """
+    if not isinstance(out, np.ndarray):
+        shape = np.broadcast(*inputs).shape if len(inputs) > 1 else \
+                    np.shape(inputs[0])
+        # Resolve the output type on empty operands
+        dtype = ufunc(*[np.asarray(x).ravel()[:0] if np.ndim(x) else x
+                            for x in inputs]).dtype
+        if out is None:
+            out = np.empty(shape, dtype=dtype)
+        else:
+            out = np.memmap(out, dtype=dtype, mode='w+', shape=shape)
+
+    return stream(_ufunc_kernel(ufunc), out, inputs, chunk_bytes, prefetch)
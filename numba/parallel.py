@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+"""
+Parallel execution of array expressions.
+
+With parallel execution enabled, the minivect kernel of an array expression
+(see numba.array_expressions) is called through a driver function with the
+same signature. If the expression has at least `threshold` elements, the
+driver splits the outer dimension into chunks, and runs the kernel on the
+chunks on a pool of native threads (numba/external/utilities/parallel.c).
+The GIL is released while the chunks run.
+
+    env = NumbaEnvironment.get_environment()
+    env.enable_parallel(threshold=65536)
+
+Setting NUMBA_PARALLEL_THRESHOLD=<elements> enables it for the default
+environment, and NUMBA_NUM_THREADS sets the number of threads (default:
+the number of processors). Without an explicit threshold, the threshold
+tuned for the dtype and dimensionality of the expression is used (see
+numba.autotune), or 65536 elements.
+
+Only the outer dimension is split. Operands that broadcast along the outer
+dimension have a zero outer stride (see sliceutils.Broadcast), and operands
+with fewer dimensions do not span it, so each chunk writes a disjoint part
+of the left-hand side.
+
+Reductions of all elements accumulate into a partial result per chunk,
+which is combined with the accumulator under a lock when the chunk is done.
+Reductions along the outer dimension run serially.
+"""
+from __future__ import print_function, division, absolute_import
+
+import ctypes
+
+import llvm.core
+
+from numba import *
+from numba import autotune
+from numba.external import utility
+from numba.external.utilities import utilities
+
+_get_num_threads = ctypes.CFUNCTYPE(ctypes.c_int)(
+    getattr(utilities, "__Numba_get_num_threads"))
+_set_num_threads = ctypes.CFUNCTYPE(None, ctypes.c_int)(
+    getattr(utilities, "__Numba_set_num_threads"))
+
+parallel_for = utility.UtilityFunction.load(
+    "__Numba_parallel_for",
+    int_(void.pointer(), void.pointer(), npy_intp, npy_intp))
+parallel_lock = utility.UtilityFunction.load("__Numba_parallel_lock", void())
+parallel_unlock = utility.UtilityFunction.load("__Numba_parallel_unlock",
+                                               void())
+
+def get_num_threads():
+    "Number of threads used by parallel array expressions"
+    return _get_num_threads()
+
+def set_num_threads(num_threads):
+    _set_num_threads(num_threads)
+
+class ParallelSettings(object):
+    """
+    Parallel execution settings for an environment.
+
+        enabled: whether array expressions are compiled for parallel execution
+        threshold: minimum number of elements to split the work, None for
+                   the tuned threshold (see numba.autotune)
+        grain: minimum number of outer iterations per chunk
+    """
+
+    default_threshold = 65536
+
+    def __init__(self, enabled=False, threshold=None, grain=1):
+        self.enabled = enabled
+        self.threshold = threshold
+        self.grain = grain
+
+    def get_threshold(self, tuning, dtype, ndim):
+        """
+        The threshold for array expressions of the given dtype and
+        dimensionality, looked up in TuningDatabase `tuning` unless set
+        explicitly.
+        """
+        if self.threshold is not None:
+            return self.threshold
+        return tuning.get(autotune.PARALLEL_THRESHOLD, dtype, ndim,
+                          self.default_threshold)
+
+    def is_eligible(self, ndim, dtypes):
+        "Whether an array expression can run in parallel"
+        return (self.enabled and ndim >= 1 and
+                not any(dtype.is_object for dtype in dtypes))
+
+    def build_parallel_kernel(self, context, lkernel, array_ndims,
+                              lcombine=None, threshold=None):
+        """
+        Build a driver for the minivect kernel `lkernel`, with the same
+        signature. array_ndims gives the dimensionality of each array
+        operand in argument order (starting with the left-hand side).
+
+        For reductions of all elements, `lcombine` is the function that
+        combines two partial results.
+        """
+        if threshold is None:
+            threshold = self.threshold or self.default_threshold
+        return build_parallel_kernel(context, lkernel, array_ndims,
+                                     threshold, self.grain, lcombine)
+
+#------------------------------------------------------------------------
+# Code generation
+#------------------------------------------------------------------------
+
+_int32 = llvm.core.Type.int(32)
+_void_star = llvm.core.Type.pointer(llvm.core.Type.int(8))
+
+def _index(i):
+    return llvm.core.Constant.int(_int32, i)
+
+def _cast_int(builder, value, type):
+    if value.type.width < type.width:
+        return builder.sext(value, type)
+    elif value.type.width > type.width:
+        return builder.trunc(value, type)
+    return value
+
+def _data_arg_indices(array_ndims, ndim):
+    """
+    Argument indices of the data pointers of the operands that span
+    the outer dimension. Arguments are: shape, data0, strides0, data1, ...
+    """
+    return [1 + 2 * i for i, array_ndim in enumerate(array_ndims)
+                          if array_ndim == ndim]
+
+def build_chunk_kernel(context, lkernel, closure_type, array_ndims,
+                       lcombine=None):
+    """
+    Build `int chunk_kernel(void *closure, npy_intp start, npy_intp stop)`,
+    which runs the kernel on rows [start, stop) of the outer dimension.
+    The closure holds the arguments of the kernel, followed by the initial
+    value of the accumulator for reductions with `lcombine`.
+    """
+    kernel_type = lkernel.type.pointee
+    intp = kernel_type.args[0].pointee
+    ndim = array_ndims[0]
+
+    func_type = llvm.core.Type.function(_int32, [_void_star, intp, intp])
+    lfunc = lkernel.module.add_function(func_type, lkernel.name + "_chunk")
+    builder = llvm.core.Builder.new(lfunc.append_basic_block('entry'))
+    closure, start, stop = lfunc.args
+
+    closure = builder.bitcast(closure, llvm.core.Type.pointer(closure_type))
+    args = [builder.load(builder.gep(closure, [_index(0), _index(i)]))
+                for i in range(len(kernel_type.args))]
+
+    # Shape of the chunk
+    shape = builder.alloca(llvm.core.Type.array(intp, ndim))
+    shape = builder.gep(shape, [_index(0), _index(0)])
+    for dim in range(1, ndim):
+        extent = builder.load(builder.gep(args[0], [_index(dim)]))
+        builder.store(extent, builder.gep(shape, [_index(dim)]))
+    builder.store(builder.sub(stop, start), shape)
+    args[0] = shape
+
+    # Offset data pointers to the first row of the chunk
+    for i in _data_arg_indices(array_ndims, ndim):
+        outer_stride = builder.load(args[i + 1])
+        data = builder.bitcast(args[i], _void_star)
+        data = builder.gep(data, [builder.mul(start, outer_stride)])
+        args[i] = builder.bitcast(data, kernel_type.args[i])
+
+    if lcombine is not None:
+        # Accumulate the chunk into a partial result of its own
+        accumulator = args[1]
+        partial = builder.alloca(accumulator.type.pointee)
+        initial = builder.gep(closure, [_index(0), _index(len(args))])
+        builder.store(builder.load(initial), partial)
+        args[1] = partial
+
+    result = builder.call(lkernel, args)
+
+    if lcombine is not None:
+        llvm_module = lkernel.module
+        builder.call(parallel_lock.declare_lfunc(context, llvm_module), [])
+        value = builder.call(lcombine, [builder.load(accumulator),
+                                        builder.load(partial)])
+        builder.store(value, accumulator)
+        builder.call(parallel_unlock.declare_lfunc(context, llvm_module), [])
+
+    builder.ret(_cast_int(builder, result, _int32))
+    lfunc.verify()
+    return lfunc
+
+def build_parallel_kernel(context, lkernel, array_ndims, threshold, grain,
+                          lcombine=None):
+    """
+    Build a function with the signature of `lkernel`, which runs the
+    kernel on chunks of the outer dimension in parallel if the total
+    size is at least `threshold`, and calls it directly otherwise.
+    """
+    kernel_type = lkernel.type.pointee
+    closure_fields = list(kernel_type.args)
+    if lcombine is not None:
+        # Initial value of the accumulator
+        closure_fields.append(kernel_type.args[1].pointee)
+    closure_type = llvm.core.Type.struct(closure_fields)
+    chunk_kernel = build_chunk_kernel(context, lkernel, closure_type,
+                                      array_ndims, lcombine)
+
+    llvm_module = lkernel.module
+    intp = kernel_type.args[0].pointee
+    ndim = array_ndims[0]
+
+    lfunc = llvm_module.add_function(kernel_type, lkernel.name + "_parallel")
+    entry = lfunc.append_basic_block('entry')
+    serial_block = lfunc.append_basic_block('serial')
+    parallel_block = lfunc.append_basic_block('parallel')
+    args = list(lfunc.args)
+
+    builder = llvm.core.Builder.new(entry)
+    extents = [builder.load(builder.gep(args[0], [_index(dim)]))
+                   for dim in range(ndim)]
+    size = extents[0]
+    for extent in extents[1:]:
+        size = builder.mul(size, extent)
+
+    one = llvm.core.Constant.int(intp, 1)
+    is_large = builder.and_(
+        builder.icmp(llvm.core.ICMP_SGE, size,
+                     llvm.core.Constant.int(intp, threshold)),
+        builder.icmp(llvm.core.ICMP_SGT, extents[0], one))
+    builder.cbranch(is_large, parallel_block, serial_block)
+
+    builder.position_at_end(serial_block)
+    builder.ret(builder.call(lkernel, args))
+
+    builder.position_at_end(parallel_block)
+    closure = builder.alloca(closure_type)
+    for i, arg in enumerate(args):
+        builder.store(arg, builder.gep(closure, [_index(0), _index(i)]))
+    if lcombine is not None:
+        initial = builder.gep(closure, [_index(0), _index(len(args))])
+        builder.store(builder.load(args[1]), initial)
+
+    lparallel_for = parallel_for.declare_lfunc(context, llvm_module)
+    result = builder.call(lparallel_for, [
+        builder.bitcast(chunk_kernel, _void_star),
+        builder.bitcast(closure, _void_star),
+        extents[0],
+        llvm.core.Constant.int(intp, grain)])
+    builder.ret(_cast_int(builder, result, kernel_type.return_type))
+
+    lfunc.verify()
+    return lfunc
@@ -25,6 +25,7 @@ from numba.codegen import llvmwrapper
 from numba import ast_constant_folding as constant_folding
 from numba.control_flow import ssa
 from numba.codegen import translate
+from numba.codegen import llvmcontext
 from numba import utils
 from numba.missing import FixMissingLocations
 from numba.type_inference import infer as type_inference
@@ -495,17 +496,48 @@ class LinkingStage(PipelineStage):
     def transform(self, ast, env):
         func_env = env.translation.crnt
 
-        # Link libraries into module
+        # Closures are compiled into the global module itself, which is
+        # already optimized and must not be stripped
+        own_module = func_env.lfunc.module is not env.llvm_context.module
+
+        # Link libraries into module, and only keep what the function uses
         env.context.intrinsic_library.link(func_env.lfunc.module)
         # env.context.cbuilder_library.link(func_env.lfunc.module)
         env.constants_manager.link(func_env.lfunc.module)
+        if own_module:
+            llvmcontext.strip_unused_definitions(func_env.lfunc.module)
+
+        stats = env.compile_stats()
+        if func_env.link and own_module:
+            opt = None
+            if env.tiering.is_eligible(env, func_env):
+                # Start in the low tier, see numba.tiered
+                func_env.tier = env.tiering.new_specialization(env, func_env)
+                opt = env.tiering.low_opt
+
+            with stats.measure(env, 'LLVMOptimize'):
+                env.llvm_context.optimize(func_env.lfunc.module, opt=opt)
+
+            if env.specializations.track_code_size:
+                func_env.code_size = env.llvm_context.code_size(
+                                                    func_env.lfunc.module)
+
+            disk_cache = env.specializations.disk_cache
+            if (disk_cache is not None and func_env.tier is None and
+                    disk_cache.is_cacheable(env, func_env)):
+                # Store the optimized module before it is consumed by linking
+                disk_cache.store(env, func_env)
 
         if func_env.link:
             # Link function into fat LLVM module
-            func_env.lfunc = env.llvm_context.link(func_env.lfunc)
+            with stats.measure(env, 'LLVMLink'):
+                func_env.lfunc = env.llvm_context.link(func_env.lfunc,
+                                                       optimize=False)
             func_env.translator.lfunc = func_env.lfunc
 
-        func_env.lfunc_pointer = func_env.translator.lfunc_pointer
+        # Getting the pointer generates machine code
+        with stats.measure(env, 'LLVMCodegen'):
+            func_env.lfunc_pointer = func_env.translator.lfunc_pointer
 
         return ast
 
@@ -523,10 +555,12 @@ class WrapperStage(PipelineStage):
             wrap = func_env.wrap
 
         if wrap:
-            numbawrapper, lfuncwrapper, _ = (
+            numbawrapper, lfuncwrapper, methoddef = (
                 llvmwrapper.build_wrapper_function(env))
             func_env.numba_wrapper_func = numbawrapper
             func_env.llvm_wrapper_func = lfuncwrapper
+            if func_env.tier is not None:
+                func_env.tier.set_wrapper(methoddef)
 
         return ast
 
@@ -572,11 +606,17 @@ class ComposedPipelineStage(PipelineStage):
 
     def transform(self, ast, env):
         logger.debug('Running composed stages: %s', self.stages)
+        stats = env.compile_stats()
         for stage in self.stages:
             if env.debug:
                 stage_tuple = (stage, utils.ast2tree(ast))
                 logger.debug(pprint.pformat(stage_tuple))
-            ast = stage(ast, env)
+            if stats.enabled:
+                stage_name = getattr(stage, '__name__', type(stage).__name__)
+                with stats.measure(env, stage_name):
+                    ast = stage(ast, env)
+            else:
+                ast = stage(ast, env)
         return ast
 
     @classmethod
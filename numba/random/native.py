@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""
+Native random number generation for nopython code.
+
+The generator is xorshift128+, whose state is two 64-bit words. States
+are kept in uint64 arrays of shape (nstreams, 2), one row per independent
+stream. The generator is an intrinsic, its LLVM IR is emitted inline at
+each call site, and reads and writes the state of the given stream:
+
+    from numba.random import native
+
+    states = native.states(seed=42, nstreams=4)
+
+    @jit(double(uint64[:, :], Py_ssize_t, int_), nopython=True)
+    def pi(states, stream, n):
+        inside = 0
+        for i in range(n):
+            x = native.uniform(states, stream)
+            y = native.uniform(states, stream)
+            if x * x + y * y < 1.0:
+                inside += 1
+        return 4.0 * inside / n
+
+    native.fill_normal(states, 1, out)      # out[:] = normal draws
+
+Streams are split with the jump function of xorshift128+: stream i + 1
+starts 2**64 draws after stream i, so the streams do not overlap in
+practice. Code running in parallel (threads, chunks of a loop, call
+sites) should each use its own stream. The same seed gives the same
+streams, and the same draws.
+
+The distributions (uniform, normal, exponential, integers) and the bulk
+fills of arrays are nopython functions built on the generator.
+"""
+from __future__ import print_function, division, absolute_import
+
+import os
+import math
+import struct
+
+import llvm.core
+import numpy as np
+
+import numba as nb
+from numba import *
+from numba import ndarray_helpers
+from numba.intrinsic.numba_intrinsic import NumbaIntrinsic
+
+MASK64 = (1 << 64) - 1
+
+# Jump polynomial of xorshift128+, advances the state by 2**64 draws
+JUMP = (0x8a5cd789635d2dff, 0x121fd2155c472f96)
+
+#------------------------------------------------------------------------
+# Seeding and stream splitting (Python)
+#------------------------------------------------------------------------
+
+def splitmix64(x):
+    "Returns the next state and output of the splitmix64 generator"
+    x = (x + 0x9e3779b97f4a7c15) & MASK64
+    z = x
+    z = ((z ^ (z >> 30)) * 0xbf58476d1ce4e5b9) & MASK64
+    z = ((z ^ (z >> 27)) * 0x94d049bb133111eb) & MASK64
+    return x, z ^ (z >> 31)
+
+def seed_state(seed):
+    "The initial state (s0, s1) for an integer seed, never all zero"
+    x, s0 = splitmix64(seed & MASK64)
+    x, s1 = splitmix64(x)
+    if s0 == s1 == 0:
+        s1 = 1
+    return s0, s1
+
+def next_state(s0, s1):
+    "The state following (s0, s1), as the native generator computes it"
+    x, y = s0, s1
+    x ^= (x << 23) & MASK64
+    return y, x ^ y ^ (x >> 18) ^ (y >> 5)
+
+def jump(s0, s1):
+    "The state 2**64 draws after (s0, s1)"
+    j0 = j1 = 0
+    for word in JUMP:
+        for bit in range(64):
+            if word & (1 << bit):
+                j0 ^= s0
+                j1 ^= s1
+            s0, s1 = next_state(s0, s1)
+    return j0, j1
+
+def _random_seed():
+    return struct.unpack('<Q', os.urandom(8))[0]
+
+def states(seed=None, nstreams=1):
+    """
+    A uint64 array of shape (nstreams, 2) with the states of `nstreams`
+    streams, for an integer seed (or a random one if seed is None).
+    """
+    if seed is None:
+        seed = _random_seed()
+
+    result = np.empty((nstreams, 2), dtype=np.uint64)
+    state = seed_state(seed)
+    for i in range(nstreams):
+        result[i] = state
+        state = jump(*state)
+    return result
+
+def split(states_array, nstreams):
+    """
+    The states of `nstreams` new streams, which follow the last stream of
+    `states_array`.
+    """
+    result = np.empty((nstreams, 2), dtype=np.uint64)
+    state = tuple(int(word) for word in states_array[-1])
+    for i in range(nstreams):
+        state = jump(*state)
+        result[i] = state
+    return result
+
+#------------------------------------------------------------------------
+# Generator (inline LLVM IR)
+#------------------------------------------------------------------------
+
+class XorShift128Plus(NumbaIntrinsic):
+    """
+    next_uint64(states, stream) returns the next 64 random bits of the
+    stream, and advances its state (a row of `states`) in place.
+    """
+
+    def emit_code(self, lfunc, builder, llvm_args):
+        states, stream = llvm_args
+        int64 = llvm.core.Type.int(64)
+        int8_p = llvm.core.Type.pointer(llvm.core.Type.int(8))
+
+        def const(value):
+            return llvm.core.Constant.int(int64, value)
+
+        accessor = ndarray_helpers.PyArrayAccessor(builder, states)
+        row_stride = builder.load(accessor.strides)
+        # The words of a row are not adjacent in e.g. Fortran order
+        word_stride = builder.load(builder.gep(accessor.strides, [const(1)]))
+        offset = builder.mul(stream, row_stride)
+        data = builder.gep(builder.bitcast(accessor.data, int8_p), [offset])
+        p0 = builder.bitcast(data, llvm.core.Type.pointer(int64))
+        p1 = builder.bitcast(builder.gep(data, [word_stride]),
+                             llvm.core.Type.pointer(int64))
+
+        x = builder.load(p0)
+        y = builder.load(p1)
+        result = builder.add(x, y)
+
+        x = builder.xor(x, builder.shl(x, const(23)))
+        builder.store(y, p0)
+        builder.store(
+            builder.xor(builder.xor(x, y),
+                        builder.xor(builder.lshr(x, const(18)),
+                                    builder.lshr(y, const(5)))),
+            p1)
+        return result
+
+next_uint64 = XorShift128Plus(uint64(uint64[:, :], Py_ssize_t), "next_uint64")
+
+lshr = nb.declare_instruction(uint64(uint64, uint64), 'lshr')
+urem = nb.declare_instruction(uint64(uint64, uint64), 'urem')
+
+#------------------------------------------------------------------------
+# Distributions
+#------------------------------------------------------------------------
+
+@jit(double(uint64[:, :], Py_ssize_t), nopython=True)
+def uniform(states, stream):
+    "A double in [0, 1), from the upper 53 bits of the next draw"
+    bits = int64(lshr(next_uint64(states, stream), 11))
+    return bits * (1.0 / 9007199254740992.0)   # 2 ** -53
+
+@jit(double(uint64[:, :], Py_ssize_t), nopython=True)
+def normal(states, stream):
+    "A standard normal double (Marsaglia's polar method)"
+    x = 0.0
+    s = 0.0
+    while s >= 1.0 or s == 0.0:
+        x = 2.0 * uniform(states, stream) - 1.0
+        y = 2.0 * uniform(states, stream) - 1.0
+        s = x * x + y * y
+
+    return x * math.sqrt(-2.0 * math.log(s) / s)
+
+@jit(double(uint64[:, :], Py_ssize_t), nopython=True)
+def exponential(states, stream):
+    "A standard exponential double"
+    return -math.log(1.0 - uniform(states, stream))
+
+@jit(int64(uint64[:, :], Py_ssize_t, int64, int64), nopython=True)
+def integers(states, stream, low, high):
+    "An integer in [low, high), without modulo bias, or low if high <= low"
+    if high <= low:
+        # The empty range would divide by zero below
+        return low
+
+    n = uint64(high - low)
+    # Reject the draws below 2**64 % n
+    threshold = urem(uint64(0) - n, n)
+    x = next_uint64(states, stream)
+    while x < threshold:
+        x = next_uint64(states, stream)
+
+    return low + int64(urem(x, n))
+
+#------------------------------------------------------------------------
+# Bulk fills
+#------------------------------------------------------------------------
+
+@jit(void(uint64[:, :], Py_ssize_t, double[:]), nopython=True)
+def fill_uniform(states, stream, out):
+    for i in range(out.shape[0]):
+        out[i] = uniform(states, stream)
+
+@jit(void(uint64[:, :], Py_ssize_t, double[:]), nopython=True)
+def fill_normal(states, stream, out):
+    for i in range(out.shape[0]):
+        out[i] = normal(states, stream)
+
+@jit(void(uint64[:, :], Py_ssize_t, double[:]), nopython=True)
+def fill_exponential(states, stream, out):
+    for i in range(out.shape[0]):
+        out[i] = exponential(states, stream)
+
+@jit(void(uint64[:, :], Py_ssize_t, int64, int64, int64[:]), nopython=True)
+def fill_integers(states, stream, low, high, out):
+    for i in range(out.shape[0]):
+        out[i] = integers(states, stream, low, high)
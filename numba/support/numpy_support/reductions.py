@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+"""
+Reductions of arrays and array expressions:
+
+    a.sum(), np.sum(a * b), (a > b).any(), np.amax(a - b, axis=1)
+
+Type inference builds an ArrayReductionNode, which the array expression
+rewrite compiles into the loop nest of the element-wise expression it
+reduces, without materializing the expression. The kernel combines each
+element with an accumulator:
+
+    acc[i, j] = combine(acc[i, j], a[i, j] * b[i, j])
+
+Reduced dimensions of the accumulator have stride zero, so a reduction of
+all elements accumulates into a single scalar, and a reduction along an
+axis into the elements of the result array.
+"""
+from __future__ import print_function, division, absolute_import
+
+import ast
+
+import numpy as np
+
+from numba import *
+from numba import nodes, typesystem
+
+# Reduction operator -> NumPy function
+numpy_functions = {
+    'sum': np.sum,
+    'prod': np.prod,
+    'min': np.amin,
+    'max': np.amax,
+    'any': np.any,
+    'all': np.all,
+}
+
+# Names of the operators in NumPy error messages
+ufunc_names = {
+    'sum': 'add',
+    'prod': 'multiply',
+    'min': 'minimum',
+    'max': 'maximum',
+    'any': 'logical_or',
+    'all': 'logical_and',
+}
+
+# ndarray methods have the same names as the operators
+operators = tuple(sorted(numpy_functions))
+
+# Expressions combining accumulator 'acc' with element 'value'. Minimum
+# and maximum propagate NaNs, like NumPy.
+_combine_templates = {
+    'sum': "{acc} + {value}",
+    'prod': "{acc} * {value}",
+    'min': "{acc} if {acc} != {acc} or {acc} <= {value} else {value}",
+    'max': "{acc} if {acc} != {acc} or {acc} >= {value} else {value}",
+    'any': "{acc} or {value} != 0",
+    'all': "{acc} and {value} != 0",
+}
+
+#------------------------------------------------------------------------
+# Nodes
+#------------------------------------------------------------------------
+
+class ArrayReductionNode(nodes.ExprNode):
+    """
+    Reduction of an array (expression) with one of the reduction
+    `operators`, of all elements (axis is None) or along a single axis.
+    """
+
+    _fields = ['array']
+
+    def __init__(self, operator, array, axis, **kwargs):
+        super(ArrayReductionNode, self).__init__(**kwargs)
+        self.operator = operator
+        self.array = array
+        self.axis = axis
+
+        array_type = array.variable.type
+        self.dtype = result_dtype(operator, array_type.dtype)
+        if axis is None:
+            self.type = self.dtype
+        else:
+            self.type = typesystem.array(self.dtype, array_type.ndim - 1)
+
+    @property
+    def identity(self):
+        return identity(self.operator, self.dtype)
+
+    def __repr__(self):
+        return "%s(%s, axis=%s)" % (self.operator, self.array, self.axis)
+
+
+class ReductionAccumulatorNode(nodes.ExprNode):
+    """
+    A (stack-allocated) array view of the accumulators of a reduction, with
+    the dimensionality `ndim` of the reduced expression. The reduced
+    dimensions have extent 1 and stride 0.
+
+    Without `out`, this is a single scalar initialized to `identity`.
+    Otherwise `out` is the new result array of a reduction along `axis`,
+    which is filled with `identity`.
+
+    For operators without an identity, `shape` is the shape of the reduced
+    expression, and a ValueError is raised if the reduced dimensions are
+    empty, like in NumPy.
+    """
+
+    _fields = ['out', 'shape', 'check_empty']
+
+    def __init__(self, dtype, ndim, identity, out=None, axis=None,
+                 operator=None, shape=None, **kwargs):
+        super(ReductionAccumulatorNode, self).__init__(**kwargs)
+        self.type = typesystem.array(dtype, ndim)
+        self.identity = identity
+        self.out = out
+        self.axis = axis
+
+        self.shape = None
+        self.check_empty = None
+        if operator is not None and not has_identity(operator):
+            self.shape = shape
+            self.nonempty = nodes.LLVMValueRefNode(int_, None)
+            self.check_empty = nodes.CheckErrorNode(
+                self.nonempty, 0, exc_type=ValueError,
+                exc_msg="zero-size array to reduction operation %s which "
+                        "has no identity" % ufunc_names[operator])
+
+
+class ReducedShapeNode(nodes.ExprNode):
+    """
+    The shape of a reduction along `axis` of an array expression with the
+    given shape (a pointer to `ndim` extents).
+    """
+
+    _fields = ['shape']
+
+    def __init__(self, shape, ndim, axis, **kwargs):
+        super(ReducedShapeNode, self).__init__(**kwargs)
+        self.shape = shape
+        self.ndim = ndim
+        self.axis = axis
+        self.type = npy_intp.pointer()
+
+#------------------------------------------------------------------------
+# Reduction semantics
+#------------------------------------------------------------------------
+
+def result_dtype(operator, dtype):
+    "The dtype of a reduction of elements of type `dtype`"
+    if operator in ('any', 'all'):
+        return bool_
+    elif operator in ('sum', 'prod'):
+        # NumPy accumulates booleans and small integers in a long
+        if dtype.is_bool:
+            return long_
+        elif dtype.is_int and dtype.itemsize < long_.itemsize:
+            return long_ if dtype.signed else ulong
+
+    return dtype
+
+def has_identity(operator):
+    """
+    Whether the reduction of an empty array is defined. The accumulators
+    of the other operators start at a sentinel (see identity()).
+    """
+    return operator not in ('min', 'max')
+
+def identity(operator, dtype):
+    "The initial value of the accumulator"
+    if operator == 'sum':
+        return 0
+    elif operator == 'prod':
+        return 1
+    elif operator in ('any', 'all'):
+        return operator == 'all'
+
+    is_min = operator == 'min'
+    if dtype.is_bool:
+        return is_min
+    elif dtype.is_float:
+        return float('inf') if is_min else float('-inf')
+    else:
+        info = np.iinfo(dtype.get_dtype())
+        return int(info.max if is_min else info.min)
+
+def combine_expr(operator, acc, value):
+    "AST for the expression combining the names `acc` and `value`"
+    source = _combine_templates[operator].format(acc=acc, value=value)
+    return ast.parse(source, mode='eval').body
+
+def build_combine_ast(operator, name):
+    """
+    AST of a function combining two partial results:
+
+        def name(acc, value):
+            return acc + value
+    """
+    args = [ast.Name(id=argname, ctx=ast.Param())
+                for argname in ('acc', 'value')]
+    arguments = ast.arguments(args=args, vararg=None, kwarg=None,
+                              defaults=[])
+    body = [ast.Return(value=combine_expr(operator, 'acc', 'value'))]
+    func = ast.FunctionDef(name=name, args=arguments, body=body,
+                           decorator_list=[])
+    return ast.fix_missing_locations(func)
+
+#------------------------------------------------------------------------
+# Type inference
+#------------------------------------------------------------------------
+
+def is_supported_dtype(dtype):
+    return dtype.is_int or dtype.is_float
+
+def constant_axis(axis, ndim):
+    "Get the normalized constant axis from an AST node, or None"
+    negate = False
+    if (isinstance(axis, ast.UnaryOp) and isinstance(axis.op, ast.USub)):
+        axis, negate = axis.operand, True
+
+    if not (isinstance(axis, nodes.ConstNode) and axis.type.is_int):
+        return None
+
+    value = -axis.pyval if negate else axis.pyval
+    if value < 0:
+        value += ndim
+    if 0 <= value < ndim:
+        return value
+    return None
+
+def reduction_node(operator, a, axis=None, dtype=None, out=None):
+    """
+    Build an ArrayReductionNode for a reduction of AST node `a`, or return
+    None if it is not supported natively (the reduction is then called
+    through NumPy).
+    """
+    array_type = a.variable.type
+    if not array_type.is_array or dtype is not None or out is not None:
+        return None
+    elif not is_supported_dtype(array_type.dtype):
+        return None
+
+    if axis is not None:
+        axis = constant_axis(axis, array_type.ndim)
+        if axis is None:
+            return None
+        elif array_type.ndim == 1:
+            # Reduction of all elements
+            axis = None
+
+    return ArrayReductionNode(operator, a, axis)
@@ -0,0 +1,192 @@
+from numba import *
+import numpy as np
+
+@autojit
+def fused_temporaries(a, b, c, out):
+    t = a * b
+    u = t + c
+    out[:] = u * u
+
+@autojit
+def fused_new_array(a, b):
+    t = a * b
+    return t + t * 2.0
+
+@autojit
+def fused_inplace(a, b, out):
+    t = a * b
+    t += a
+    out[:] += t
+
+@autojit
+def live_temporary(a, b, out):
+    # 't' is used after the fused region and must be materialized
+    t = a * b
+    out[:] = t + 1.0
+    return t
+
+@autojit
+def overlapping_target(a):
+    # The temporary reads 'a' before the assignment writes it
+    t = a[:-1] * 2.0
+    a[1:] = t + 1.0
+
+@autojit
+def broadcasting_temporaries(a, row, out):
+    t = row * 2.0
+    out[:, :] = a + t
+
+@autojit
+def fused_in_loop(a, b, out, n):
+    for i in range(n):
+        t = a * b
+        out[:] = out + t
+
+@autojit
+def subscripted_temporary(a, b, c, out):
+    t = a * b
+    out[:] = t[0] + c
+
+@autojit
+def attribute_temporary(a, b, c, out):
+    t = a * b
+    out[:, :] = t.T + c
+
+@autojit
+def call_temporary(a, b, c, out):
+    t = a * b
+    out[:] = c * len(t)
+
+@autojit
+def temporary_target(a, b):
+    t = a * b
+    t[:] = t + 1.0
+    return t
+
+@autojit
+def aliased_target(a, b, c):
+    t = a * 2.0
+    b[:] = t + c
+
+@autojit
+def reversed_target(a, c):
+    b = a[::-1]
+    t = a * 2.0
+    b[:] = t + c
+
+@autojit
+def allocated_target(a, b, c):
+    out = np.empty_like(a)
+    t = a * b
+    out[:] = t + c
+    return out
+
+def test_fused_temporaries():
+    a = np.arange(10, dtype=np.float64)
+    out, expected = np.empty_like(a), np.empty_like(a)
+    fused_temporaries(a, a, a, out)
+    fused_temporaries.py_func(a, a, a, expected)
+    assert np.all(out == expected)
+
+def test_fused_new_array():
+    a = np.arange(10, dtype=np.float64)
+    assert np.all(fused_new_array(a, a) == fused_new_array.py_func(a, a))
+
+def test_fused_inplace():
+    a = np.arange(10, dtype=np.float64)
+    out, expected = np.ones_like(a), np.ones_like(a)
+    fused_inplace(a, a, out)
+    fused_inplace.py_func(a, a, expected)
+    assert np.all(out == expected)
+
+def test_live_temporary():
+    a = np.arange(10, dtype=np.float64)
+    out, expected = np.empty_like(a), np.empty_like(a)
+    t = live_temporary(a, a, out)
+    expected_t = live_temporary.py_func(a, a, expected)
+    assert np.all(out == expected)
+    assert np.all(t == expected_t)
+
+def test_overlapping_target():
+    a = np.arange(10, dtype=np.float64)
+    expected = a.copy()
+    overlapping_target(a)
+    overlapping_target.py_func(expected)
+    assert np.all(a == expected)
+
+def test_broadcasting_temporaries():
+    a = np.arange(12, dtype=np.float64).reshape(3, 4)
+    row = np.arange(4, dtype=np.float64)
+    out, expected = np.empty_like(a), np.empty_like(a)
+    broadcasting_temporaries(a, row, out)
+    broadcasting_temporaries.py_func(a, row, expected)
+    assert np.all(out == expected)
+
+def test_fused_in_loop():
+    a = np.arange(10, dtype=np.float64)
+    out, expected = np.zeros_like(a), np.zeros_like(a)
+    fused_in_loop(a, a, out, 3)
+    fused_in_loop.py_func(a, a, expected, 3)
+    assert np.all(out == expected)
+
+def test_subscripted_temporary():
+    a = np.arange(10, dtype=np.float64)
+    out, expected = np.empty_like(a), np.empty_like(a)
+    subscripted_temporary(a, a + 1, a, out)
+    subscripted_temporary.py_func(a, a + 1, a, expected)
+    assert np.all(out == expected)
+
+def test_attribute_temporary():
+    a = np.arange(16, dtype=np.float64).reshape(4, 4)
+    out, expected = np.empty_like(a), np.empty_like(a)
+    attribute_temporary(a, a + 1, a, out)
+    attribute_temporary.py_func(a, a + 1, a, expected)
+    assert np.all(out == expected)
+
+def test_call_temporary():
+    a = np.arange(10, dtype=np.float64)
+    out, expected = np.empty_like(a), np.empty_like(a)
+    call_temporary(a, a, a, out)
+    call_temporary.py_func(a, a, a, expected)
+    assert np.all(out == expected)
+
+def test_temporary_target():
+    a = np.arange(10, dtype=np.float64)
+    assert np.all(temporary_target(a, a) == temporary_target.py_func(a, a))
+
+def test_aliased_target():
+    a = np.arange(10, dtype=np.float64)
+    c = np.ones_like(a)
+    expected = a.copy()
+    aliased_target(a, a, c)
+    aliased_target.py_func(expected, expected, c)
+    assert np.all(a == expected)
+
+def test_reversed_target():
+    a = np.arange(10, dtype=np.float64)
+    c = np.ones_like(a)
+    expected = a.copy()
+    reversed_target(a, c)
+    reversed_target.py_func(expected, c)
+    assert np.all(a == expected)
+
+def test_allocated_target():
+    a = np.arange(10, dtype=np.float64)
+    assert np.all(allocated_target(a, a, a) ==
+                  allocated_target.py_func(a, a, a))
+
+if __name__ == "__main__":
+    test_fused_temporaries()
+    test_fused_new_array()
+    test_fused_inplace()
+    test_live_temporary()
+    test_overlapping_target()
+    test_broadcasting_temporaries()
+    test_fused_in_loop()
+    test_subscripted_temporary()
+    test_attribute_temporary()
+    test_call_temporary()
+    test_temporary_target()
+    test_aliased_target()
+    test_reversed_target()
+    test_allocated_target()
@@ -0,0 +1,59 @@
+from numba import *
+import numpy as np
+
+@autojit
+def expr(a, b, c):
+    a[...] = b * c + 2.0
+
+@autojit
+def expr_new(a, b):
+    return a * b - a
+
+def run(a, b, c):
+    "Compare with NumPy on the given operand layouts"
+    result, expected = a.copy(), a.copy()
+    expr(result, b, c)
+    expr.py_func(expected, b, c)
+    assert np.all(result == expected)
+
+def test_contig():
+    a = np.arange(12, dtype=np.float64).reshape(3, 4)
+    run(a, a, a)
+    f = np.asfortranarray(a)
+    run(f, f, f)
+    assert np.all(expr_new(f, f) == expr_new.py_func(f, f))
+
+def test_inner_contig():
+    a = np.arange(48, dtype=np.float64).reshape(6, 8)
+    run(a[::2], a[1::2], a[::2, :])
+    run(a[:, :4], a[:, 4:], a[:, 2:6])
+
+def test_tiled():
+    a = np.arange(100 * 100, dtype=np.float64).reshape(100, 100)
+    run(a, a.T, a)
+    run(a, a, np.asfortranarray(a))
+    run(np.asfortranarray(a), a, a)
+
+def test_strided():
+    a = np.arange(100, dtype=np.float64).reshape(10, 10)
+    run(a[::2, ::3], a[1::2, ::3], a[::2, 1::3])
+    run(a[::-1], a, a[:, ::-1])
+
+def test_broadcasting():
+    a = np.arange(12, dtype=np.float64).reshape(3, 4)
+    run(a, a[0], a[:, :1])
+    run(a, 3.0, a.T.copy().T)
+
+def test_mixed_dtypes():
+    a = np.arange(12, dtype=np.float64).reshape(3, 4)
+    b = np.arange(12, dtype=np.int32).reshape(4, 3).T
+    run(a, b, a)
+    assert np.all(expr_new(a, b) == expr_new.py_func(a, b))
+
+if __name__ == "__main__":
+    test_contig()
+    test_inner_contig()
+    test_tiled()
+    test_strided()
+    test_broadcasting()
+    test_mixed_dtypes()
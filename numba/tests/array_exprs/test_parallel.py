@@ -0,0 +1,108 @@
+import threading
+
+from numba import *
+from numba import environment, parallel
+import numpy as np
+
+def call_parallel(py_func, args, threshold=1):
+    "Compile py_func with parallel array expressions and call it"
+    env = environment.NumbaEnvironment.get_environment()
+    env.enable_parallel(threshold=threshold, num_threads=4)
+    try:
+        numba_func = autojit(py_func)
+        return numba_func, numba_func(*args)
+    finally:
+        env.disable_parallel()
+
+def expr(a, b, c):
+    a[...] = a + b * c
+
+def expr_scalar(a, b, c):
+    a[...] = b * 2.0 + c
+
+def expr_new(a, b):
+    return a * b + 1.0
+
+def run(py_func, *args):
+    "Call the compiled and pure Python function on copies of the arguments"
+    numba_args = [arg.copy() if isinstance(arg, np.ndarray) else arg
+                      for arg in args]
+    numpy_args = [arg.copy() if isinstance(arg, np.ndarray) else arg
+                      for arg in args]
+    numba_func, numba_result = call_parallel(py_func, numba_args)
+    numpy_result = py_func(*numpy_args)
+    assert np.all(numba_args[0] == numpy_args[0])
+    assert np.all(numba_result == numpy_result)
+
+def test_parallel_1d():
+    a = np.arange(1001, dtype=np.float64)
+    run(expr, a, a, a)
+    run(expr_scalar, a, a, 3.0)
+    run(expr_new, a, a)
+
+def test_parallel_2d():
+    a = np.arange(37 * 13, dtype=np.float64).reshape(37, 13)
+    run(expr, a, a, a)
+    run(expr, a, a.T.copy().T, a[::-1])
+    run(expr_new, a, a)
+
+def test_parallel_3d():
+    a = np.arange(7 * 5 * 3, dtype=np.float32).reshape(7, 5, 3)
+    run(expr, a, a, a)
+
+def test_parallel_broadcasting():
+    a = np.arange(37 * 13, dtype=np.float64).reshape(37, 13)
+    row = np.arange(13, dtype=np.float64)
+    column = np.arange(37, dtype=np.float64).reshape(37, 1)
+    run(expr, a, row, column)
+    run(expr, a, row[np.newaxis, :], a)
+
+def test_parallel_slices():
+    a = np.arange(100 * 20, dtype=np.float64).reshape(100, 20)
+    numba_a, numpy_a = a.copy(), a.copy()
+    call_parallel(expr, (numba_a[10:90:3, 1:-1], a[:80:3, 2:], a[20::3, :-2]))
+    expr(numpy_a[10:90:3, 1:-1], a[:80:3, 2:], a[20::3, :-2])
+    assert np.all(numba_a == numpy_a)
+
+def test_threshold():
+    # Below the threshold the kernel runs on the calling thread
+    a = np.arange(100, dtype=np.float64)
+    numba_a = a.copy()
+    call_parallel(expr, (numba_a, a, a), threshold=10 ** 9)
+    expr(a, a, a)
+    assert np.all(numba_a == a)
+
+def test_concurrent_calls():
+    # Regions started while another one runs execute serially
+    a = np.arange(10000, dtype=np.float64)
+    results = [a.copy() for i in range(8)]
+    f, _ = call_parallel(expr, (results[0], a, a))
+    threads = [threading.Thread(target=f, args=(result, a, a))
+                   for result in results[1:]]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    expr(a, a, a)
+    for result in results:
+        assert np.all(result == a)
+
+def test_num_threads():
+    num_threads = parallel.get_num_threads()
+    try:
+        parallel.set_num_threads(3)
+        assert parallel.get_num_threads() == 3
+        run(expr, np.arange(100.0), np.arange(100.0), np.arange(100.0))
+    finally:
+        parallel.set_num_threads(num_threads)
+
+if __name__ == "__main__":
+    test_parallel_1d()
+    test_parallel_2d()
+    test_parallel_3d()
+    test_parallel_broadcasting()
+    test_parallel_slices()
+    test_threshold()
+    test_concurrent_calls()
+    test_num_threads()
@@ -0,0 +1,137 @@
+from numba import *
+from numba import environment
+import numpy as np
+
+@autojit
+def sum_expr(a, b):
+    return (a * b + 1.0).sum()
+
+@autojit
+def numpy_reductions(a, b):
+    return (np.sum(a * b), np.prod(a + 1), np.min(a - b), np.max(a - b),
+            np.any(a > b), np.all(a >= 0))
+
+@autojit
+def method_reductions(a):
+    return a.min(), a.max(), (a > 3).any(), (a > 3).all()
+
+@autojit
+def sum_axis(a, b, axis):
+    if axis == 0:
+        return (a * b).sum(axis=0)
+    elif axis == 1:
+        return (a * b).sum(1)
+    return (a * b).sum(axis=-1)
+
+@autojit
+def fused_reduction(a, b):
+    t = a * b
+    return (t - a).sum()
+
+@autojit
+def nested_reduction(a):
+    return ((a - a.min()) * 2.0).max()
+
+@autojit
+def sliced_reduction(a):
+    return (a[1:] - a[:-1]).max()
+
+@autojit
+def min_expr(a, b):
+    return (a * b).min()
+
+@autojit
+def max_axis(a, b):
+    return (a + b).max(axis=0)
+
+def raises_value_error(func, *args):
+    try:
+        func(*args)
+    except ValueError:
+        return True
+    return False
+
+def test_sum_expr():
+    a = np.arange(100, dtype=np.float64)
+    assert sum_expr(a, a) == sum_expr.py_func(a, a)
+
+    a = np.arange(12, dtype=np.float32).reshape(3, 4)
+    assert np.allclose(sum_expr(a, a), sum_expr.py_func(a, a))
+    assert np.allclose(sum_expr(a.T, a.T), sum_expr.py_func(a.T, a.T))
+
+def test_numpy_reductions():
+    a = np.arange(10, dtype=np.float64) - 3.0
+    b = a[::-1].copy()
+    assert numpy_reductions(a, b) == numpy_reductions.py_func(a, b)
+
+    a = np.arange(10, dtype=np.int32).reshape(2, 5)
+    b = np.ones_like(a)
+    assert numpy_reductions(a, b) == numpy_reductions.py_func(a, b)
+
+def test_method_reductions():
+    a = np.arange(10, dtype=np.int64)
+    assert method_reductions(a) == method_reductions.py_func(a)
+
+def test_nan_propagation():
+    a = np.array([1.0, np.nan, 3.0])
+    assert np.isnan(method_reductions(a)[0])
+    assert np.isnan(method_reductions(a)[1])
+
+def test_sum_axis():
+    a = np.arange(24, dtype=np.float64).reshape(4, 6)
+    for axis in (0, 1, 2):
+        result = sum_axis(a, a, axis)
+        expected = sum_axis.py_func(a, a, axis)
+        assert result.shape == expected.shape
+        assert np.all(result == expected)
+
+def test_fused_reduction():
+    a = np.arange(10, dtype=np.float64)
+    assert fused_reduction(a, a) == fused_reduction.py_func(a, a)
+
+def test_nested_reduction():
+    a = np.arange(10, dtype=np.float64) - 5
+    assert nested_reduction(a) == nested_reduction.py_func(a)
+
+def test_sliced_reduction():
+    a = np.arange(10, dtype=np.float64) ** 2
+    assert sliced_reduction(a) == sliced_reduction.py_func(a)
+
+def test_parallel_reduction():
+    env = environment.NumbaEnvironment.get_environment()
+    env.enable_parallel(threshold=1, num_threads=4)
+    try:
+        a = np.arange(1000 * 7, dtype=np.float64).reshape(1000, 7)
+        sum_expr_parallel = autojit(sum_expr.py_func)
+        assert np.allclose(sum_expr_parallel(a, a), sum_expr.py_func(a, a))
+
+        sum_axis_parallel = autojit(sum_axis.py_func)
+        for axis in (0, 1):
+            assert np.allclose(sum_axis_parallel(a, a, axis),
+                               sum_axis.py_func(a, a, axis))
+    finally:
+        env.disable_parallel()
+
+def test_empty_reduction():
+    empty = np.empty(0, dtype=np.float64)
+    assert sum_expr(empty, empty) == sum_expr.py_func(empty, empty)
+    assert raises_value_error(min_expr.py_func, empty, empty)
+    assert raises_value_error(min_expr, empty, empty)
+
+    empty_rows = np.empty((0, 3), dtype=np.float64)
+    assert raises_value_error(max_axis.py_func, empty_rows, empty_rows)
+    assert raises_value_error(max_axis, empty_rows, empty_rows)
+    empty_cols = np.empty((3, 0), dtype=np.float64)
+    assert max_axis(empty_cols, empty_cols).shape == (0,)
+
+if __name__ == "__main__":
+    test_sum_expr()
+    test_numpy_reductions()
+    test_method_reductions()
+    test_nan_propagation()
+    test_sum_axis()
+    test_fused_reduction()
+    test_nested_reduction()
+    test_sliced_reduction()
+    test_parallel_reduction()
+    test_empty_reduction()
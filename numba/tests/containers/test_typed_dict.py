@@ -0,0 +1,99 @@
+from numba import *
+import numba as nb
+from numba.tests.test_support import autojit_py3doc
+
+@autojit_py3doc
+def setitem(key_type, value_type, n):
+    """
+    >>> setitem(int_, float_, 1000)
+    (1000L, 999.0, 250.0, -1.0)
+    >>> setitem(float_, int_, 1000)
+    (1000L, 999L, 250L, -1L)
+    """
+    tdict = nb.typeddict(key_type, value_type)
+    for i in range(n):
+        tdict[i] = i
+    return len(tdict), tdict[n - 1], tdict.get(250, -1), tdict.get(n, -1)
+
+@autojit_py3doc
+def overwrite(key_type, value_type):
+    """
+    >>> overwrite(int_, int_)
+    (2L, 30L, 20L)
+    """
+    tdict = nb.typeddict(key_type, value_type)
+    tdict[1] = 10
+    tdict[2] = 20
+    tdict[1] = 30
+    return len(tdict), tdict[1], tdict[2]
+
+@autojit_py3doc
+def delete(key_type, value_type, n):
+    """
+    >>> delete(int_, int_, 1000)
+    (500L, False, True)
+    """
+    tdict = nb.typeddict(key_type, value_type)
+    for i in range(n):
+        tdict[i] = i
+    for i in range(0, n, 2):
+        del tdict[i]
+    # Reinsert into deleted slots
+    for i in range(n, n + 10):
+        tdict[i] = i
+        del tdict[i]
+    return len(tdict), 10 in tdict, 11 in tdict
+
+@autojit
+def from_iterable(key_type, value_type, iterable):
+    """
+    >>> from_iterable(int_, float_, {1: 2, 3: 4})
+    {1: 2.0, 3: 4.0}
+    >>> from_iterable(int_, float_, [(1, 2), (3, 4)])
+    {1: 2.0, 3: 4.0}
+    """
+    return nb.typeddict(key_type, value_type, iterable)
+
+@autojit
+def keyerror(key_type, value_type):
+    """
+    >>> keyerror(int_, float_)
+    Traceback (most recent call last):
+        ...
+    KeyError: 2L
+    """
+    tdict = nb.typeddict(key_type, value_type, {1: 2.0})
+    return tdict[2]
+
+@autojit
+def zero_keys(key_type, value_type):
+    """
+    >>> zero_keys(float_, int_)
+    (1L, 2L)
+    """
+    tdict = nb.typeddict(key_type, value_type)
+    tdict[0.0] = 1
+    tdict[-0.0] = 2
+    return len(tdict), tdict[0.0]
+
+def object_keys():
+    """
+    >>> object_keys()
+    True
+    """
+    try:
+        nb.typeddict(object_, int_)
+    except TypeError:
+        return True
+    return False
+
+def test(module):
+    nb.testmod(module, runit=True)
+
+if __name__ == "__main__":
+    import __main__ as module
+else:
+    import test_typed_dict as module
+
+test(module)
+__test__ = {}
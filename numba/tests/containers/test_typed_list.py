@@ -1,5 +1,6 @@
 from numba import *
 import numba as nb
+import numpy as np
 from numba.tests.test_support import autojit_py3doc
 @autojit
 def index(type):
@@ -180,6 +181,71 @@ def test_reverse(type, value):
     tlist.reverse()
     return tlist
 
+@autojit
+def test_extend(type, value):
+    """
+    >>> import numpy as np
+    >>> test_extend(int_, np.arange(5))
+    [0, 1, 2, 3, 4, 0, 1, 2, 3, 4, 0, 1, 2, 3, 4, 0, 1, 2, 3, 4]
+    >>> test_extend(float_, np.arange(3, dtype=np.float32))
+    [0.0, 1.0, 2.0, 0.0, 1.0, 2.0, 0.0, 1.0, 2.0, 0.0, 1.0, 2.0]
+    """
+    tlist = nb.typedlist(type, value)
+    tlist.extend(value)
+    tlist.extend(tlist)
+    return tlist
+
+@autojit
+def test_insert(type, value):
+    """
+    >>> test_insert(int_, range(5))
+    [10, 0, 1, 11, 2, 3, 12, 4, 13]
+    """
+    tlist = nb.typedlist(type, value)
+    tlist.insert(0, 10)
+    tlist.insert(3, 11)
+    tlist.insert(-1, 12)
+    tlist.insert(100, 13)
+    return tlist
+
+@autojit
+def test_remove(type, value):
+    """
+    >>> test_remove(int_, [1, 2, 3, 2, 4])
+    [1, 3, 2]
+    """
+    tlist = nb.typedlist(type, value)
+    tlist.remove(2)
+    tlist.remove(4)
+    return tlist
+
+@autojit
+def test_slice(type, value):
+    """
+    >>> test_slice(int_, range(10))
+    ([2, 3, 4], [9, 7, 5, 3, 1], [])
+    """
+    tlist = nb.typedlist(type, value)
+    return tlist[2:5], tlist[::-2], tlist[20:]
+
+@autojit
+def test_view(type, value):
+    """
+    >>> import numpy as np
+    >>> tlist, view, array = test_view(int_, range(5))
+    >>> view
+    array([  0,   1, 100,   3,   4])
+    >>> np.may_share_memory(view, array)
+    True
+    >>> tlist.append(5)
+    >>> np.asarray(tlist)
+    array([  0,   1, 100,   3,   4,   5])
+    """
+    tlist = nb.typedlist(type, value)
+    view = tlist.view()
+    tlist[2] = 100
+    return tlist, view, np.asarray(tlist)
+
 #@autojit
 #def test_sort(type, value):
 #    """
@@ -1,5 +1,6 @@
 from numba import *
 import numba as nb
+import numpy as np
 
 @autojit
 def test_count(type):
@@ -7,9 +8,18 @@ def test_count(type):
     ttuple = nb.typedtuple(type, [1, 2, 3, 4, 5, 1, 2])
     return ttuple.count(0), ttuple.count(3), ttuple.count(1)
 
+@autojit
+def test_view(type):
+    ttuple = nb.typedtuple(type, [1, 2, 3])
+    return np.asarray(ttuple)
+
 def test(module):
     assert test_count(int_) == (0, 1, 2)
 
+    view = test_view(float_)
+    assert view.tolist() == [1.0, 2.0, 3.0]
+    assert not view.flags.writeable
+
 if __name__ == "__main__":
     import __main__ as module
 else:
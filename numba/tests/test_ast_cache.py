@@ -0,0 +1,28 @@
+import ast
+import unittest
+
+from numba import *
+from numba import functions
+
+def func(a, b):
+    return a + b
+
+class TestASTCache(unittest.TestCase):
+
+    def test_cached_source(self):
+        func_def1 = functions._get_ast(func)
+        self.assertTrue(func in functions._ast_sources)
+
+        func_def2 = functions._get_ast(func)
+        self.assertTrue(func_def1 is not func_def2)
+        self.assertEqual(ast.dump(func_def1, include_attributes=True),
+                         ast.dump(func_def2, include_attributes=True))
+
+    def test_specializations(self):
+        f = autojit(func)
+        self.assertEqual(f(1, 2), 3)
+        self.assertEqual(f(1.0, 2.0), 3.0)
+        self.assertEqual(len(functions._ast_sources[func]), 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+"""
+Test the autojit inline cache: alternate between more argument kinds than
+it has entries, and between types that only differ in dtype, ndim or flags.
+"""
+
+import unittest
+
+import numpy as np
+
+from numba import *
+
+@autojit
+def describe(a, b):
+    return a + b
+
+class TestDispatch(unittest.TestCase):
+
+    def test_polymorphic(self):
+        args = [
+            (1, 2),
+            (1.0, 2.0),
+            (1, 2.0),
+            (np.arange(4, dtype=np.int32), 1),
+            (np.arange(4, dtype=np.float32), 1),
+            (np.arange(4, dtype=np.float64), 1),
+            (np.arange(4, dtype=np.float64).reshape(2, 2), 1),
+            (np.arange(4, dtype=np.float64).reshape(2, 2).T, 1),
+            (np.complex128(1 + 2j), 1),
+        ]
+
+        for i in range(3):
+            for a, b in args:
+                result = describe(a, b)
+                expected = a + b
+                self.assertEqual(type(result), type(expected))
+                if isinstance(expected, np.ndarray):
+                    self.assertEqual(result.dtype, expected.dtype)
+                    self.assertTrue(np.all(result == expected))
+                else:
+                    self.assertEqual(result, expected)
+
+    def test_type_argument(self):
+        # Types are hashed on their value, and bypass the inline cache
+        @autojit
+        def convert(type, value):
+            return type(value)
+
+        self.assertEqual(convert(int_, 2.5), 2)
+        self.assertEqual(convert(double, 2), 2.0)
+        self.assertEqual(convert(int_, 2.5), 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import shutil
+import tempfile
+
+from numba import *
+from numba import autotune, environment, parallel
+import numpy as np
+
+def expr(a, b):
+    a[...] = a * b + 2.0
+
+def tuning_db():
+    tempdir = tempfile.mkdtemp()
+    return tempdir, autotune.TuningDatabase(os.path.join(tempdir, 'db.json'))
+
+def test_database():
+    tempdir, tuning = tuning_db()
+    try:
+        assert tuning.get('blocksize', float64, 2, 64) == 64
+        tuning.set('blocksize', float64, 2, 32)
+        tuning.set('blocksize', np.float32, 3, 128)
+        tuning.save()
+
+        tuning = autotune.TuningDatabase(tuning.path)
+        assert tuning.get('blocksize', 'float64', 2) == 32
+        assert tuning.get('blocksize', float32, 3) == 128
+        assert tuning.get('blocksize', float32, 2) is None
+
+        tuning.enabled = False
+        assert tuning.get('blocksize', float64, 2, 64) == 64
+    finally:
+        shutil.rmtree(tempdir)
+
+def test_parallel_threshold():
+    tempdir, tuning = tuning_db()
+    try:
+        settings = parallel.ParallelSettings()
+        assert settings.get_threshold(tuning, float64, 2) == 65536
+        tuning.set('parallel_threshold', float64, 2, 4096)
+        assert settings.get_threshold(tuning, float64, 2) == 4096
+        settings.threshold = 100
+        assert settings.get_threshold(tuning, float64, 2) == 100
+    finally:
+        shutil.rmtree(tempdir)
+
+def test_tuned_blocksize():
+    env = environment.NumbaEnvironment.get_environment()
+    tuning = env.tuning
+    tempdir, env.tuning = tuning_db()
+    try:
+        a = np.arange(50 * 50, dtype=np.float64).reshape(50, 50)
+        for blocksize in (1, 7, 16):
+            env.tuning.set('blocksize', float64, 2, blocksize)
+            result, expected = a.copy(), a.copy()
+            autojit(autotune._fresh_function(expr))(result, a.T)
+            expr(expected, a.T)
+            assert np.all(result == expected)
+    finally:
+        env.tuning = tuning
+        shutil.rmtree(tempdir)
+
+def test_autotune():
+    env = environment.NumbaEnvironment.get_environment()
+    tuning = env.tuning
+    tempdir, env.tuning = tuning_db()
+    try:
+        autotune.autotune(env, dtypes=[float64], ndims=[1, 2],
+                          blocksizes=(16, 32), size=1024, repeat=1,
+                          min_size=256, max_size=1024)
+        db = autotune.TuningDatabase(env.tuning.path)
+        assert db.get('blocksize', float64, 2) in (16, 32)
+        assert db.get('blocksize', float64, 1) is None
+        assert db.get('parallel_threshold', float64, 1) > 0
+        assert not env.parallel.enabled
+    finally:
+        env.tuning = tuning
+        shutil.rmtree(tempdir)
+
+if __name__ == "__main__":
+    test_database()
+    test_parallel_threshold()
+    test_tuned_blocksize()
+    test_autotune()
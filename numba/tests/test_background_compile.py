@@ -0,0 +1,43 @@
+import unittest
+
+from numba import *
+from numba import background
+
+@autojit(background_compile=True)
+def add(a, b):
+    return a + b
+
+class TestBackgroundCompile(unittest.TestCase):
+
+    def test_fallback_then_compiled(self):
+        compiler = background.get_background_compiler()
+        self.assertTrue(add.background_compiler is compiler)
+
+        fallback_calls = add.fallback_calls
+        self.assertEqual(add(1, 2), 3)
+        self.assertEqual(add.fallback_calls, fallback_calls + 1)
+
+        compiler.wait()
+        self.assertEqual(add(3, 4), 7)
+        self.assertEqual(add.fallback_calls, fallback_calls + 1)
+
+    def test_compile_error(self):
+        @autojit(background_compile=True, nopython=True)
+        def uses_object(a):
+            return object()
+
+        compiler = background.get_background_compiler()
+        failed = compiler.failed
+
+        uses_object(1)
+        compiler.wait()
+        self.assertEqual(compiler.failed, failed + 1)
+
+        # Still runs in the interpreter, and is not resubmitted
+        uses_object(1)
+        compiler.wait()
+        self.assertEqual(uses_object.fallback_calls, 2)
+        self.assertEqual(compiler.failed, failed + 1)
+
+if __name__ == "__main__":
+    unittest.main()
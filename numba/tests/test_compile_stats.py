@@ -0,0 +1,45 @@
+import unittest
+
+from numba import *
+from numba import environment
+
+def square(x):
+    return x * x
+
+class TestCompileStats(unittest.TestCase):
+
+    def setUp(self):
+        self.env = environment.NumbaEnvironment.get_environment()
+        self.stats = self.env.enable_compile_stats()
+        self.stats.clear()
+
+    def tearDown(self):
+        self.env.disable_compile_stats()
+        self.stats.clear()
+
+    def test_stages(self):
+        jit(double(double))(square)
+
+        stages = dict((stage, seconds) for stage, calls, seconds, objects
+                                           in self.stats.by_stage())
+        for stage in ('TypeInfer', 'ControlFlowAnalysis', 'CodeGen',
+                      'LLVMOptimize', 'LLVMLink', 'LLVMCodegen'):
+            self.assertTrue(stage in stages, stage)
+            self.assertTrue(stages[stage] >= 0.0)
+
+        functions = [function for function, calls, seconds, objects
+                                  in self.stats.by_function()]
+        self.assertTrue('square(double)' in functions, functions)
+        self.assertTrue(self.stats.for_function('square(double)'))
+
+        report = self.stats.report()
+        self.assertTrue('Slowest stages' in report)
+        self.assertTrue('square(double)' in report)
+
+    def test_disabled(self):
+        self.env.disable_compile_stats()
+        jit(float_(float_))(square)
+        self.assertEqual(self.stats.records, [])
+
+if __name__ == "__main__":
+    unittest.main()
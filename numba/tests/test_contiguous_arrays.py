@@ -0,0 +1,84 @@
+import unittest
+
+import numpy as np
+
+from numba import *
+from numba import environment
+
+@autojit
+def sum2d(a):
+    result = 0.0
+    for i in range(a.shape[0]):
+        for j in range(a.shape[1]):
+            result += a[i, j] * (i + 1)
+    return result
+
+@autojit
+def scale1d(a, factor):
+    for i in range(a.shape[0]):
+        a[i] = a[i] * factor
+
+@autojit
+def iter_rows(a):
+    result = 0.0
+    i = 0
+    for row in a:
+        i += 1
+        for j in range(row.shape[0]):
+            result += row[j] * i * (j + 1)
+    return result
+
+@autojit
+def index_rows(a):
+    result = 0.0
+    for i in range(a.shape[0]):
+        row = a[i]
+        for j in range(row.shape[0]):
+            result += row[j] * (i + 1) * (j + 1)
+    return result
+
+class TestContiguousArrays(unittest.TestCase):
+
+    def test_types(self):
+        env = environment.NumbaEnvironment.get_environment()
+        from_python = env.context.typemapper.from_python
+
+        a = np.empty((3, 4))
+        self.assertEqual(from_python(a), double[:, ::1])
+        self.assertEqual(from_python(np.asfortranarray(a)), double[::1, :])
+        self.assertEqual(from_python(a[:, ::2]), double[:, :])
+        self.assertEqual(from_python(a[0]), double[::1])
+
+    def test_indexing(self):
+        a = np.arange(30, dtype=np.float64).reshape(5, 6)
+        for array in (a, np.asfortranarray(a), a[::2, 1::2], a.T):
+            expected = sum2d.py_func(array)
+            self.assertEqual(sum2d(array), expected)
+
+    def test_fortran_rows(self):
+        a = np.arange(30, dtype=np.float64).reshape(5, 6)
+        for array in (a, np.asfortranarray(a)):
+            expected = iter_rows.py_func(array)
+            self.assertEqual(iter_rows(array), expected)
+            self.assertEqual(index_rows(array), expected)
+
+    def test_store(self):
+        a = np.arange(10, dtype=np.float64)
+        for array in (a.copy(), a.copy()[::3]):
+            expected = array * 2.0
+            scale1d(array, 2.0)
+            self.assertTrue(np.all(array == expected))
+
+    def test_reassign_strided(self):
+        @autojit
+        def every_other(a):
+            if a.shape[0] > 4:
+                a = a[::2]
+            return a[1]
+
+        a = np.arange(10, dtype=np.float64)
+        self.assertEqual(every_other(a), 2.0)
+        self.assertEqual(every_other(a[:4]), 1.0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from numba import *
+from numba import environment
+
+def add_one(x):
+    return x + 1.0
+
+def sum_array(a):
+    result = 0.0
+    for i in range(a.shape[0]):
+        result += a[i]
+    return result
+
+class TestDiskCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.env = environment.NumbaEnvironment.get_environment()
+        self.disk_cache = self.env.enable_disk_cache(self.cache_dir)
+
+    def tearDown(self):
+        self.env.disable_disk_cache()
+        shutil.rmtree(self.cache_dir)
+
+    def test_store_and_load(self):
+        jfunc = jit(double(double))(add_one)
+        self.assertEqual(jfunc(1.0), 2.0)
+        self.assertEqual(self.disk_cache.stores, 1)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+
+        func_env = self.disk_cache.load(self.env, add_one, (double,))
+        self.assertEqual(self.disk_cache.hits, 1)
+        self.assertEqual(func_env.func_signature, double(double))
+        self.assertEqual(func_env.numba_wrapper_func(2.0), 3.0)
+
+    def test_arrays(self):
+        import numpy as np
+
+        jfunc = autojit(sum_array)
+        a = np.arange(10, dtype=np.double)
+        self.assertEqual(jfunc(a), 45.0)
+
+        argtypes = (double[:],)
+        func_env = self.disk_cache.load(self.env, sum_array, argtypes)
+        self.assertEqual(func_env.numba_wrapper_func(a), 45.0)
+
+    def test_miss(self):
+        def not_compiled(x):
+            return x
+
+        self.assertEqual(
+            self.disk_cache.load(self.env, not_compiled, (double,)), None)
+        self.assertEqual(self.disk_cache.misses, 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+
+import llvm.core as lc
+
+from numba import *
+from numba.codegen import llvmcontext
+
+def make_module():
+    module = lc.Module.new("test_llvmcontext")
+    fty = lc.Type.function(lc.Type.int(), [])
+
+    used = module.add_function(fty, "used_utility")
+    used.linkage = lc.LINKAGE_LINKONCE_ODR
+    lc.Builder.new(used.append_basic_block("entry")).ret(
+        lc.Constant.int(lc.Type.int(), 1))
+
+    unused = module.add_function(fty, "unused_utility")
+    unused.linkage = lc.LINKAGE_LINKONCE_ODR
+    builder = lc.Builder.new(unused.append_basic_block("entry"))
+    builder.ret(builder.call(used, []))
+
+    caller = module.add_function(fty, "caller")
+    builder = lc.Builder.new(caller.append_basic_block("entry"))
+    builder.ret(builder.call(used, []))
+
+    return module
+
+class TestLinking(unittest.TestCase):
+
+    def test_strip_unused_definitions(self):
+        module = make_module()
+        llvmcontext.strip_unused_definitions(module)
+        names = set(f.name for f in module.functions)
+        self.assertEqual(names, set(["used_utility", "caller"]))
+
+    def test_duplicate_definitions(self):
+        context = llvmcontext.LLVMContextManager()
+        lfunc = context.link(make_module().get_function_named("caller"))
+        self.assertTrue(context.is_defined("caller"))
+
+        # Linking a second definition renames it
+        lfunc2 = context.link(make_module().get_function_named("caller"))
+        self.assertNotEqual(lfunc.name, lfunc2.name)
+        self.assertTrue(context.is_defined(lfunc2.name))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import os
+import tempfile
+import unittest
+
+import numba
+from numba import *
+from numba import environment, manifest
+
+@autojit
+def mul(a, b):
+    return a * b
+
+@autojit
+def first(a):
+    return a[0]
+
+class TestManifest(unittest.TestCase):
+
+    def test_dump_and_precompile(self):
+        mul(2, 3)
+        mul(2.0, 3.0)
+
+        fd, filename = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            entries = numba.dump_manifest(filename)
+            loaded = manifest.load_manifest(filename)
+            self.assertEqual(loaded, entries)
+
+            mul_entries = [entry for entry in loaded if entry[1] == 'mul']
+            self.assertEqual(len(mul_entries), 2)
+            self.assertEqual(numba.precompile(mul_entries), 2)
+        finally:
+            os.remove(filename)
+
+    def test_precompile_new_signature(self):
+        env = environment.NumbaEnvironment.get_environment()
+        signature = float32(float32, float32)
+        entries = [(mul.py_func.__module__, 'mul', signature)]
+        self.assertEqual(numba.precompile(entries), 1)
+        self.assertTrue(env.specializations.get_function(
+                            mul.py_func, signature.args, None) is not None)
+
+    def test_unknown_function(self):
+        entries = [(__name__, 'does_not_exist', double(double))]
+        self.assertEqual(numba.precompile(entries), 0)
+
+    def test_stale_entry(self):
+        # 'first' no longer type checks for scalars
+        entries = [(__name__, 'first', double(double)),
+                   (__name__, 'mul', double(double, double))]
+        self.assertEqual(numba.precompile(entries), 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+from numba import *
+from numba.random import native
+import numpy as np
+
+@jit(uint64(uint64[:, :], Py_ssize_t), nopython=True)
+def draw(states, stream):
+    return native.next_uint64(states, stream)
+
+def test_generator():
+    states = native.states(seed=1, nstreams=2)
+    s0, s1 = [int(word) for word in states[0]]
+    for i in range(10):
+        assert draw(states, 0) == (s0 + s1) & native.MASK64
+        s0, s1 = native.next_state(s0, s1)
+    assert tuple(states[0]) == (s0, s1)
+
+    # Stream 1 was not advanced
+    assert tuple(states[1]) == native.jump(*native.seed_state(1))
+
+def test_seeding():
+    a, b = native.states(seed=7, nstreams=3), native.states(seed=7, nstreams=3)
+    assert np.all(a == b)
+    assert len(set(map(tuple, a))) == 3
+    assert np.all(native.split(a[:2], 1) == a[2:])
+    assert not np.all(native.states(seed=8) == a[:1])
+
+def test_distributions():
+    states = native.states(seed=3, nstreams=4)
+    out = np.empty(100000)
+
+    native.fill_uniform(states, 0, out)
+    assert 0.0 <= out.min() and out.max() < 1.0
+    assert abs(out.mean() - 0.5) < 0.01
+
+    native.fill_normal(states, 1, out)
+    assert abs(out.mean()) < 0.02 and abs(out.std() - 1.0) < 0.02
+
+    native.fill_exponential(states, 2, out)
+    assert out.min() >= 0.0 and abs(out.mean() - 1.0) < 0.02
+
+    ints = np.empty(100000, dtype=np.int64)
+    native.fill_integers(states, 3, -5, 5, ints)
+    assert ints.min() == -5 and ints.max() == 4
+
+    # Empty ranges give low
+    native.fill_integers(states, 3, 7, 7, ints)
+    assert np.all(ints == 7)
+    native.fill_integers(states, 3, 7, 2, ints)
+    assert np.all(ints == 7)
+
+def test_fortran_states():
+    states = native.states(seed=5, nstreams=3)
+    fortran = np.asfortranarray(states)
+    expected, out = np.empty(100), np.empty(100)
+    native.fill_uniform(states, 1, expected)
+    native.fill_uniform(fortran, 1, out)
+    assert np.all(out == expected)
+    assert np.all(fortran == states)
+
+def test_deterministic():
+    result = []
+    for i in range(2):
+        out = np.empty(10)
+        native.fill_normal(native.states(seed=11), 0, out)
+        result.append(out)
+    assert np.all(result[0] == result[1])
+
+if __name__ == "__main__":
+    test_generator()
+    test_seeding()
+    test_distributions()
+    test_fortran_states()
+    test_deterministic()
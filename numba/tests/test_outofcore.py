@@ -0,0 +1,116 @@
+import os
+import shutil
+import tempfile
+
+from numba import *
+from numba import outofcore
+from numba.vectorize import vectorize
+import numpy as np
+
+@vectorize([f8(f8, f8), f4(f4, f4)])
+def axpy(a, b):
+    return 2.0 * a + b
+
+@autojit
+def expr(out, a, b):
+    out[...] = a * b + 1.0
+
+def memmap(tempdir, name, data, mode='r'):
+    filename = os.path.join(tempdir, name)
+    data.tofile(filename)
+    return np.memmap(filename, dtype=data.dtype, mode=mode, shape=data.shape)
+
+def test_chunk_rows():
+    out = np.empty((1000, 10), dtype=np.float64)
+    rows = outofcore.chunk_rows(out, [out, out], 8192)
+    # Output chunks start at page boundaries
+    assert (rows * 80) % outofcore.mmap.PAGESIZE == 0
+    assert outofcore.chunk_rows(out[:, ::2], [out], 1) == 1
+
+    # Page aligned chunks of wide rows would exceed chunk_bytes
+    wide = np.empty((4, 1000001), dtype=np.float64)
+    rows = outofcore.chunk_rows(wide, [wide], 1 << 24)
+    assert rows == 2
+
+def test_stream_ufunc():
+    tempdir = tempfile.mkdtemp()
+    try:
+        a = np.arange(100000, dtype=np.float64)
+        b = np.ones(100000, dtype=np.float64)
+        ma, mb = memmap(tempdir, 'a', a), memmap(tempdir, 'b', b)
+
+        out = outofcore.stream_ufunc(axpy, [ma, mb],
+                                     out=os.path.join(tempdir, 'out'),
+                                     chunk_bytes=16384)
+        assert isinstance(out, np.memmap)
+        assert out.dtype == np.float64
+        assert np.all(out == 2.0 * a + b)
+
+        # Broadcasting, no prefetching, in-memory output
+        result = outofcore.stream_ufunc(np.add, [ma, 1.0], prefetch=False,
+                                        chunk_bytes=4096)
+        assert np.all(result == a + 1.0)
+    finally:
+        shutil.rmtree(tempdir)
+
+def test_stream_kernel():
+    tempdir = tempfile.mkdtemp()
+    try:
+        a = np.arange(20000, dtype=np.float32).reshape(2000, 10)
+        b = np.arange(10, dtype=np.float32)
+        out = memmap(tempdir, 'out', np.zeros_like(a), mode='w+')
+
+        outofcore.stream(expr, out, [memmap(tempdir, 'a', a), b],
+                         chunk_bytes=8192)
+        out.flush()
+        assert np.allclose(out, a * b + 1.0)
+    finally:
+        shutil.rmtree(tempdir)
+
+def test_derived_memmap():
+    tempdir = tempfile.mkdtemp()
+    try:
+        a = np.arange(20000, dtype=np.float64)
+        ma = memmap(tempdir, 'a', a)
+        # np.memmap instances on the heap, without a file mapping
+        derived = (ma * 2.0).view(np.memmap)
+        out = np.zeros_like(a).view(np.memmap)
+        assert not outofcore._is_memmap(derived, dirty=False)
+        assert not outofcore._is_memmap(out, dirty=True)
+        assert outofcore._is_memmap(ma, dirty=False)
+
+        outofcore.stream_ufunc(axpy, [derived, ma], out=out,
+                               chunk_bytes=8192)
+        assert np.all(derived == 2.0 * a)
+        assert np.all(out == 5.0 * a)
+    finally:
+        shutil.rmtree(tempdir)
+
+def test_fortran_memmap():
+    tempdir = tempfile.mkdtemp()
+    try:
+        a = np.arange(20000, dtype=np.float64).reshape(2000, 10)
+        a = np.asfortranarray(a)
+        filename = os.path.join(tempdir, 'a')
+        a.T.tofile(filename)
+        ma = np.memmap(filename, dtype=a.dtype, mode='r', shape=a.shape,
+                       order='F')
+        assert np.all(ma == a)
+
+        # Chunks of rows span all of the mapping
+        assert outofcore._byte_bounds([ma[:100]]) == []
+        c = np.ascontiguousarray(a)
+        assert len(outofcore._byte_bounds([c[:100]])) == 1
+
+        out = np.empty(a.shape, dtype=a.dtype)
+        outofcore.stream_ufunc(axpy, [ma, 1.0], out=out, chunk_bytes=8192)
+        assert np.all(out == 2.0 * a + 1.0)
+    finally:
+        shutil.rmtree(tempdir)
+
+if __name__ == "__main__":
+    test_chunk_rows()
+    test_stream_ufunc()
+    test_stream_kernel()
+    test_derived_memmap()
+    test_fortran_memmap()
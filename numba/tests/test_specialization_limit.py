@@ -0,0 +1,55 @@
+import unittest
+
+import numpy as np
+
+from numba import *
+from numba import environment
+
+def add_one(a):
+    return a + 1
+
+class TestSpecializationLimit(unittest.TestCase):
+
+    def setUp(self):
+        self.env = environment.NumbaEnvironment.get_environment()
+        self.cache = self.env.specializations
+
+    def tearDown(self):
+        self.env.limit_specializations(track_code_size=False)
+
+    def test_function_limit(self):
+        func = autojit(max_specializations=2)(add_one)
+        evicted = self.cache.num_evicted
+
+        for dtype in (np.int32, np.int64, np.float32, np.float64):
+            a = np.arange(10, dtype=dtype)
+            self.assertTrue(np.all(func(a) == a + 1))
+
+        self.assertEqual(self.cache.num_evicted - evicted, 2)
+
+        # Evicted specializations are recompiled
+        a = np.arange(10, dtype=np.int32)
+        self.assertTrue(np.all(func(a) == a + 1))
+
+    def test_stats(self):
+        self.env.limit_specializations(track_code_size=True)
+        before = self.cache.stats()
+        jit(double(double))(add_one)
+        after = self.cache.stats()
+        self.assertEqual(after.resident, before.resident + 1)
+        self.assertTrue(after.code_size > before.code_size)
+
+    def test_release(self):
+        self.env.limit_specializations(function_limit=1)
+        released = self.cache.num_released
+
+        func = autojit(add_one)
+        self.assertEqual(func(1), 2)
+        self.assertEqual(func(1.0), 2.0)
+
+        self.cache.release_evicted()
+        self.assertEqual(self.cache.num_released - released, 1)
+        self.assertEqual(func(1), 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+
+from numba import *
+from numba import environment, background
+
+def add(a, b):
+    return a + b
+
+def sub(a, b):
+    return a - b
+
+class TestTieredCompilation(unittest.TestCase):
+
+    def setUp(self):
+        self.env = environment.NumbaEnvironment.get_environment()
+        self.tiering = self.env.enable_tiered_compilation(threshold=10)
+
+    def tearDown(self):
+        self.env.disable_tiered_compilation()
+
+    def test_reoptimize(self):
+        func = jit(double(double, double))(add)
+        tier = self.tiering.specializations[-1]
+        self.assertEqual(tier.func_env.func, add)
+
+        for i in range(20):
+            self.assertEqual(func(i, 2.0), i + 2.0)
+
+        background.get_background_compiler().wait()
+        self.assertTrue(tier.optimized)
+        self.assertTrue(tier.calls >= 10)
+        self.assertEqual(func(1.0, 2.0), 3.0)
+        self.assertNotIn(tier, self.tiering.specializations)
+        self.assertTrue(self.tiering.num_optimized >= 1)
+
+    def test_evict(self):
+        jit(double(double, double))(sub)
+        tier = self.tiering.specializations[-1]
+        self.assertEqual(tier.func_env.func, sub)
+
+        specializations = self.env.specializations
+        specializations.set_function_limit(sub, 0)
+        try:
+            self.assertNotIn(tier, self.tiering.specializations)
+            self.assertTrue(tier.module is None and tier.func_env is None)
+        finally:
+            specializations.set_function_limit(sub, None)
+
+    def test_disabled(self):
+        self.env.disable_tiered_compilation()
+        n = len(self.tiering.specializations)
+        jit(int_(int_, int_))(add)
+        self.assertEqual(len(self.tiering.specializations), n)
+
+if __name__ == "__main__":
+    unittest.main()
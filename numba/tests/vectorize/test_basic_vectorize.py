@@ -52,5 +52,12 @@ class TestBasicVectorize(unittest.TestCase):
     def test_uint32(self):
         self._test(np.uint32)
 
+    def test_strided(self):
+        # Mixed contiguous and strided operands take the strided loop
+        data = np.arange(1000, dtype=np.float64)
+        for a, b in [(data[::2], data[1::2]), (data[:500], data[::2]),
+                     (data.reshape(10, 100).T, data[:100])]:
+            self.assertTrue(np.all(self.basic_ufunc(a, b) == a + b))
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,59 @@
+import numpy as np
+from numba import f8
+from numba.vectorize import Vectorize, vectorize
+import unittest
+
+@vectorize()
+def add(a, b):
+    return a + b
+
+@vectorize([f8(f8)], dynamic=True)
+def square(x):
+    return x * x
+
+@vectorize(target='parallel', chunksize=16)
+def parallel_add(a, b):
+    return a + b
+
+def sub(a, b):
+    return a - b
+
+class TestDynamicVectorize(unittest.TestCase):
+    def test_new_dtypes(self):
+        for dtype in (np.int8, np.int16, np.int32, np.int64, np.uint16,
+                      np.float32, np.float64):
+            a = np.arange(50, dtype=dtype)
+            self.assertTrue(np.all(add(a, a) == a + a))
+
+    def test_mixed_dtypes(self):
+        a = np.arange(10, dtype=np.int32)
+        b = np.arange(10, dtype=np.float32) / 2
+        self.assertTrue(np.allclose(add(a, b), a + b))
+        self.assertTrue(np.allclose(add(b, a), b + a))
+        self.assertTrue(np.allclose(add(a, 2.5), a + 2.5))
+
+    def test_loop_order(self):
+        a = np.arange(10, dtype=np.float64)
+        i = np.arange(10, dtype=np.int32)
+        self.assertTrue(np.all(square(a) == a * a))
+        # A new integer loop is selected before the float64 loop
+        self.assertEqual(square(i).dtype.kind, 'i')
+        self.assertTrue(np.all(square(i) == i * i))
+        self.assertEqual(square(a).dtype, np.float64)
+
+    def test_vectorizer(self):
+        v = Vectorize(sub)
+        ufunc = v.build_dynamic_ufunc()
+        a = np.arange(10, dtype=np.int16)
+        self.assertTrue(np.all(ufunc(a, a[::-1]) == a - a[::-1]))
+        self.assertEqual(ufunc.nin, 2)
+
+    def test_parallel(self):
+        a = np.arange(1000, dtype=np.float32)
+        self.assertTrue(np.all(parallel_add(a, a) == a + a))
+
+    def test_unsupported(self):
+        self.assertRaises(TypeError, add, np.array(['a']), np.array(['b']))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import numpy as np
+from numba import void, int32, float32, float64, f8
+from numba.vectorize import GUVectorize, guvectorize
+from numba.vectorize.gufunc import parse_layout
+import unittest
+
+def matmul(a, b, out):
+    m, n = a.shape
+    p = b.shape[1]
+    for i in range(m):
+        for j in range(p):
+            out[i, j] = 0
+            for k in range(n):
+                out[i, j] += a[i, k] * b[k, j]
+
+@guvectorize([void(f8[:], f8[:], f8[:])], '(n),(n)->()')
+def dot(a, b, out):
+    acc = 0.0
+    for i in range(a.shape[0]):
+        acc += a[i] * b[i]
+    out[0] = acc
+
+@guvectorize([void(f8[:], int32, f8[:])], '(n),()->(n)')
+def moving_sum(a, window, out):
+    acc = 0.0
+    for i in range(a.shape[0]):
+        acc += a[i]
+        if i >= window:
+            acc -= a[i - window]
+        out[i] = acc
+
+@guvectorize([void(f8[:], f8[:])], '(n)->(n)')
+def normalize(a, out):
+    total = 0.0
+    for i in range(a.shape[0]):
+        total += a[i]
+    for i in range(a.shape[0]):
+        out[i] = a[i] / total
+
+class TestGUVectorize(unittest.TestCase):
+    def test_parse_layout(self):
+        self.assertEqual(parse_layout('(m,n),(n,p)->(m,p)'),
+                         ([('m', 'n'), ('n', 'p')], [('m', 'p')]))
+        self.assertEqual(parse_layout('(n), () -> ()'),
+                         ([('n',), ()], [()]))
+        self.assertRaises(ValueError, parse_layout, '(m,n)')
+
+    def test_matmul(self):
+        gv = GUVectorize(matmul, '(m,n),(n,p)->(m,p)')
+        gv.add(argtypes=[float32[:, :], float32[:, :], float32[:, :]])
+        gv.add(argtypes=[float64[:, :], float64[:, :], float64[:, :]])
+        gufunc = gv.build_ufunc()
+
+        for dtype in (np.float32, np.float64):
+            a = np.arange(10 * 2 * 4, dtype=dtype).reshape(10, 2, 4)
+            b = np.arange(10 * 4 * 5, dtype=dtype).reshape(10, 4, 5)
+            expected = np.array([np.dot(x, y) for x, y in zip(a, b)])
+            self.assertTrue(np.allclose(gufunc(a, b), expected))
+
+            # Broadcast the second operand, non-contiguous first operand
+            self.assertTrue(np.allclose(gufunc(a[:, :, ::2], b[0, ::2]),
+                                        [np.dot(x, b[0, ::2])
+                                            for x in a[:, :, ::2]]))
+
+    def test_dot(self):
+        a = np.arange(60, dtype=np.float64).reshape(12, 5)
+        b = np.arange(5, dtype=np.float64)
+        self.assertTrue(np.all(dot(a, b) == np.dot(a, b)))
+        self.assertTrue(np.all(dot(a, a) == (a * a).sum(axis=1)))
+
+    def test_moving_sum(self):
+        a = np.arange(20, dtype=np.float64).reshape(2, 10)
+        result = moving_sum(a, 3)
+        for row, a_row in zip(result, a):
+            for i in range(10):
+                self.assertEqual(row[i], a_row[max(0, i - 2):i + 1].sum())
+
+    def test_normalize(self):
+        a = np.arange(1, 13, dtype=np.float64).reshape(3, 4)
+        out = np.empty_like(a)
+        normalize(a, out)
+        self.assertTrue(np.allclose(out, a / a.sum(axis=1)[:, np.newaxis]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import numpy as np
+from numba import int32, float32, float64, f8
+from numba import parallel
+from numba.vectorize import Vectorize, vectorize
+import unittest
+
+def vector_add(a, b):
+    return a + b
+
+@vectorize([f8(f8, f8)], target='parallel', chunksize=16)
+def axpy(a, b):
+    return 2.0 * a + b
+
+class TestParallelVectorize(unittest.TestCase):
+    def setUp(self):
+        pv = Vectorize(vector_add, backend='ast', target='parallel',
+                       chunksize=64)
+        pv.add(restype=int32,   argtypes=[int32,   int32])
+        pv.add(restype=float32, argtypes=[float32, float32])
+        pv.add(restype=float64, argtypes=[float64, float64])
+        self.parallel_ufunc = pv.build_ufunc()
+        self.num_threads = parallel.get_num_threads()
+        parallel.set_num_threads(4)
+
+    def tearDown(self):
+        parallel.set_num_threads(self.num_threads)
+
+    def _test(self, ty):
+        data = np.linspace(0., 10000., 100001).astype(ty)
+        result = self.parallel_ufunc(data, data)
+        self.assertTrue(np.all(result == np.add(data, data)))
+
+        # Strided operands
+        result = self.parallel_ufunc(data[::3], data[1::3])
+        self.assertTrue(np.all(result == np.add(data[::3], data[1::3])))
+
+    def test_double(self):
+        self._test(np.double)
+
+    def test_float(self):
+        self._test(np.float32)
+
+    def test_int32(self):
+        self._test(np.int32)
+
+    def test_small(self):
+        for n in (0, 1, 63, 65):
+            data = np.arange(n, dtype=np.float64)
+            self.assertTrue(np.all(self.parallel_ufunc(data, data) ==
+                                   data + data))
+
+    def test_broadcasting(self):
+        a = np.arange(1000 * 300, dtype=np.float64).reshape(1000, 300)
+        b = np.arange(300, dtype=np.float64)
+        self.assertTrue(np.all(self.parallel_ufunc(a, b) == a + b))
+        self.assertTrue(np.all(self.parallel_ufunc(a.T, 1.5) == a.T + 1.5))
+        self.assertTrue(np.all(axpy(a, b[:, np.newaxis, np.newaxis]) ==
+                               2.0 * a + b[:, np.newaxis, np.newaxis]))
+
+    def test_out(self):
+        a = np.arange(10000, dtype=np.float64)
+        out = np.empty_like(a)
+        axpy(a, a, out)
+        self.assertTrue(np.all(out == 3.0 * a))
+
+    def test_reduce(self):
+        a = np.arange(100000, dtype=np.float64)
+        self.assertEqual(self.parallel_ufunc.reduce(a), np.add.reduce(a))
+        b = a.reshape(1000, 100)
+        self.assertTrue(np.all(self.parallel_ufunc.reduce(b, axis=0) ==
+                               np.add.reduce(b, axis=0)))
+
+    def test_accumulate(self):
+        a = np.arange(100000, dtype=np.float64)
+        self.assertTrue(np.all(self.parallel_ufunc.accumulate(a) ==
+                               np.add.accumulate(a)))
+
+    def test_inplace(self):
+        a = np.arange(10000, dtype=np.float64)
+        self.parallel_ufunc(a, a, a)
+        self.assertTrue(np.all(a == 2.0 * np.arange(10000)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+Tiered compilation.
+
+With tiered compilation enabled, new specializations are optimized at a
+low LLVM optimization level, and their Python wrapper counts the calls.
+When the count reaches a threshold, the specialization is re-optimized at
+the full optimization level on the background compiler thread
+(numba.background). The new code is then swapped into the existing
+NumbaFunction, so that @jit functions, AutojitFunctionCache entries and
+the FunctionCache all pick it up.
+
+    env = NumbaEnvironment.get_environment()
+    env.enable_tiered_compilation(threshold=1000)
+
+Setting NUMBA_TIERED_THRESHOLD=<calls> enables it for the default
+environment.
+
+Only the IR optimization passes are tiered. The code generator of the
+execution engine runs at a single level for all code.
+
+Native calls from other numba functions that were compiled against the
+low tier keep calling the low tier. Otherwise, the code of the low tier is
+freed once the NumbaFunction is no longer referenced, after it was
+re-optimized or evicted from the FunctionCache (see
+FunctionCache.release_evicted).
+"""
+from __future__ import print_function, division, absolute_import
+
+import ctypes
+import logging
+
+from numba import background, functions
+
+logger = logging.getLogger(__name__)
+
+callback_type = ctypes.PYFUNCTYPE(None)
+
+class TieredCompilation(object):
+    """
+    Tiered compilation settings for an environment.
+
+        enabled: whether new specializations start in the low tier
+        threshold: number of calls after which to re-optimize
+        low_opt: LLVM optimization level of the low tier
+        high_opt: LLVM optimization level for hot specializations
+    """
+
+    def __init__(self, enabled=False, threshold=1000, low_opt=0, high_opt=3):
+        self.enabled = enabled
+        self.threshold = threshold
+        self.low_opt = low_opt
+        self.high_opt = high_opt
+
+        # Specializations in the low tier
+        self.specializations = []
+        self.num_optimized = 0
+
+    def is_eligible(self, env, func_env):
+        return (self.enabled and func_env.link and func_env.wrap and
+                not func_env.is_closure and not env.translation.is_pycc)
+
+    def new_specialization(self, env, func_env):
+        """
+        Create a TieredSpecialization for a function module that has not
+        been optimized yet.
+        """
+        tiered_spec = TieredSpecialization(self, env, func_env)
+        self.specializations.append(tiered_spec)
+        return tiered_spec
+
+    def remove(self, tiered_spec):
+        "Remove a specialization that left the low tier"
+        if tiered_spec in self.specializations:
+            self.specializations.remove(tiered_spec)
+
+class TieredSpecialization(object):
+    """
+    A specialization compiled in the low tier, which keeps an unoptimized
+    copy of its module to re-optimize once it is hot.
+    """
+
+    def __init__(self, tiering, env, func_env):
+        self.tiering = tiering
+        self.env = env
+        self.func_env = func_env
+        self.name = func_env.lfunc.name
+        self.module = func_env.lfunc.module.clone()
+
+        self.counter = ctypes.c_ssize_t(0)
+        self.callback = callback_type(self.request_reoptimize)
+        self.methoddef = None
+        self.submitted = False
+        self.optimized = False
+
+    @property
+    def calls(self):
+        return self.counter.value
+
+    @property
+    def call_counter(self):
+        """
+        (counter address, threshold, callback address) for the wrapper
+        function (see LLVMCodeGenerator.visit_FunctionWrapperNode)
+        """
+        return (ctypes.addressof(self.counter),
+                self.tiering.threshold,
+                ctypes.cast(self.callback, ctypes.c_void_p).value)
+
+    def set_wrapper(self, methoddef):
+        "Set the PyMethodDef of the NumbaFunction to swap the code in"
+        self.methoddef = methoddef
+
+    def drop(self):
+        """
+        Leave the low tier without re-optimizing, e.g. when the
+        specialization is evicted. The evicted Specialization keeps the
+        counter and callback alive for the low tier wrapper.
+        """
+        self.submitted = True
+        self.module = None
+        self.tiering.remove(self)
+        self.env = self.func_env = None
+
+    def request_reoptimize(self):
+        "Called by the wrapper function when the threshold is reached"
+        if not self.submitted:
+            self.submitted = True
+            compiler = background.get_background_compiler()
+            compiler.submit_job(self.reoptimize)
+
+    def reoptimize(self):
+        from numba.codegen import llvmwrapper
+
+        with background.compile_lock:
+            if self.func_env is None:
+                # Dropped while the job was queued
+                return
+
+            env = self.env
+            func_env = self.func_env
+            low_lfunc = func_env.lfunc
+            low_wrapper = func_env.llvm_wrapper_func
+
+            lfunc = self.module.get_function_named(self.name)
+            lfunc.name = "%s_tier2" % self.name
+
+            env.llvm_context.optimize(self.module, opt=self.tiering.high_opt)
+            lfunc = env.llvm_context.link(lfunc, optimize=False)
+            self.module = None
+
+            # Build a wrapper for the optimized function, without counter
+            func_env.lfunc = lfunc
+            func_env.lfunc_pointer = env.llvm_context.get_pointer_to_function(
+                                                                        lfunc)
+            func_env.tier = None
+            env.translation.push_env(func_env)
+            try:
+                t = llvmwrapper.build_wrapper_translation(env)
+            finally:
+                env.translation.pop()
+
+            wrapper_pointer = t.lfunc_pointer
+            functions.keep_alive(func_env.func, t.lfunc)
+
+            # Swap the code of the existing NumbaFunction
+            self.methoddef.method = ctypes.c_void_p(wrapper_pointer)
+            numba_wrapper = func_env.numba_wrapper_func
+            numba_wrapper.lfunc = lfunc
+            func_env.llvm_wrapper_func = t.lfunc
+            env.specializations.register_specialization(func_env)
+
+            # Calls may still run in the low tier (and use the counter and
+            # callback), free it with the NumbaFunction
+            env.specializations.retire(numba_wrapper, low_wrapper, low_lfunc,
+                                       live_objects=[self])
+            self.tiering.remove(self)
+            self.tiering.num_optimized += 1
+
+        self.optimized = True
+        logger.debug("Re-optimized %s after %d calls", func_env.func_name,
+                     self.calls)
+
+        # Don't keep the NumbaFunction alive, so that it can be evicted
+        self.env = self.func_env = None
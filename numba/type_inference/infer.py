@@ -23,6 +23,7 @@ from numba.typesystem.ssatypes import kosaraju_strongly_connected
 from numba.symtab import Variable
 from numba import closures as closures
 from numba.support import numpy_support
+from numba.support.numpy_support import reductions
 
 from numba.typesystem import is_obj, promote_closest, get_type
 from numba.utils import dump
@@ -1226,8 +1227,28 @@ class TypeInferer(visitors.NumbaTransformer):
 
         return new_node
 
+    def _resolve_array_method(self, func_type, node):
+        "Resolve reductions of arrays, e.g. a.sum(axis=0)"
+        argnames = ['axis', 'dtype', 'out']
+        keywords = [keyword.arg for keyword in node.keywords]
+        if len(node.args) <= len(argnames) and set(keywords) <= set(argnames):
+            kwargs = module_type_inference.parse_args(node, argnames)
+            new_node = reductions.reduction_node(func_type.attr_name,
+                                                 node.func.value, **kwargs)
+            if new_node is not None:
+                return new_node
+
+        # Call the method of the array object
+        node.func.value = nodes.CoercionNode(node.func.value, object_)
+        node.func.variable = Variable(object_)
+        return nodes.call_obj(node, None)
+
     def _resolve_method_calls(self, func_type, new_node, node):
         "Resolve special method calls"
+        if func_type.base_type.is_array:
+            return self._resolve_array_method(func_type, node)
+
+        no_keywords(node)
         if ((func_type.base_type.is_complex or
              func_type.base_type.is_float) and
             func_type.attr_name == 'conjugate'):
@@ -1302,7 +1323,6 @@ class TypeInferer(visitors.NumbaTransformer):
                             skip_self=True)
         elif func_type.is_method:
             # Call to special object method
-            no_keywords(node)
             new_node = self._resolve_method_calls(func_type, new_node, node)
 
         elif func_type.is_closure:
@@ -1472,6 +1492,9 @@ class TypeInferer(visitors.NumbaTransformer):
         elif type.is_array and node.attr == "dtype":
             # TODO: resolve as constant at compile time?
             result_type = typesystem.dtype(type.dtype)
+        elif type.is_array and node.attr in reductions.operators:
+            # a.sum(), a.max(axis=0), etc
+            result_type = typesystem.MethodType(type, node.attr)
         elif type.is_extension:
             return self._resolve_extension_attribute(node, type)
         else:
@@ -9,6 +9,7 @@ import numpy as np
 from numba import *
 from numba.minivect import minitypes
 from numba import typesystem
+from numba.support.numpy_support import reductions
 from numba.type_inference.module_type_inference import (module_registry,
                                                         register,
                                                         register_inferer,
@@ -166,6 +167,26 @@ def reduce_(a, axis, dtype, out, static_dtype=None):
 def reduce_bool(a, axis, dtype, out):
     return reduce_(a, axis, dtype, out, bool_)
 
+def reduction(operator, static_dtype=None):
+    """
+    Type function for np.sum() etc. Reductions of arrays are compiled
+    natively (see numba.support.numpy_support.reductions), other calls
+    go through NumPy.
+    """
+    def infer(a, axis, dtype, out, **kwargs):
+        if kwargs:
+            # e.g. keepdims
+            return object_
+
+        result = reductions.reduction_node(operator, a, axis, dtype, out)
+        if result is None:
+            types = [node and get_type(node) for node in (a, axis, dtype, out)]
+            result = reduce_(*types, static_dtype=static_dtype)
+
+        return result
+
+    return infer
+
 def accumulate(a, axis, dtype, out, static_dtype=None):
     return demote_to_scalar(array_of_dtype(a, dtype, static_dtype, out))
 
@@ -233,8 +254,11 @@ if not PY3:
 # Register our type functions
 #------------------------------------------------------------------------
 
-register_inferer(np, 'sum', reduce_)
-register_inferer(np, 'prod', reduce_)
+for operator, numpy_func in reductions.numpy_functions.items():
+    static_dtype = bool_ if operator in ('any', 'all') else None
+    register_inferer(np, numpy_func.__name__,
+                     reduction(operator, static_dtype),
+                     pass_in_types=False)
 
 def register_arithmetic_ufunc(register_inferer, register_unbound, binary_ufunc):
     register_inferer(np, binary_ufunc, binary_map)
@@ -733,6 +733,8 @@ def promote_arrays(array_types, non_array_types, types,
     result_type = array_types[0].strided
 
     def assert_equal(other_type):
+        if other_type.is_array:
+            other_type = other_type.strided
         if result_type != other_type:
             raise TypeError(
                 "Arrays must have consistent types in assignment "
@@ -74,9 +74,10 @@ class NumbaTypeMapper(minitypes.TypeMapper):
 
         if isinstance(value, np.ndarray):
             dtype = map_dtype(value.dtype)
-            return minitypes.ArrayType(dtype, value.ndim) #,
-                                       #is_c_contig=value.flags['C_CONTIGUOUS'],
-                                       #is_f_contig=value.flags['F_CONTIGUOUS'])
+            flags = value.flags
+            return minitypes.ArrayType(dtype, value.ndim,
+                                       is_c_contig=flags.c_contiguous,
+                                       is_f_contig=flags.f_contiguous)
         elif isinstance(value, np.dtype):
             return numba.typesystem.from_numpy_dtype(value)
         elif is_dtype_constructor(value):
@@ -47,6 +47,10 @@ def index_type(type):
         result.ndim -= 1
         if result.ndim == 0:
             result = result.dtype
+        elif type.is_f_contig and not type.is_c_contig:
+            # The rows of a Fortran array are strided by shape[0]
+            result.is_f_contig = False
+            result.inner_contig = False
     elif type.is_container or type.is_pointer:
         result = type.base_type
     elif type.is_dict:
@@ -16,6 +16,10 @@ class UFuncBuilder(object):
     def __init__(self, *args, **kwargs):
         super(UFuncBuilder, self).__init__(*args, **kwargs)
         self.operands = []
+        # Variables computed inside the kernel: Variable -> local name
+        self.temporaries = {}
+        self.assignments = []
+        self.accumulator = None
 
     def register_operand(self, node):
         """
@@ -36,17 +40,59 @@ class UFuncBuilder(object):
         self.operands.append(node)
         return result
 
+    def register_temporary(self, variable, tree):
+        """
+        Assign a converted sub-expression to a local variable of the kernel,
+        for array temporaries of fused array expressions. References to
+        `variable` then refer to the local instead of an operand:
+
+            t = a + b
+            c[:] = t * t
+
+        ->
+
+            f(arg1, arg2):
+                temp0 = arg1 + arg2
+                return temp0 * temp0
+        """
+        name = 'temp%d' % len(self.temporaries)
+        self.temporaries[variable] = name
+        target = ast.Name(id=name, ctx=ast.Store())
+        self.assignments.append(ast.Assign(targets=[target], value=tree))
+
+    def register_accumulator(self, tree, combine):
+        """
+        Combine the converted expression with the accumulator of a
+        reduction, which is passed in as the first argument. `combine`
+        builds the expression from the names of the accumulator and the
+        element:
+
+            (a * b).sum()
+
+        ->
+
+            f(acc, arg1, arg2):
+                value = arg1 * arg2
+                return acc + value
+        """
+        self.accumulator = 'acc'
+        target = ast.Name(id='value', ctx=ast.Store())
+        self.assignments.append(ast.Assign(targets=[target], value=tree))
+        return combine(self.accumulator, 'value')
+
     def build_ufunc_ast(self, tree):
         args = [ast.Name(id='op%d' % i, ctx=ast.Param())
                     for i, op in enumerate(self.operands)]
+        if self.accumulator:
+            args.insert(0, ast.Name(id=self.accumulator, ctx=ast.Param()))
         arguments = ast.arguments(args=args,
                                   vararg=None,
                                   kwarg=None,
                                   defaults=[],
         )
-        body = ast.Return(value=tree)
+        body = self.assignments + [ast.Return(value=tree)]
         func = ast.FunctionDef(name='ufunc%d' % self.ufunc_counter,
-                               args=arguments, body=[body], decorator_list=[])
+                               args=arguments, body=body, decorator_list=[])
         UFuncBuilder.ufunc_counter += 1
         # print ast.dump(func)
         return func
@@ -122,6 +168,15 @@ class UFuncConverter(UFuncBuilder, ast.NodeVisitor):
     def visit_CoercionNode(self, node):
         return self.visit(node.node)
 
+    def visit_Name(self, node):
+        variable = getattr(node, 'variable', None)
+        if variable not in self.temporaries:
+            return self.generic_visit(node)
+
+        result = ast.Name(id=self.temporaries[variable], ctx=ast.Load())
+        result.type = self.demote(node.type)
+        return result
+
     def _generic_visit(self, node):
         super(UFuncBuilder, self).generic_visit(node)
 
@@ -21,21 +21,37 @@ def register(utility):
 class CBuilderLibrary(object):
     """
     Library of cbuilder functions.
+
+    Utilities are defined on first use. Each is built in a module of its
+    own, which is linked into the library module and into the modules
+    registered with link_on_demand().
     """
 
     def __init__(self):
         self.module = llvm.core.Module.new("cbuilderlib")
         self.funcs = {}
+        self.target_modules = []
 
     def declare_registered(self, env):
         "Declare all utilities in our module"
         for registered_utility in registered_utilities:
             self.declare(registered_utility, env, self.module)
 
+    def define(self, numba_cdef, env):
+        "Define a utility, and link it into the library and target modules"
+        utility_module = llvm.core.Module.new("cbuilderlib.%s" %
+                                              numba_cdef._name_)
+        specialized_cdef, lfunc = declare(numba_cdef, env, utility_module)
+
+        for llvm_module in [self.module] + self.target_modules:
+            llvm_module.link_in(utility_module, preserve=True)
+
+        self.funcs[numba_cdef] = specialized_cdef, lfunc
+        return specialized_cdef, lfunc
+
     def declare(self, numba_cdef, env, llvm_module):
         if numba_cdef not in self.funcs:
-            specialized_cdef, lfunc = declare(numba_cdef, env, self.module)
-            self.funcs[numba_cdef] = specialized_cdef, lfunc
+            specialized_cdef, lfunc = self.define(numba_cdef, env)
         else:
             specialized_cdef, lfunc = self.funcs[numba_cdef]
 
@@ -47,6 +63,15 @@ class CBuilderLibrary(object):
 
     def link(self, llvm_module):
         """
-        Link the CBuilder library into the target module.
+        Link the CBuilder library into the target module. Only the
+        utilities defined so far are linked.
+        """
+        llvm_module.link_in(self.module, preserve=True)
+
+    def link_on_demand(self, llvm_module):
+        """
+        Link the utilities defined so far into the target module, and link
+        utilities defined later when they are defined.
         """
-        llvm_module.link_in(self.module, preserve=True)
\ No newline at end of file
+        self.link(llvm_module)
+        self.target_modules.append(llvm_module)
\ No newline at end of file
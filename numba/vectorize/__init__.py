@@ -5,10 +5,17 @@ __all__ = [
            'Vectorize',
            'BasicVectorize',
            'BasicASTVectorize',
+           'ParallelVectorize',
+           'ParallelASTVectorize',
+           'guvectorize',
+           'GUVectorize',
+           'GUFuncASTVectorize',
            ]
 
 
 from .basic import BasicVectorize, BasicASTVectorize
+from .parallel import ParallelVectorize, ParallelASTVectorize
+from .gufunc import GUFuncASTVectorize
 from numba.utils import process_sig
 import warnings
 
@@ -25,6 +32,14 @@ _vectorizers = {
     'ast'     : _ast_vectorizers,
 }
 
+_ast_guvectorizers = {
+    'cpu': GUFuncASTVectorize,
+}
+
+_guvectorizers = {
+    'ast'     : _ast_guvectorizers,
+}
+
 def _prepare_sig(sig):
     if isinstance(sig, str):
         _name, restype, argtypes = process_sig(str(sig), None)
@@ -50,36 +65,79 @@ def install_vectorizer(backend, target, vectorizer):
                       UserWarning)
     lib[target] = vectorizer
 
-def Vectorize(func, backend='ast', target='cpu'):
+install_vectorizer('ast', 'parallel', ParallelASTVectorize)
+
+def Vectorize(func, backend='ast', target='cpu', **kws):
     """
         Instantiate a vectorizer given the backend and target.
 
         func: the function to vectorize
         backend: 'ast'
         Default: 'ast'
-        target: 'basic'
-        Default: 'basic'
+        target: 'cpu' or 'parallel'
+        Default: 'cpu'
+
+        Other keyword arguments are passed to the vectorizer, e.g.
+        chunksize for the 'parallel' target.
         """
     assert backend in _vectorizers, tuple(backends)
     targets = _vectorizers[backend]
     assert target in targets, tuple(targets)
     if target in targets:
-        return targets[target](func)
+        return targets[target](func, **kws)
     else: # fall back
         warnings.warn("fallback to bytecode vectorizer")
         # Use the default bytecode backend
         return _bytecode_vectorizers[target](func)
 
-def vectorize(signatures, backend='ast', target='cpu'):
+def vectorize(signatures=(), backend='ast', target='cpu', dynamic=False,
+              **options):
+    """
+    Build a ufunc with loops for the given signatures. A dynamic ufunc
+    (dynamic=True, or no signatures) also compiles a new loop for each new
+    combination of input dtypes it is called with, see
+    numba.vectorize.dynamic.
+    """
     def _vectorize(fn):
-        vect = Vectorize(fn, backend=backend, target=target)
+        vect = Vectorize(fn, backend=backend, target=target, **options)
         for sig in signatures:
             kws = _prepare_sig(sig)
             vect.add(**kws)
-        ufunc = vect.build_ufunc()
+        if dynamic or not signatures:
+            ufunc = vect.build_dynamic_ufunc()
+        else:
+            ufunc = vect.build_ufunc()
         return ufunc
     return _vectorize
 
+def GUVectorize(func, layout, backend='ast', target='cpu'):
+    """
+        Instantiate a generalized ufunc vectorizer given the layout (a
+        NumPy gufunc signature such as '(m,n),(n)->(m)'), backend and
+        target.
+
+        func: the kernel, which writes its results into the output
+              arguments
+        backend: 'ast'
+        Default: 'ast'
+        target: 'cpu'
+        Default: 'cpu'
+        """
+    assert backend in _guvectorizers, tuple(_guvectorizers)
+    targets = _guvectorizers[backend]
+    assert target in targets, tuple(targets)
+    return targets[target](func, layout)
+
+def guvectorize(signatures, layout, backend='ast', target='cpu'):
+    def _guvectorize(fn):
+        vect = GUVectorize(fn, layout, backend=backend, target=target)
+        for sig in signatures:
+            kws = _prepare_sig(sig)
+            vect.add(**kws)
+        ufunc = vect.build_ufunc()
+        return ufunc
+    return _guvectorize
+
 def get_include():
     from os.path import dirname
     return dirname(__file__)
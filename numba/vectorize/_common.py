@@ -111,6 +111,9 @@ class CommonVectorizeFromFunc(object):
 
 class GenericASTVectorize(object):
 
+    # Keyword arguments of the inner loop builder (_from_func_factory)
+    loop_options = {}
+
     def __init__(self, func):
         self.pyfunc = func
         self.translates = []
@@ -138,6 +141,15 @@ class GenericASTVectorize(object):
     def build_ufunc(self):
         raise NotImplementedError
 
+    def build_dynamic_ufunc(self):
+        """
+        Build a ufunc that compiles a new inner loop for each new
+        combination of input dtypes it is called with, in addition to the
+        signatures added so far. See numba.vectorize.dynamic.
+        """
+        from . import dynamic
+        return dynamic.build_dynamic_ufunc(self)
+
     def register_ufunc(self, ufunc):
         from numba.type_inference.modules import numpyufuncs
         numpyufuncs.register_arbitrary_ufunc(ufunc)
@@ -140,10 +140,14 @@ static PyMethodDef ext_methods[] = {
 #ifdef IS_PY3K
     {"fromfunc", (PyCFunction) ufunc_fromfunc, METH_VARARGS, NULL},
     {"fromfuncsig", (PyCFunction) ufunc_fromfuncsig, METH_VARARGS, NULL},
+    {"add_loop", (PyCFunction) ufunc_add_loop, METH_VARARGS, NULL},
+    {"call_ufunc", (PyCFunction) ufunc_call, METH_VARARGS, NULL},
     {"get_arrays_ordering", (PyCFunction) get_arrays_ordering, METH_VARARGS, NULL},
 #else
     {"fromfunc", ufunc_fromfunc, METH_VARARGS, NULL},
     {"fromfuncsig", ufunc_fromfuncsig, METH_VARARGS, NULL},
+    {"add_loop", ufunc_add_loop, METH_VARARGS, NULL},
+    {"call_ufunc", ufunc_call, METH_VARARGS, NULL},
     {"get_arrays_ordering", get_arrays_ordering, METH_VARARGS, NULL},
 #endif
     { NULL }
@@ -37,6 +37,10 @@ extern PyObject *ufunc_fromfunc(PyObject *NPY_UNUSED(dummy), PyObject *args);
 extern PyObject * ufunc_fromfuncsig(PyObject *NPY_UNUSED(dummy),
                                     PyObject *args);
 
+extern PyObject *ufunc_add_loop(PyObject *NPY_UNUSED(dummy), PyObject *args);
+
+extern PyObject *ufunc_call(PyObject *NPY_UNUSED(dummy), PyObject *args);
+
 PyObject *
 PyDynUFunc_New(PyUFuncObject *ufunc, PyObject *dispatcher);
 
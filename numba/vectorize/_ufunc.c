@@ -217,3 +217,128 @@ ufunc_fromfunc(PyObject *NPY_UNUSED(dummy), PyObject *args) {
 
     return ufunc;
 }
+
+/*
+    Add an inner loop to a dynamic ufunc, for dynamic ufuncs that compile
+    loops on demand (see numba/vectorize/dynamic.py):
+
+        add_loop(dyn_ufunc, func_ptr, [type_num, ...], data_ptr or None,
+                 index)
+
+    The loop is inserted at position `index` of the loop table. NumPy
+    selects the first loop the inputs can be cast to safely.
+*/
+PyObject *
+ufunc_add_loop(PyObject *NPY_UNUSED(dummy), PyObject *args) {
+
+    PyDynUFuncObject *self;
+    PyUFuncObject *ufunc;
+    PyObject *func_obj;
+    PyObject *type_list;
+    PyObject *data_obj;
+
+    PyUFuncGenericFunction *functions = NULL;
+    void **data = NULL;
+    char *types = NULL;
+    int i, nargs, ntypes, index;
+    long type_num;
+
+    if (!PyArg_ParseTuple(args, "O!OO!Oi", &PyDynUFunc_Type, &self,
+                                            &func_obj,
+                                            &PyList_Type, &type_list,
+                                            &data_obj, &index)) {
+        return NULL;
+    }
+
+    ufunc = &self->ufunc;
+    nargs = ufunc->nin + ufunc->nout;
+    if (PyList_Size(type_list) != nargs) {
+        PyErr_SetString(PyExc_TypeError, "length of types list must be the number of ufunc arguments");
+        return NULL;
+    }
+
+    if (!PyLong_Check(func_obj)) {
+        PyErr_SetString(PyExc_TypeError, "function pointer must be long object");
+        return NULL;
+    }
+
+    if (data_obj != Py_None && !PyLong_Check(data_obj)) {
+        PyErr_SetString(PyExc_TypeError, "data pointer must be long object, or None");
+        return NULL;
+    }
+
+    if (index < 0 || index > ufunc->ntypes) {
+        PyErr_SetString(PyExc_IndexError, "loop index out of range");
+        return NULL;
+    }
+
+    ntypes = ufunc->ntypes + 1;
+    functions = PyArray_malloc(ntypes * sizeof(PyUFuncGenericFunction));
+    data = PyArray_malloc(ntypes * sizeof(void *));
+    types = PyArray_malloc(ntypes * nargs * sizeof(char));
+    if (functions == NULL || data == NULL || types == NULL) {
+        PyErr_NoMemory();
+        goto err;
+    }
+
+    for (i = 0; i < nargs; i++) {
+        type_num = PyLong_AsLong(PyList_GetItem(type_list, i));
+        if (type_num == -1 && PyErr_Occurred())
+            goto err;
+        types[index * nargs + i] = (char) type_num;
+    }
+
+    /* Copy the loops before and after the new one */
+    for (i = 0; i < ufunc->ntypes; i++) {
+        int j = i < index ? i : i + 1;
+        functions[j] = ufunc->functions[i];
+        data[j] = ufunc->data[i];
+        memcpy(&types[j * nargs], &ufunc->types[i * nargs], nargs);
+    }
+    functions[index] = (PyUFuncGenericFunction) PyLong_AsVoidPtr(func_obj);
+    data[index] = data_obj == Py_None ? NULL : PyLong_AsVoidPtr(data_obj);
+
+    /* The loop tables are owned by the original ufunc (see dyn_dealloc) */
+    if (ufunc->functions)
+        PyArray_free(ufunc->functions);
+    if (ufunc->data)
+        PyArray_free(ufunc->data);
+    if (ufunc->types)
+        PyArray_free(ufunc->types);
+
+    ufunc->functions = self->ufunc_original->functions = functions;
+    ufunc->data = self->ufunc_original->data = data;
+    ufunc->types = self->ufunc_original->types = types;
+    ufunc->ntypes = self->ufunc_original->ntypes = ntypes;
+
+    Py_RETURN_NONE;
+err:
+    PyArray_free(functions);
+    PyArray_free(data);
+    PyArray_free(types);
+    return NULL;
+}
+
+/*
+    Call a dynamic ufunc, bypassing its dispatcher:
+
+        call_ufunc(dyn_ufunc, args, kwargs or None)
+*/
+PyObject *
+ufunc_call(PyObject *NPY_UNUSED(dummy), PyObject *args) {
+
+    PyObject *ufunc;
+    PyObject *call_args;
+    PyObject *kwds = NULL;
+
+    if (!PyArg_ParseTuple(args, "O!O!|O", &PyDynUFunc_Type, &ufunc,
+                                           &PyTuple_Type, &call_args,
+                                           &kwds)) {
+        return NULL;
+    }
+
+    if (kwds == Py_None)
+        kwds = NULL;
+
+    return PyDynUFunc_Type.tp_base->tp_call(ufunc, call_args, kwds);
+}
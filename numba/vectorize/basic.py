@@ -10,8 +10,19 @@ import numpy as np
 
 from . import _common
 
+def _itemsize(ty):
+    "Size in bytes of a scalar LLVM type, or None for other types"
+    if ty.kind == TYPE_INTEGER and ty.width % 8 == 0:
+        return ty.width // 8
+    return {TYPE_FLOAT: 4, TYPE_DOUBLE: 8}.get(ty.kind)
+
 class BasicUFunc(CDefinition):
     '''a generic ufunc that wraps the workload
+
+    The body has two versions of the loop. If all operands are contiguous
+    (all steps equal the item sizes), the operands are indexed as typed
+    arrays, which the LLVM loop vectorizer can turn into SIMD code.
+    Otherwise each argument pointer is advanced by its step.
     '''
     _argtys_ = [
         ('args',       C.pointer(C.char_p), [ATTR_NO_ALIAS]),
@@ -32,6 +43,45 @@ class BasicUFunc(CDefinition):
             const_steps.invariant = True
             arg_steps.append(const_steps)
 
+        argtys = list(fnty.args) + [fnty.return_type]
+        itemsizes = [_itemsize(argty) for argty in argtys]
+        if None in itemsizes:
+            self.strided_loop(ufunc_ptr, dimensions, arg_ptrs, arg_steps)
+        else:
+            is_contig = self.is_contig(arg_steps, itemsizes)
+            with self.ifelse(is_contig) as ifelse:
+                with ifelse.then():
+                    self.contig_loop(ufunc_ptr, dimensions, arg_ptrs)
+                with ifelse.otherwise():
+                    self.strided_loop(ufunc_ptr, dimensions, arg_ptrs,
+                                      arg_steps)
+
+        self.ret()
+
+    def is_contig(self, arg_steps, itemsizes):
+        result = None
+        for step, itemsize in zip(arg_steps, itemsizes):
+            is_unit_step = step == self.constant(C.intp, itemsize)
+            if result is None:
+                result = is_unit_step
+            else:
+                result = result & is_unit_step
+        return result
+
+    def contig_loop(self, ufunc_ptr, dimensions, arg_ptrs):
+        fnty = ufunc_ptr.type.pointee
+        typed_ptrs = [arg_ptrs[i].cast(C.pointer(argty))
+                          for i, argty in enumerate(fnty.args)]
+        retval_ptr = arg_ptrs[-1].cast(C.pointer(fnty.return_type))
+
+        with self.for_range(dimensions[0]) as (loop, item):
+            callargs = [typed_ptr[item] for typed_ptr in typed_ptrs]
+            res = ufunc_ptr(*callargs, **dict(inline=True))
+            retval_ptr[item] = res
+
+    def strided_loop(self, ufunc_ptr, dimensions, arg_ptrs, arg_steps):
+        fnty = ufunc_ptr.type.pointee
+
         with self.for_range(dimensions[0]) as (loop, item):
             callargs = []
             for i, argty in enumerate(fnty.args):
@@ -44,8 +94,6 @@ class BasicUFunc(CDefinition):
             retval_ptr.store(res, nontemporal=True)
             arg_ptrs[-1].assign(arg_ptrs[-1][arg_steps[-1]:])
 
-        self.ret()
-
     def specialize(cls, func_def):
         '''specialize to a workload
         '''
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+'''
+Dynamic ufuncs, which compile inner loops on demand:
+
+    @vectorize(dynamic=True)
+    def add(a, b):
+        return a + b
+
+    add(np.arange(10, dtype=np.int16), 2.5)     # compiles (int16, float64)
+    add(np.arange(10.0), np.arange(10.0))       # compiles (float64, float64)
+
+A dynamic ufunc is a dyn_ufunc with a dispatcher (see _internal.c). When
+called with a combination of input dtypes that has no loop yet, the
+dispatcher compiles the function for these dtypes (inferring the return
+type), builds an inner loop with the vectorizer and adds it to the loop
+table of the ufunc. The call then runs through NumPy, which selects the
+first loop that the inputs can be cast to safely. A new loop is inserted
+before the first loop its input dtypes can be cast to, so that it is
+found before loops for larger types (like the loops of NumPy's builtin
+ufuncs are ordered), and operands are not cast.
+
+Only calls go through the dispatcher. The ufunc methods (reduce,
+accumulate, ...) use the loops compiled so far.
+'''
+from __future__ import print_function, division, absolute_import
+
+import inspect
+
+import numpy as np
+
+from numba.minivect import minitypes
+from . import _internal
+
+def _input_dtype(arg):
+    if isinstance(arg, (np.ndarray, np.generic)):
+        return arg.dtype
+    return np.asarray(arg).dtype
+
+def _supported_dtype(dtype):
+    return dtype.kind in 'iuf'
+
+class UFuncDispatcher(object):
+    """
+    Dispatcher of a dynamic ufunc, which compiles a new inner loop with
+    `vectorizer` (a GenericASTVectorize) for each new combination of input
+    dtypes.
+    """
+
+    def __init__(self, vectorizer, nin):
+        self.vectorizer = vectorizer
+        self.nin = nin
+        self.ufunc = None
+        # Input dtypes -> compiled function
+        self.loops = {}
+        # Input dtypes of the loops, in the order of the loop table
+        self.loop_order = []
+
+    def loop_index(self, dtypes):
+        "The position in the loop table of a new loop for the input dtypes"
+        for i, loop_dtypes in enumerate(self.loop_order):
+            if all(np.can_cast(dtype, loop_dtype)
+                       for dtype, loop_dtype in zip(dtypes, loop_dtypes)):
+                return i
+        return len(self.loop_order)
+
+    def compile(self, dtypes):
+        "Compile the function for the input dtypes and add its loop"
+        if not all(_supported_dtype(dtype) for dtype in dtypes):
+            raise TypeError("ufunc %s does not support inputs of type %s" % (
+                self.vectorizer.pyfunc.__name__,
+                ", ".join(str(dtype) for dtype in dtypes)))
+
+        vectorizer = self.vectorizer
+        argtypes = [minitypes.map_dtype(dtype) for dtype in dtypes]
+        vectorizer.add(argtypes=argtypes)
+        numba_func = vectorizer.translates[-1]
+
+        types = [minitypes.map_minitype_to_dtype(type)
+                     for type in vectorizer.get_argtypes(numba_func)]
+        factory = vectorizer._from_func_factory
+        ptr, = factory._prepare_pointers([numba_func.lfunc], [types],
+                                         vectorizer._get_ee(),
+                                         **vectorizer.loop_options)
+        index = self.loop_index(dtypes)
+        _internal.add_loop(self.ufunc, ptr,
+                           [dtype.num for dtype in types], None, index)
+        self.loops[dtypes] = numba_func
+        self.loop_order.insert(index, dtypes)
+
+    def __call__(self, *args, **kwargs):
+        dtypes = tuple(_input_dtype(arg) for arg in args[:self.nin])
+        if len(dtypes) == self.nin and dtypes not in self.loops:
+            self.compile(dtypes)
+
+        return _internal.call_ufunc(self.ufunc, args, kwargs)
+
+
+def build_dynamic_ufunc(vectorizer):
+    """
+    Build a dynamic ufunc from the vectorizer, with loops for the
+    signatures added so far (which may be none).
+    """
+    nin = len(inspect.getargspec(vectorizer.pyfunc).args)
+    dispatcher = UFuncDispatcher(vectorizer, nin)
+
+    if vectorizer.translates:
+        ufunc = vectorizer._from_func(dispatcher=dispatcher,
+                                      **vectorizer.loop_options)
+    else:
+        ufunc = _internal.fromfunc([], [], nin, 1, [], dispatcher)
+
+    # The dispatcher and ufunc refer to each other, dynamic ufuncs live
+    # until the end of the process
+    dispatcher.ufunc = ufunc
+    for numba_func, types in zip(vectorizer.translates,
+                                 vectorizer._get_tys_list()):
+        dtypes = tuple(types[:nin])
+        dispatcher.loops[dtypes] = numba_func
+        dispatcher.loop_order.append(dtypes)
+
+    return ufunc
@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+'''
+Implements generalized ufuncs (guvectorize).
+
+A kernel takes views of the core dimensions of its operands, given by a
+NumPy gufunc signature (the layout), and writes its results into the
+output operands:
+
+    @guvectorize([void(f8[:], f8[:], f8[:])], '(n),(n)->()')
+    def dot(a, b, out):
+        acc = 0.0
+        for i in range(a.shape[0]):
+            acc += a[i] * b[i]
+        out[0] = acc
+
+NumPy broadcasts the loop dimensions and calls the inner loop built here,
+which calls the kernel for each element of the loop dimensions with
+(stack-allocated) array views of the core dimensions. Operands with no
+core dimensions are passed as scalars (inputs) or as arrays of one element
+with a zero stride (outputs).
+
+The array views are not Python objects, so kernels are compiled in
+nopython mode.
+'''
+from __future__ import print_function, division, absolute_import
+
+import re
+
+import llvm.core
+
+from numba import environment, llvm_types, ndarray_helpers
+from numba.minivect import minitypes
+from . import _common, _internal
+
+_dimension = r'\s*\w+\s*'
+_argument = r'\s*\((?:%s(?:,%s)*)?\)\s*' % (_dimension, _dimension)
+_arguments = r'%s(?:,%s)*' % (_argument, _argument)
+_layout_re = re.compile(r'^%s->%s$' % (_arguments, _arguments))
+
+def parse_layout(layout):
+    """
+    Parse a gufunc signature such as '(m,n),(n)->(m)' into the core
+    dimension names of the inputs and outputs:
+
+        ([('m', 'n'), ('n',)], [('m',)])
+    """
+    layout = layout.replace(' ', '')
+    if not _layout_re.match(layout):
+        raise ValueError("Invalid gufunc layout: %r" % (layout,))
+
+    def parse_arguments(arguments):
+        core_dims = []
+        for argument in re.findall(r'\(([^)]*)\)', arguments):
+            core_dims.append(tuple(argument.split(',')) if argument else ())
+        return core_dims
+
+    inputs, outputs = layout.split('->')
+    return parse_arguments(inputs), parse_arguments(outputs)
+
+def dimension_indices(core_dims):
+    "Number the core dimension names in order of appearance, like NumPy"
+    indices = {}
+    for dims in core_dims:
+        for dim in dims:
+            indices.setdefault(dim, len(indices))
+    return indices
+
+def _index(i):
+    return llvm_types.constant_int(i)
+
+class GUFuncLoop(object):
+    """
+    Build the inner loop of a generalized ufunc
+
+        void loop(char **args, npy_intp *dimensions, npy_intp *steps,
+                  void *data)
+
+    calling the compiled kernel `lfunc` (with argument types `argtypes`) for
+    each of the dimensions[0] elements of the loop dimensions. The core
+    dimensions of the arguments are given by `core_dims`; their extents
+    follow in `dimensions`, and their strides in `steps` after the loop
+    steps of the arguments.
+    """
+
+    def __init__(self, context, lfunc, argtypes, core_dims, nin):
+        self.context = context
+        self.lfunc = lfunc
+        self.argtypes = argtypes
+        self.core_dims = core_dims
+        self.nin = nin
+        self.dim_indices = dimension_indices(core_dims)
+
+        for i, (argtype, dims) in enumerate(zip(argtypes, core_dims)):
+            if argtype.is_array and argtype.ndim != max(len(dims), 1):
+                raise TypeError(
+                    "Argument %d of %s has %d dimensions, but %d core "
+                    "dimensions in the layout" % (i, lfunc.name,
+                                                  argtype.ndim, len(dims)))
+            elif not argtype.is_array and (dims or i >= nin):
+                raise TypeError(
+                    "Argument %d of %s must be an array" % (i, lfunc.name))
+
+    def build(self):
+        intp = llvm_types._intp
+        char_p = llvm_types._int8_star
+        loop_type = llvm.core.Type.function(
+            llvm.core.Type.void(),
+            [llvm.core.Type.pointer(char_p), llvm.core.Type.pointer(intp),
+             llvm.core.Type.pointer(intp), llvm_types._void_star])
+
+        llvm_module = self.lfunc.module
+        lloop = llvm_module.add_function(loop_type,
+                                         "gufunc_%s" % self.lfunc.name)
+        entry = lloop.append_basic_block('entry')
+        cond_block = lloop.append_basic_block('cond')
+        body_block = lloop.append_basic_block('body')
+        exit_block = lloop.append_basic_block('exit')
+
+        self.builder = llvm.core.Builder.new(entry)
+        args, dimensions, steps, data = lloop.args
+
+        loop_count = self.builder.load(dimensions)
+        views = [self.build_view(i, dimensions, steps)
+                     for i in range(len(self.argtypes))]
+
+        counter = self.builder.alloca(intp)
+        self.builder.store(llvm.core.Constant.int(intp, 0), counter)
+        self.builder.branch(cond_block)
+
+        self.builder.position_at_end(cond_block)
+        n = self.builder.load(counter)
+        self.builder.cbranch(
+            self.builder.icmp(llvm.core.ICMP_SLT, n, loop_count),
+            body_block, exit_block)
+
+        self.builder.position_at_end(body_block)
+        kernel_args = []
+        for i, (argtype, view) in enumerate(zip(self.argtypes, views)):
+            arg = self.builder.load(self.builder.gep(args, [_index(i)]))
+            step = self.builder.load(self.builder.gep(steps, [_index(i)]))
+            arg = self.builder.gep(arg, [self.builder.mul(n, step)])
+            if argtype.is_array:
+                accessor = ndarray_helpers.PyArrayAccessor(self.builder, view)
+                accessor.data = arg
+                kernel_args.append(view)
+            else:
+                ltype = argtype.pointer().to_llvm(self.context)
+                kernel_args.append(
+                    self.builder.load(self.builder.bitcast(arg, ltype)))
+
+        self.builder.call(self.lfunc, kernel_args)
+        one = llvm.core.Constant.int(intp, 1)
+        self.builder.store(self.builder.add(n, one), counter)
+        self.builder.branch(cond_block)
+
+        self.builder.position_at_end(exit_block)
+        self.builder.ret_void()
+
+        lloop.verify()
+        return lloop
+
+    def core_steps_offset(self, i):
+        "Index in steps of the first core stride of argument i"
+        nargs = len(self.argtypes)
+        return nargs + sum(len(dims) for dims in self.core_dims[:i])
+
+    def build_view(self, i, dimensions, steps):
+        """
+        Allocate the array view passed to the kernel for argument i, with
+        the shape and strides of the core dimensions. The data pointer is
+        set for each call. Returns None for scalar arguments.
+        """
+        argtype = self.argtypes[i]
+        if not argtype.is_array:
+            return None
+
+        intp = llvm_types._intp
+        b = self.builder
+        ltype = self.lfunc.type.pointee.args[i]
+        view = b.alloca(ltype.pointee)
+        b.store(llvm.core.Constant.null(ltype.pointee), view)
+
+        dims = self.core_dims[i]
+        if dims:
+            extents = [b.load(b.gep(dimensions,
+                                    [_index(1 + self.dim_indices[dim])]))
+                           for dim in dims]
+            offset = self.core_steps_offset(i)
+            strides = [b.load(b.gep(steps, [_index(offset + j)]))
+                           for j in range(len(dims))]
+        else:
+            # A single element
+            extents = [llvm.core.Constant.int(intp, 1)]
+            strides = [llvm.core.Constant.int(intp, 0)]
+
+        ndim = len(extents)
+        shape = b.alloca(llvm.core.Type.array(intp, ndim))
+        strides_p = b.alloca(llvm.core.Type.array(intp, ndim))
+        for dim in range(ndim):
+            b.store(extents[dim], b.gep(shape, [_index(0), _index(dim)]))
+            b.store(strides[dim], b.gep(strides_p, [_index(0), _index(dim)]))
+
+        accessor = ndarray_helpers.PyArrayAccessor(b, view)
+        accessor.ndim = _index(ndim)
+        accessor.shape = b.gep(shape, [_index(0), _index(0)])
+        accessor.strides = b.gep(strides_p, [_index(0), _index(0)])
+        return view
+
+
+class GUFuncASTVectorize(_common.GenericASTVectorize):
+    """
+    Vectorizer for generalized ufuncs with the given layout (a NumPy gufunc
+    signature such as '(m,n),(n)->(m)'). Kernels return void and write
+    their results into the output arguments.
+    """
+
+    def __init__(self, func, layout):
+        super(GUFuncASTVectorize, self).__init__(func)
+        self.layout = layout
+        self.inputs, self.outputs = parse_layout(layout)
+
+    def add(self, restype=None, argtypes=None, **kwds):
+        # The kernels receive array views that are not Python objects
+        kwds.setdefault('nopython', True)
+        super(GUFuncASTVectorize, self).add(restype, argtypes, **kwds)
+
+    def get_argtypes(self, numba_func):
+        return list(numba_func.signature.args)
+
+    def _get_tys_list(self):
+        types_lists = []
+        for numba_func in self.translates:
+            dtypes = []
+            for arg_type in self.get_argtypes(numba_func):
+                if arg_type.is_array:
+                    arg_type = arg_type.dtype
+                dtypes.append(minitypes.map_minitype_to_dtype(arg_type))
+            types_lists.append(dtypes)
+
+        return types_lists
+
+    def build_loops(self):
+        context = environment.NumbaEnvironment.get_environment().context
+        core_dims = self.inputs + self.outputs
+        engine = self._get_ee()
+        ptrlist = []
+        for numba_func in self.translates:
+            argtypes = self.get_argtypes(numba_func)
+            if len(argtypes) != len(core_dims):
+                raise TypeError(
+                    "Kernel %s takes %d arguments, layout %r has %d" % (
+                        numba_func.lfunc.name, len(argtypes), self.layout,
+                        len(core_dims)))
+
+            loop = GUFuncLoop(context, numba_func.lfunc, argtypes, core_dims,
+                              len(self.inputs))
+            lloop = loop.build()
+            _common.post_vectorize_optimize(lloop)
+            ptrlist.append(_common.ptr_t(
+                engine.get_pointer_to_function(lloop)))
+
+        return ptrlist
+
+    def build_dynamic_ufunc(self):
+        raise NotImplementedError("Dynamic generalized ufuncs")
+
+    def build_ufunc(self):
+        assert self.translates, "No translation"
+        ptrlist = self.build_loops()
+        tyslist = [[dtype.num for dtype in dtypes]
+                       for dtypes in self._get_tys_list()]
+        datlist = [None] * len(ptrlist)
+        return _internal.fromfuncsig(ptrlist, tyslist, len(self.inputs),
+                                     len(self.outputs), datlist,
+                                     self.layout.replace(' ', ''))
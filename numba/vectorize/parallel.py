@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+'''
+Implements the parallel vectorize target, vectorize(..., target='parallel').
+
+The ufunc inner loop is the loop of BasicUFunc, called through a driver
+with the same signature. The driver splits the 1-D iteration space of the
+inner loop into chunks of at least `chunksize` iterations, and runs them
+on the native thread pool of array expressions (see numba.parallel) with
+__Numba_parallel_for. The GIL is released while the chunks run.
+
+NumPy calls the inner loop with the strides (steps) of the broadcast
+operands, so each chunk offsets the data pointers by its start times the
+step, and broadcasting works like for any other ufunc.
+
+ufunc.reduce and ufunc.accumulate call the inner loop with an output that
+aliases an input (with output step 0 for reduce), so that each iteration
+depends on the previous one. The inner loop runs serially if the output
+step is 0 or the output overlaps an input (other than the exact same
+operand, e.g. for in-place operations).
+
+The kernels run without the GIL, so they are compiled in nopython mode.
+'''
+from __future__ import print_function, division, absolute_import
+
+import llvm.core
+from llvm_cbuilder import CFuncRef
+
+from numba import environment
+from numba import parallel as numba_parallel
+from . import _common
+from .basic import BasicUFunc
+
+# Minimum number of iterations per chunk
+default_chunksize = 4096
+
+_int32 = llvm.core.Type.int(32)
+_void_star = llvm.core.Type.pointer(llvm.core.Type.int(8))
+
+def _index(i):
+    return llvm.core.Constant.int(_int32, i)
+
+def build_chunk_kernel(lloop, nargs):
+    """
+    Build `int chunk_kernel(void *closure, npy_intp start, npy_intp stop)`,
+    which runs the ufunc inner loop `lloop` on iterations [start, stop).
+    The closure holds the args, steps and data arguments of the inner loop.
+    """
+    loop_type = lloop.type.pointee
+    args_type, dimensions_type, steps_type, data_type = loop_type.args
+    intp = dimensions_type.pointee
+    closure_type = llvm.core.Type.struct([args_type, steps_type, data_type])
+
+    func_type = llvm.core.Type.function(_int32, [_void_star, intp, intp])
+    lfunc = lloop.module.add_function(func_type, lloop.name + "_chunk")
+    builder = llvm.core.Builder.new(lfunc.append_basic_block('entry'))
+    closure, start, stop = lfunc.args
+
+    closure = builder.bitcast(closure, llvm.core.Type.pointer(closure_type))
+    args, steps, data = [
+        builder.load(builder.gep(closure, [_index(0), _index(i)]))
+            for i in range(3)]
+
+    # Offset the data pointers to the start of the chunk
+    chunk_args = builder.alloca(llvm.core.Type.array(args_type.pointee, nargs))
+    for i in range(nargs):
+        arg = builder.load(builder.gep(args, [_index(i)]))
+        step = builder.load(builder.gep(steps, [_index(i)]))
+        builder.store(builder.gep(arg, [builder.mul(start, step)]),
+                      builder.gep(chunk_args, [_index(0), _index(i)]))
+
+    count = builder.alloca(intp)
+    builder.store(builder.sub(stop, start), count)
+
+    builder.call(lloop, [builder.gep(chunk_args, [_index(0), _index(0)]),
+                         count, steps, data])
+    builder.ret(llvm.core.Constant.int(_int32, 0))
+
+    lfunc.verify()
+    return lfunc, closure_type
+
+def build_is_serial(builder, args, steps, count, itemsizes):
+    """
+    Build a test whether the iterations of the inner loop depend on each
+    other: the output step is 0 (reduce), or the bytes spanned by the
+    output overlap those of an input that is not the same operand
+    (accumulate).
+    """
+    intp = count.type
+    zero = llvm.core.Constant.int(intp, 0)
+    nargs = len(itemsizes)
+
+    def operand(i):
+        pointer = builder.load(builder.gep(args, [_index(i)]))
+        step = builder.load(builder.gep(steps, [_index(i)]))
+        return builder.ptrtoint(pointer, intp), step
+
+    def span(pointer, step, itemsize):
+        "[low, high) of the bytes of all iterations"
+        last = builder.add(pointer, builder.mul(
+            builder.sub(count, llvm.core.Constant.int(intp, 1)), step))
+        negative = builder.icmp(llvm.core.ICMP_SLT, step, zero)
+        low = builder.select(negative, last, pointer)
+        high = builder.select(negative, pointer, last)
+        return low, builder.add(high, llvm.core.Constant.int(intp, itemsize))
+
+    out, out_step = operand(nargs - 1)
+    out_low, out_high = span(out, out_step, itemsizes[-1])
+    is_serial = builder.icmp(llvm.core.ICMP_EQ, out_step, zero)
+
+    for i in range(nargs - 1):
+        pointer, step = operand(i)
+        low, high = span(pointer, step, itemsizes[i])
+        overlap = builder.and_(
+            builder.icmp(llvm.core.ICMP_SLT, low, out_high),
+            builder.icmp(llvm.core.ICMP_SLT, out_low, high))
+        same = builder.and_(builder.icmp(llvm.core.ICMP_EQ, pointer, out),
+                            builder.icmp(llvm.core.ICMP_EQ, step, out_step))
+        is_serial = builder.or_(is_serial,
+                                builder.and_(overlap, builder.not_(same)))
+
+    return is_serial
+
+def build_parallel_loop(context, lloop, nargs, chunksize, itemsizes):
+    """
+    Build a ufunc inner loop with the signature of `lloop`, which runs
+    `lloop` on chunks of the iteration space in parallel. `itemsizes` are
+    the sizes of the elements of the inputs and the output.
+    """
+    chunk_kernel, closure_type = build_chunk_kernel(lloop, nargs)
+
+    llvm_module = lloop.module
+    loop_type = lloop.type.pointee
+    intp = loop_type.args[1].pointee
+
+    lfunc = llvm_module.add_function(loop_type, lloop.name + "_parallel")
+    builder = llvm.core.Builder.new(lfunc.append_basic_block('entry'))
+    args, dimensions, steps, data = lfunc.args
+
+    # Dependent iterations run serially
+    serial_block = lfunc.append_basic_block('serial')
+    parallel_block = lfunc.append_basic_block('parallel')
+    is_serial = build_is_serial(builder, args, steps,
+                                builder.load(dimensions), itemsizes)
+    builder.cbranch(is_serial, serial_block, parallel_block)
+
+    builder.position_at_end(serial_block)
+    builder.call(lloop, [args, dimensions, steps, data])
+    builder.ret_void()
+
+    builder.position_at_end(parallel_block)
+
+    closure = builder.alloca(closure_type)
+    for i, arg in enumerate((args, steps, data)):
+        builder.store(arg, builder.gep(closure, [_index(0), _index(i)]))
+
+    lparallel_for = numba_parallel.parallel_for.declare_lfunc(context,
+                                                              llvm_module)
+    builder.call(lparallel_for, [
+        builder.bitcast(chunk_kernel, _void_star),
+        builder.bitcast(closure, _void_star),
+        builder.load(dimensions),
+        llvm.core.Constant.int(intp, chunksize)])
+    builder.ret_void()
+
+    lfunc.verify()
+    return lfunc
+
+class _ParallelVectorizeFromFunc(_common.CommonVectorizeFromFunc):
+    def build(self, lfunc, dtypes, chunksize=default_chunksize):
+        def_buf = BasicUFunc(CFuncRef(lfunc))
+        lloop = def_buf(lfunc.module)
+        nargs = len(lfunc.type.pointee.args) + 1
+
+        context = environment.NumbaEnvironment.get_environment().context
+        itemsizes = [dtype.itemsize for dtype in dtypes]
+        func = build_parallel_loop(context, lloop, nargs, chunksize,
+                                   itemsizes)
+        _common.post_vectorize_optimize(func)
+        return func
+
+parallel_vectorize_from_func = _ParallelVectorizeFromFunc()
+
+class ParallelASTVectorize(_common.GenericASTVectorize):
+    """
+    Vectorizer for the 'parallel' target. `chunksize` is the minimum number
+    of iterations of the inner loop per thread.
+    """
+
+    _from_func_factory = parallel_vectorize_from_func
+
+    def __init__(self, func, chunksize=default_chunksize):
+        super(ParallelASTVectorize, self).__init__(func)
+        self.chunksize = chunksize
+        self.loop_options = dict(chunksize=chunksize)
+
+    def add(self, restype=None, argtypes=None, **kwds):
+        # The kernels run on threads that do not hold the GIL
+        kwds.setdefault('nopython', True)
+        super(ParallelASTVectorize, self).add(restype, argtypes, **kwds)
+
+    def build_ufunc(self, dispatcher=None):
+        return self._from_func(dispatcher=dispatcher, **self.loop_options)
+
+ParallelVectorize = ParallelASTVectorize
@@ -127,6 +127,7 @@ setup(
             sources = ["numba/external/utilities/utilities.c"],
             include_dirs=[numba_include_dir],
             depends=["numba/external/utilities/type_conversion.c",
+                     "numba/external/utilities/parallel.c",
                      "numba/external/utilities/generated_conversions.c",
                      "numba/external/utilities/generated_conversions.h"]),
         CythonExtension(